@@ -1,14 +1,18 @@
 from flask import Flask
 from .config import Config, TestingConfig
 from .extensions import db, migrate, jwt
-from app.models.user import User
 from app.celery_app import create_celery
+from app.utils.metrics import init_metrics
+from app.utils.principal import principal_from_claims
 from app.utils.security import register_jwt_callbacks
+from app.utils.serialization import FastJSONProvider
+from app.utils.sql_profiling import init_sql_profiling
 
 
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = FastJSONProvider(app)
 
     db.init_app(app)
     migrate.init_app(app, db)
@@ -19,10 +23,10 @@ def create_app(config_class=Config):
     def user_identity_lookup(user):
         return str(user)
 
+    # Built from the claims: the User row is only loaded if a handler needs it
     @jwt.user_lookup_loader
     def user_lookup_callback(_jwt_header, jwt_data):
-        identity = jwt_data["sub"]
-        return db.session.get(User, int(identity))
+        return principal_from_claims(jwt_data)
     
     register_jwt_callbacks(app)
     
@@ -34,4 +38,10 @@ def create_app(config_class=Config):
 
     app.register_blueprint(api_bp, url_prefix="/api")
 
+    if app.config.get("METRICS_ENABLED"):
+        init_metrics(app)
+
+    if app.config.get("SQL_PROFILING"):
+        init_sql_profiling(app)
+
     return app
\ No newline at end of file
@@ -1,4 +1,9 @@
-from app.extensions import celery 
+from celery.signals import worker_process_init
+from kombu import Queue
+from app.extensions import celery, db
+from app.tasks.scheduling import EEG_QUEUES, QUEUE_DEFAULT
+
+BROKER_PRIORITY_STEPS = list(range(10))
 
 def create_celery(app):
     celery.conf.update(app.config)
@@ -13,6 +18,24 @@ def create_celery(app):
         task_eager_propagates=app.config.get("CELERY_TASK_EAGER_PROPAGATES", False),
         timezone="UTC",
         enable_utc=True,
+        imports=("app.tasks.eeg_tasks", "app.tasks.maintenance"),
+        beat_schedule={
+            "sweep-stuck-eeg-records": {
+                "task": "app.tasks.maintenance.sweep_stuck_eeg_records",
+                "schedule": app.config["EEG_SWEEP_INTERVAL_SECONDS"],
+            },
+        },
+        # One queue per priority plus a lane for large files
+        task_queues=[Queue(name) for name in EEG_QUEUES],
+        task_default_queue=QUEUE_DEFAULT,
+        # Honour message priorities inside each queue (Redis broker)
+        broker_transport_options={
+            "priority_steps": BROKER_PRIORITY_STEPS,
+            "queue_order_strategy": "priority",
+        },
+        # Do not let a worker reserve a block of bulk jobs while urgent ones wait
+        worker_prefetch_multiplier=1,
+        task_acks_late=True,
     )
 
     class ContextTask(celery.Task):
@@ -21,4 +44,12 @@ def create_celery(app):
                 return self.run(*args, **kwargs)
 
     celery.Task = ContextTask
+
+    # Prefork children inherit the parent's pooled connections; sharing a
+    # socket between processes corrupts it. The parent keeps its own
+    @worker_process_init.connect(weak=False, dispatch_uid="db_worker_process_init")
+    def dispose_inherited_connections(**kwargs):
+        with app.app_context():
+            db.engine.dispose(close=False)
+
     return celery
@@ -1,11 +1,39 @@
 import os
 from dotenv import load_dotenv
+from sqlalchemy.pool import NullPool
 
 load_dotenv()
 
+
+def database_engine_options() -> dict:
+    """
+    Connection pool of every process (API worker or Celery child). The
+    database must accept (DB_POOL_SIZE + DB_MAX_OVERFLOW) x processes
+    connections. With DB_POOLER=pgbouncer the pooling is left to an external
+    transaction pooler: connections are not kept and psycopg does not use
+    server-side prepared statements, which do not survive a transaction there.
+    """
+    if os.getenv("DB_POOLER", "").lower() == "pgbouncer":
+        return {"poolclass": NullPool, "connect_args": {"prepare_threshold": None}}
+
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 5)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 5)),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", 30)),
+        # Below the server / load balancer idle timeout
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        # Connections dropped by a database restart or failover are replaced
+        # instead of failing the first request that checks them out
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+    }
+
+
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = database_engine_options()
+    # Async read API (asgi.py): derived from DATABASE_URL when not set
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
 
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
     JWT_ACCESS_TOKEN_EXPIRES = 1800 # 30 minutes
@@ -13,14 +41,77 @@ class Config:
     CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
     CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND")
 
+    # Session validity cache. Without Redis each process keeps its own copy,
+    # so a logout takes up to SESSION_CACHE_TTL_SECONDS to reach the others
+    SESSION_CACHE_REDIS_URL = os.getenv("SESSION_CACHE_REDIS_URL")
+    SESSION_CACHE_TTL_SECONDS = int(os.getenv("SESSION_CACHE_TTL_SECONDS", 30))
+    # The sliding expiration is written at most once per interval per session
+    SESSION_REFRESH_INTERVAL_SECONDS = int(os.getenv("SESSION_REFRESH_INTERVAL_SECONDS", 60))
+
+    # Scheduling: files above this size go to the dedicated large-file lane
+    EEG_LARGE_FILE_BYTES = int(os.getenv("EEG_LARGE_FILE_BYTES", 50 * 1024 * 1024))
+    # Per-uploader fair share: burst size and sustained uploads per minute
+    # before NORMAL records are demoted to the low priority queue
+    EEG_FAIR_SHARE_BURST = int(os.getenv("EEG_FAIR_SHARE_BURST", 20))
+    EEG_FAIR_SHARE_PER_MINUTE = float(os.getenv("EEG_FAIR_SHARE_PER_MINUTE", 10))
+    EEG_FAIR_SHARE_REDIS_URL = os.getenv("EEG_FAIR_SHARE_REDIS_URL", os.getenv("CELERY_BROKER_URL"))
+    # Batched uploads below this size are scored together, up to
+    # EEG_INFERENCE_BATCH_RECORDS records per model call
+    EEG_SMALL_FILE_BYTES = int(os.getenv("EEG_SMALL_FILE_BYTES", 5 * 1024 * 1024))
+    EEG_INFERENCE_BATCH_RECORDS = int(os.getenv("EEG_INFERENCE_BATCH_RECORDS", 16))
+
+    # Recovery sweeper (Celery beat): records untouched for longer than these
+    # thresholds are re-enqueued, at most EEG_SWEEP_BATCH_SIZE per run
+    EEG_SWEEP_INTERVAL_SECONDS = int(os.getenv("EEG_SWEEP_INTERVAL_SECONDS", 300))
+    EEG_STUCK_PENDING_SECONDS = int(os.getenv("EEG_STUCK_PENDING_SECONDS", 900))
+    EEG_STUCK_PROCESSING_SECONDS = int(os.getenv("EEG_STUCK_PROCESSING_SECONDS", 3600))
+    EEG_SWEEP_BATCH_SIZE = int(os.getenv("EEG_SWEEP_BATCH_SIZE", 100))
+    EEG_SWEEP_MAX_ATTEMPTS = int(os.getenv("EEG_SWEEP_MAX_ATTEMPTS", 3))
+
+    # Status push (SSE / long-poll). Workers publish through Redis pub/sub;
+    # without it only in-process subscribers are reached (tests, eager mode)
+    EVENTS_REDIS_URL = os.getenv("EVENTS_REDIS_URL", os.getenv("CELERY_BROKER_URL"))
+    EEG_EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EEG_EVENTS_HEARTBEAT_SECONDS", 15))
+    EEG_EVENTS_MAX_SECONDS = float(os.getenv("EEG_EVENTS_MAX_SECONDS", 300))
+    EEG_STATUS_MAX_WAIT_SECONDS = float(os.getenv("EEG_STATUS_MAX_WAIT_SECONDS", 30))
+    # Streams and long-polls held at once per API process (each pins a
+    # gunicorn thread, see gunicorn.conf.py); above it they get a 503
+    EEG_EVENTS_MAX_STREAMS = int(os.getenv("EEG_EVENTS_MAX_STREAMS", 2))
+    EEG_EVENTS_RETRY_AFTER_SECONDS = int(os.getenv("EEG_EVENTS_RETRY_AFTER_SECONDS", 10))
+    # Minimum time between two progress writes of a processing record
+    EEG_PROGRESS_INTERVAL_SECONDS = float(os.getenv("EEG_PROGRESS_INTERVAL_SECONDS", 2))
+
+    # Prometheus metrics: GET /metrics on the API; workers serve them on a
+    # port and/or rewrite a textfile (node exporter) after tasks. Off by
+    # default; with METRICS_TOKEN set, scrapes must send it as a Bearer token
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+    METRICS_WORKER_PORT = os.getenv("METRICS_WORKER_PORT")
+    METRICS_TEXTFILE = os.getenv("METRICS_TEXTFILE")
+    METRICS_TEXTFILE_INTERVAL_SECONDS = float(os.getenv("METRICS_TEXTFILE_INTERVAL_SECONDS", 15))
+
+    # Opt-in SQL profiling (see app/utils/sql_profiling.py). The
+    # Server-Timing header reveals query timings: keep it off in production
+    SQL_PROFILING = os.getenv("SQL_PROFILING", "false").lower() == "true"
+    SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", 100))
+    SQL_MAX_STATEMENTS_PER_REQUEST = int(os.getenv("SQL_MAX_STATEMENTS_PER_REQUEST", 20))
+    SQL_SERVER_TIMING = os.getenv("SQL_SERVER_TIMING", "false").lower() == "true"
+
 
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {}  # SQLite in memory: a single static connection
     JWT_SECRET_KEY = "J51FofOwnlOVwcBuzZrBWXBgCEnQNk1Xs6kLRh0jTeg"
     CELERY_TASK_ALWAYS_EAGER = True   
     CELERY_TASK_EAGER_PROPAGATES = True
     CELERY_BROKER_URL = "memory://"
     CELERY_RESULT_BACKEND = "cache+memory://"
+    EEG_FAIR_SHARE_REDIS_URL = None
+    SESSION_CACHE_REDIS_URL = None
+    EVENTS_REDIS_URL = None
+    SQL_SERVER_TIMING = True
+    METRICS_ENABLED = True
+    METRICS_TOKEN = None
     WTF_CSRF_ENABLED = False
\ No newline at end of file
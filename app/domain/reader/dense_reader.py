@@ -0,0 +1,139 @@
+import json
+import os
+import shutil
+import uuid
+import numpy as np
+import pandas as pd
+from app.domain.reader.parquet_reader import ParquetEegReader
+
+DENSE_SUFFIX = ".dense"
+DENSE_FORMAT_VERSION = 1
+
+SIGNALS_FILE = "signals.npy"
+LENGTHS_FILE = "lengths.npy"
+META_FILE = "meta.json"
+
+
+def dense_path_for(file_path: str) -> str:
+    """Location of the dense store derived from the original upload path"""
+    return os.path.splitext(file_path)[0] + DENSE_SUFFIX
+
+
+class DenseEegRecording:
+    """
+    Dense per-trial layout of an EEG recording.
+
+    signals: float32 array (n_trials, n_channels, n_samples), zero padded
+    lengths: int array (n_trials, n_channels) with the real number of samples
+             of each channel in each trial (0 = channel missing in that trial)
+    """
+
+    def __init__(self, channels: list[str], trials: list, signals: np.ndarray, lengths: np.ndarray):
+        self.channels = channels
+        self.trials = trials
+        self.signals = signals
+        self.lengths = lengths
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, channels: list[str] = None) -> "DenseEegRecording":
+        """Pivot the long layout (trial, channel, sample, value) into the dense one"""
+        if channels is not None:
+            df = df[df["channel"].isin(channels)]
+
+        if df.empty:
+            return cls([], [], np.zeros((0, 0, 0), dtype=np.float32), np.zeros((0, 0), dtype=np.int64))
+
+        available = set(df["channel"].unique())
+        if channels is not None:
+            # Keep the caller's order so tensors are built deterministically
+            channel_list = [ch for ch in channels if ch in available]
+        else:
+            channel_list = sorted(available)
+
+        trial_codes, trial_list = pd.factorize(df["trial"], sort=False)
+        channel_codes = pd.Categorical(df["channel"], categories=channel_list).codes.astype(np.int64)
+        samples = df["sample"].to_numpy()
+        values = df["value"].to_numpy(dtype=np.float32)
+
+        n_trials = len(trial_list)
+        n_channels = len(channel_list)
+
+        order = np.lexsort((samples, channel_codes, trial_codes))
+        group = trial_codes[order] * n_channels + channel_codes[order]
+
+        counts = np.bincount(group, minlength=n_trials * n_channels)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        position = np.arange(len(order)) - starts[group]
+
+        n_samples = int(counts.max())
+        signals = np.zeros((n_trials * n_channels, n_samples), dtype=np.float32)
+        signals[group, position] = values[order]
+
+        return cls(
+            channels=channel_list,
+            trials=trial_list.tolist(),
+            signals=signals.reshape(n_trials, n_channels, n_samples),
+            lengths=counts.reshape(n_trials, n_channels),
+        )
+
+    @classmethod
+    def load(cls, dense_path: str, mmap_mode: str = "r") -> "DenseEegRecording":
+        """Open a dense store; signals are memory-mapped so windows are read lazily"""
+        with open(os.path.join(dense_path, META_FILE), "r") as f:
+            meta = json.load(f)
+
+        if meta.get("version") != DENSE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported dense EEG format version: {meta.get('version')}")
+
+        signals = np.load(os.path.join(dense_path, SIGNALS_FILE), mmap_mode=mmap_mode)
+        lengths = np.load(os.path.join(dense_path, LENGTHS_FILE))
+
+        return cls(meta["channels"], meta["trials"], signals, lengths)
+
+    def save(self, dense_path: str) -> str:
+        """Write the store atomically: a half-written directory is never visible"""
+        tmp_path = f"{dense_path}.{uuid.uuid4().hex}.tmp"
+        os.makedirs(tmp_path)
+
+        try:
+            np.save(os.path.join(tmp_path, SIGNALS_FILE), np.ascontiguousarray(self.signals, dtype=np.float32))
+            np.save(os.path.join(tmp_path, LENGTHS_FILE), np.asarray(self.lengths, dtype=np.int64))
+            with open(os.path.join(tmp_path, META_FILE), "w") as f:
+                json.dump({
+                    "version": DENSE_FORMAT_VERSION,
+                    "channels": self.channels,
+                    "trials": list(self.trials),
+                }, f)
+
+            if os.path.isdir(dense_path):
+                shutil.rmtree(dense_path)
+            os.replace(tmp_path, dense_path)
+        except Exception:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+
+        return dense_path
+
+    @property
+    def is_empty(self) -> bool:
+        return self.signals.size == 0
+
+
+def convert_to_dense(file_path: str, dense_path: str = None) -> str:
+    """Parse an uploaded parquet once and persist its dense representation"""
+    if dense_path is None:
+        dense_path = dense_path_for(file_path)
+
+    df = ParquetEegReader().read(file_path)
+    recording = DenseEegRecording.from_dataframe(df)
+    del df
+
+    return recording.save(dense_path)
+
+
+def ensure_dense(file_path: str) -> str:
+    """Return the dense store for an upload, converting it only the first time"""
+    dense_path = dense_path_for(file_path)
+    if os.path.isfile(os.path.join(dense_path, META_FILE)):
+        return dense_path
+    return convert_to_dense(file_path, dense_path)
@@ -1,11 +1,25 @@
 import numpy as np
+from tensorflow import keras
 from app.ml.model_loader import get_model
 from app.models.prediction_result import AlcoholismRisk
+from app.utils.metrics import INFERENCE_BATCH_WINDOWS
 
-def run_inference(X: np.ndarray) -> tuple[AlcoholismRisk, float, float]:
+PREDICT_BATCH_SIZE = 32
+
+def predict_windows(X: np.ndarray, progress=None) -> np.ndarray:
+    """`progress(windows_done, total_windows)` is called after every model batch"""
     model = get_model()
-    preds = model.predict(X, verbose=0)
+    INFERENCE_BATCH_WINDOWS.observe(len(X))
+    if progress is None:
+        return model.predict(X, batch_size=PREDICT_BATCH_SIZE, verbose=0)
+
+    total = len(X)
+    callback = keras.callbacks.LambdaCallback(
+        on_predict_batch_end=lambda batch, logs: progress(min((batch + 1) * PREDICT_BATCH_SIZE, total), total)
+    )
+    return model.predict(X, batch_size=PREDICT_BATCH_SIZE, verbose=0, callbacks=[callback])
 
+def summarize_predictions(preds: np.ndarray) -> tuple[AlcoholismRisk, float, float]:
     mean_prob = float(np.mean(preds))
     is_alcoholic = mean_prob >= 0.5
 
@@ -13,3 +27,15 @@ def run_inference(X: np.ndarray) -> tuple[AlcoholismRisk, float, float]:
     confidence = mean_prob if is_alcoholic else 1.0 - mean_prob
 
     return label, mean_prob, confidence
+
+def run_inference(X: np.ndarray, progress=None) -> tuple[AlcoholismRisk, float, float]:
+    return summarize_predictions(predict_windows(X, progress))
+
+def run_batched_inference(tensors: list[np.ndarray]) -> list[tuple[AlcoholismRisk, float, float]]:
+    """
+    Scores several recordings with a single predict call: windows are
+    concatenated into one tensor and split back to get each recording's mean.
+    """
+    preds = predict_windows(np.concatenate(tensors, axis=0))
+    offsets = np.cumsum([len(X) for X in tensors])[:-1]
+    return [summarize_predictions(p) for p in np.split(preds, offsets)]
@@ -1,5 +1,7 @@
 import threading
+import time
 from tensorflow import keras
+from app.utils.metrics import MODEL_LOAD_SECONDS
 
 _model = None
 _model_lock = threading.Lock()
@@ -10,5 +12,7 @@ def get_model():
     if _model is None:
         with _model_lock:
             if _model is None:  # double-checked locking
+                started = time.perf_counter()
                 _model = keras.models.load_model(MODEL_PATH)
+                MODEL_LOAD_SECONDS.set(time.perf_counter() - started)
     return _model
\ No newline at end of file
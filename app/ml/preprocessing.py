@@ -2,6 +2,8 @@ import gc
 import numpy as np
 import pandas as pd
 from scipy.signal import butter, filtfilt
+from app.domain.reader.dense_reader import DenseEegRecording
+from app.utils.timing import NULL_TIMER
 
 PREDEFINED_CHANNELS = [
     "F1", "F2", "F6", "FT7", "FT8", "FC3", "FC4", "FCZ",             # Frontal
@@ -44,32 +46,38 @@ def extract_frequency_bands(signal, fs=256):
 
     return filtered_signals
 
-def get_channel_signal(trial_data, ch, start_idx, win_size) -> np.ndarray:
+def get_channel_signal(recording, trial_idx, channel_idx, start_idx, win_size) -> np.ndarray:
     """Extracts a windowed signal from a channel with padding if necessary"""
-    ch_data = trial_data[trial_data['channel'] == ch].sort_values('sample')
-    if start_idx + win_size <= len(ch_data):
-        return ch_data['value'].iloc[start_idx:start_idx + win_size].values
+    length = int(recording.lengths[trial_idx, channel_idx])
+    end_idx = min(start_idx + win_size, length)
+
+    # On a memory-mapped store only this slice is read from disk
+    available_signal = np.asarray(recording.signals[trial_idx, channel_idx, start_idx:end_idx])
+    if len(available_signal) == win_size:
+        return available_signal
 
-    available_signal = ch_data['value'].iloc[start_idx:].values
     if len(available_signal) == 0:
         return np.zeros(win_size)
 
     return np.pad(available_signal, (0, win_size - len(available_signal)), mode='constant')
 
 
-def process_channel(signal, use_bands, channel_idx, sample) -> int:
+def process_channel(signal, use_bands, channel_idx, sample, timer=NULL_TIMER) -> int:
     """Process one channel: extract frequency bands or raw signal"""
     if use_bands:
-        bands = extract_frequency_bands(signal, fs=256)
-        for band_name in ['raw', 'delta', 'theta', 'alpha', 'beta', 'gamma']:
-            if band_name in bands:
-                band_signal = normalize_signal(bands[band_name])
-                sample[channel_idx, :, 0] = band_signal
-            channel_idx += 1
+        with timer.span("filter"):
+            bands = extract_frequency_bands(signal, fs=256)
+        with timer.span("normalize"):
+            for band_name in ['raw', 'delta', 'theta', 'alpha', 'beta', 'gamma']:
+                if band_name in bands:
+                    band_signal = normalize_signal(bands[band_name])
+                    sample[channel_idx, :, 0] = band_signal
+                channel_idx += 1
     else:
-        signal = normalize_signal(signal)
-        sample[channel_idx, :, 0] = signal
-        channel_idx += 1
+        with timer.span("normalize"):
+            signal = normalize_signal(signal)
+            sample[channel_idx, :, 0] = signal
+            channel_idx += 1
     return channel_idx
 
 
@@ -78,7 +86,8 @@ def build_tensor_from_parquet(
     channels: list[str] = None,
     win_size: int = 256,
     step_size: int = 256,
-    use_bands: bool = True
+    use_bands: bool = True,
+    progress=None
 ) -> np.ndarray:
     """
     Build 4D tensor (N, C, T, 1) from a single parquet EEG file.
@@ -88,36 +97,75 @@ def build_tensor_from_parquet(
         channels = PREDEFINED_CHANNELS
 
     df = pd.read_parquet(parquet_path)
+    recording = DenseEegRecording.from_dataframe(df, channels)
+
+    del df
+    gc.collect()
+
+    return build_tensor_from_recording(recording, channels, win_size, step_size, use_bands, progress)
+
+
+def build_tensor_from_dense(
+    dense_path: str,
+    channels: list[str] = None,
+    win_size: int = 256,
+    step_size: int = 256,
+    use_bands: bool = True,
+    progress=None
+) -> np.ndarray:
+    """
+    Build 4D tensor (N, C, T, 1) from a dense store produced at ingest.
+    Windows are read as memory-map slices, the parquet is never parsed again.
+    """
+    recording = DenseEegRecording.load(dense_path)
+    return build_tensor_from_recording(recording, channels, win_size, step_size, use_bands, progress)
 
-    if df.empty:
+
+def build_tensor_from_recording(
+    recording: DenseEegRecording,
+    channels: list[str] = None,
+    win_size: int = 256,
+    step_size: int = 256,
+    use_bands: bool = True,
+    progress=None,
+    timer=NULL_TIMER
+) -> np.ndarray:
+    """
+    Build 4D tensor (N, C, T, 1) from a DenseEegRecording.
+    `progress(trials_done, total_trials)` is called after every trial; band
+    filtering and normalization time is added to `timer`.
+    """
+
+    if channels is None:
+        channels = PREDEFINED_CHANNELS
+
+    if recording.is_empty:
         return np.array([])
 
-    available_channels = set(df["channel"].unique())
-    channels_to_use = list(set(channels) & available_channels)
+    channel_positions = {ch: i for i, ch in enumerate(recording.channels)}
+    channels_to_use = [ch for ch in channels if ch in channel_positions]
 
     if not channels_to_use:
         return np.array([])
 
     actual_n_channels = len(channels_to_use) * 6 if use_bands else len(channels_to_use)
+    positions = [channel_positions[ch] for ch in channels_to_use]
 
     X_data = []
+    n_trials = len(recording.trials)
 
-    trials = df["trial"].unique()
-
-    for trial_id in trials:
+    for trial_idx in range(n_trials):
 
-        trial_data = df[df["trial"] == trial_id]
+        if progress is not None and trial_idx:
+            progress(trial_idx, n_trials)
 
-        channel_lengths = {
-            ch: len(trial_data[trial_data["channel"] == ch])
-            for ch in channels_to_use
-            if not trial_data[trial_data["channel"] == ch].empty
-        }
+        trial_lengths = recording.lengths[trial_idx, positions]
+        present = trial_lengths > 0
 
-        if not channel_lengths:
+        if not present.any():
             continue
 
-        min_length = min(channel_lengths.values())
+        min_length = int(trial_lengths[present].min())
 
         if min_length < win_size:
             continue
@@ -132,23 +180,21 @@ def build_tensor_from_parquet(
             channel_idx = 0
             valid_channels_count = 0
 
-            for ch in channels_to_use:
+            for pos, is_present in zip(positions, present):
 
-                ch_data = trial_data[trial_data["channel"] == ch]
-
-                if ch_data.empty:
+                if not is_present:
                     channel_idx += 6 if use_bands else 1
                     continue
 
-                signal = get_channel_signal(trial_data, ch, start_idx, win_size)
-                channel_idx = process_channel(signal, use_bands, channel_idx, sample)
+                signal = get_channel_signal(recording, trial_idx, pos, start_idx, win_size)
+                channel_idx = process_channel(signal, use_bands, channel_idx, sample, timer)
                 valid_channels_count += 1
 
             if valid_channels_count > 0:
                 X_data.append(sample)
 
-    del df
-    gc.collect()
+    if progress is not None:
+        progress(n_trials, n_trials)
 
     if not X_data:
         return np.array([])
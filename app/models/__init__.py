@@ -2,4 +2,5 @@ from .user import User
 from .patient import Patient
 from .eeg_record import EegRecord
 from .prediction_result import PredictionResult
-from .session import Session
\ No newline at end of file
+from .session import Session
+from .patient_summary import PatientSummary
@@ -1,6 +1,12 @@
 from app.extensions import db
 from datetime import datetime, timezone
 
+# Partial index predicate: only rows that are not soft deleted (PostgreSQL / SQLite)
+NOT_DELETED = {
+    "postgresql_where": db.text("is_deleted = false"),
+    "sqlite_where": db.text("is_deleted = 0"),
+}
+
 class AuditMixin(db.Model):
     """Track creation and modification times"""
     __abstract__ = True
@@ -1,5 +1,5 @@
 from app.extensions import db
-from app.models.base import BaseModel
+from app.models.base import BaseModel, NOT_DELETED
 import enum
 
 class EegStatus(enum.Enum):
@@ -8,6 +8,11 @@ class EegStatus(enum.Enum):
     PROCESSED = "processed"
     FAILED = "failed"
 
+class EegPriority(enum.Enum):
+    LOW = "low"
+    NORMAL = "normal"
+    HIGH = "high"
+
 class FILE_TYPE(enum.Enum):
     PARQUET = "parquet"
     CSV = "csv"
@@ -16,6 +21,20 @@ class FILE_TYPE(enum.Enum):
 
 class EegRecord(BaseModel):
     __tablename__ = "eeg_records"
+    __table_args__ = (
+        # Sweeper lookup of records stuck in a status since before a cutoff
+        db.Index("ix_eeg_records_status_updated_at", "status", "updated_at"),
+        # Keyset pagination, newest first
+        db.Index("ix_eeg_records_created_at_id", "created_at", "id"),
+        # Hot listings: a user's records (optionally by status) and a patient's records
+        db.Index("ix_eeg_records_active_uploader_created", "uploader_id", "created_at", "id", **NOT_DELETED),
+        db.Index(
+            "ix_eeg_records_active_uploader_status_created",
+            "uploader_id", "status", "created_at", "id",
+            **NOT_DELETED,
+        ),
+        db.Index("ix_eeg_records_active_patient_created", "patient_id", "created_at", "id", **NOT_DELETED),
+    )
 
     patient_id = db.Column(
         db.Integer,
@@ -37,8 +56,16 @@ class EegRecord(BaseModel):
 
     status = db.Column(db.Enum(EegStatus), default=EegStatus.PENDING, nullable=False)
 
+    priority = db.Column(db.Enum(EegPriority), default=EegPriority.NORMAL, nullable=False)
+
     error_msg = db.Column(db.Text, nullable=True)
 
     processing_time_ms = db.Column(db.Integer, nullable=True)
 
+    # Percent of the current processing attempt done (0-100), written by the worker
+    progress = db.Column(db.SmallInteger, nullable=True)
+
+    # Times the sweeper re-enqueued this record after it got stuck
+    recovery_attempts = db.Column(db.Integer, default=0, nullable=False)
+
     prediction_result = db.relationship("PredictionResult", backref="eeg_record", lazy=True, uselist=False)
\ No newline at end of file
@@ -1,16 +1,41 @@
 from app.extensions import db
-from app.models.base import BaseModel
+from app.models.base import BaseModel, NOT_DELETED
+from app.utils.text import normalize_text
+
+# Trigram (GIN) index on PostgreSQL: serves both prefix and substring LIKE
+# searches. Other dialects get a plain index on the column.
+def _trigram_index(name: str, column: str):
+    return db.Index(name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
 
 class Patient(BaseModel):
     __tablename__ = "patients"
+    __table_args__ = (
+        # Keyset pagination, newest first
+        db.Index("ix_patients_created_at_id", "created_at", "id"),
+        # A user's own patients, newest first
+        db.Index("ix_patients_active_created_by_created", "created_by", "created_at", "id", **NOT_DELETED),
+        # Name and identification search
+        _trigram_index("ix_patients_first_name_normalized_trgm", "first_name_normalized"),
+        _trigram_index("ix_patients_last_name_normalized_trgm", "last_name_normalized"),
+        _trigram_index("ix_patients_identification_number_trgm", "identification_number"),
+    )
 
     identification_number = db.Column(db.String(20), unique=True, index=True, nullable=False)
 
     first_name = db.Column(db.String(120), nullable=False)
     last_name = db.Column(db.String(120), nullable=False)
 
+    # Lowercase, accent-free copies used by the search (see normalize_text)
+    first_name_normalized = db.Column(db.String(120), nullable=False)
+    last_name_normalized = db.Column(db.String(120), nullable=False)
+
     birth_date = db.Column(db.Date, nullable=True)
     
     created_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
 
-    eeg_records = db.relationship("EegRecord", backref="patient", lazy=True)
\ No newline at end of file
+    eeg_records = db.relationship("EegRecord", backref="patient", lazy=True)
+
+    @db.validates("first_name", "last_name")
+    def _normalize_name(self, key, value):
+        setattr(self, f"{key}_normalized", normalize_text(value))
+        return value
@@ -0,0 +1,33 @@
+from app.extensions import db
+from app.models.patient import Patient
+from app.models.prediction_result import AlcoholismRisk
+
+class PatientSummary(db.Model):
+    """
+    Per-patient aggregates of its (not deleted) EEG records, kept up to date
+    in the same transaction as the change that affects them (see
+    PatientSummaryService). Listings filter on it instead of running
+    correlated subqueries over eeg_records for every patient.
+    """
+    __tablename__ = "patient_summaries"
+    __table_args__ = (
+        db.Index("ix_patient_summaries_eeg_count", "eeg_count"),
+        db.Index("ix_patient_summaries_pending_count", "pending_count"),
+    )
+
+    patient_id = db.Column(db.Integer, db.ForeignKey("patients.id"), primary_key=True)
+
+    eeg_count = db.Column(db.Integer, default=0, nullable=False)
+    pending_count = db.Column(db.Integer, default=0, nullable=False)
+
+    last_upload_at = db.Column(db.DateTime, nullable=True)
+
+    latest_result = db.Column(db.Enum(AlcoholismRisk), nullable=True)
+    latest_raw_probability = db.Column(db.Numeric(5,4), nullable=True)
+    latest_prediction_at = db.Column(db.DateTime, nullable=True)
+
+
+@db.event.listens_for(Patient, "after_insert")
+def _create_patient_summary(mapper, connection, patient):
+    # Every patient gets its (empty) summary row in the same flush
+    connection.execute(PatientSummary.__table__.insert().values(patient_id=patient.id))
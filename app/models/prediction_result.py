@@ -9,6 +9,10 @@ class AlcoholismRisk(enum.Enum):
 
 class PredictionResult(BaseModel):
     __tablename__ = "prediction_results"
+    __table_args__ = (
+        # Keyset pagination, newest first
+        db.Index("ix_prediction_results_created_at_id", "created_at", "id"),
+    )
 
     eeg_record_id = db.Column(
         db.Integer,
@@ -22,4 +26,7 @@ class PredictionResult(BaseModel):
     confidence = db.Column(db.Numeric(5,4), nullable=False)
     raw_probability = db.Column(db.Numeric(5,4), nullable=True)
 
-    model_version = db.Column(db.String(120), nullable=False)
\ No newline at end of file
+    model_version = db.Column(db.String(120), nullable=False)
+
+    # Milliseconds spent in each processing stage (read, preprocess, inference...)
+    stage_timings_ms = db.Column(db.JSON, nullable=True)
\ No newline at end of file
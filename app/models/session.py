@@ -1,14 +1,28 @@
+import hashlib
 from app.extensions import db
 from app.models.base import AuditMixin
 
 class Session(AuditMixin):
     __tablename__ = "sessions"
+    __table_args__ = (
+        # Active sessions of a user, invalidated on every login
+        db.Index(
+            "ix_sessions_user_id_active", "user_id",
+            postgresql_where=db.text("is_active = true"),
+            sqlite_where=db.text("is_active = 1"),
+        ),
+    )
 
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
 
-    token = db.Column(db.String(500), unique=True, index=True, nullable=False)
+    # SHA-256 digest of the JWT: fixed 32-byte key, the token itself is never stored
+    token_hash = db.Column(db.LargeBinary(32), unique=True, index=True, nullable=False)
 
     start_date = db.Column(db.DateTime, nullable=False)
     expiration_date = db.Column(db.DateTime, nullable=False)
 
-    is_active = db.Column(db.Boolean, default=True, nullable=False)
\ No newline at end of file
+    is_active = db.Column(db.Boolean, default=True, nullable=False)
+
+    @staticmethod
+    def hash_token(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
@@ -8,6 +8,10 @@ class UserRole(enum.Enum):
 
 class User(BaseModel):
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination, newest first
+        db.Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
     password_hash = db.Column(db.String(255), nullable=False)
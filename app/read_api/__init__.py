@@ -0,0 +1,61 @@
+"""
+Async read-only API: EEG status (with long-poll), predictions and listings,
+served by an ASGI server next to the Flask app, e.g.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 8000 --workers 2
+
+Same paths, payloads, ETags and authorization as the Flask blueprints, so a
+reverse proxy can route these GETs here. A waiting request holds neither a
+thread nor a database connection, and Redis is only reached through
+redis.asyncio, so no request blocks the event loop.
+"""
+from contextlib import asynccontextmanager
+from flask import Config as FlaskConfig
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from app.config import Config
+from app.read_api.events import create_event_listener
+from app.read_api.routes import routes
+from app.read_api.session_cache import create_session_cache
+
+# Async driver of every backend the sync app runs on
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+psycopg",  # psycopg 3 is async too
+}
+
+
+def async_database_url(database_url: str) -> str:
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None or url.drivername == driver:
+        return database_url
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def create_read_app(config_class=Config) -> Starlette:
+    config = FlaskConfig(".")
+    config.from_object(config_class)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # Created on the server's event loop: async connections belong to it
+        engine = create_async_engine(
+            config.get("ASYNC_DATABASE_URL") or async_database_url(config["SQLALCHEMY_DATABASE_URI"]),
+            **config["SQLALCHEMY_ENGINE_OPTIONS"],
+        )
+        app.state.sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+        app.state.session_cache = create_session_cache(config)
+        app.state.events = create_event_listener(config)
+        await app.state.events.start()
+        try:
+            yield
+        finally:
+            await app.state.events.close()
+            await app.state.session_cache.close()
+            await engine.dispose()
+
+    app = Starlette(routes=routes, lifespan=lifespan)
+    app.state.config = config
+    return app
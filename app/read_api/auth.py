@@ -0,0 +1,136 @@
+import functools
+import time
+from datetime import datetime, timedelta, timezone
+import jwt
+from sqlalchemy import select
+from starlette.responses import JSONResponse
+from app.models.session import Session
+from app.models.user import User, UserRole
+from app.services.auth_service import SESSION_DURATION_MINUTES
+from app.utils.principal import Principal
+
+
+def jwt_required(endpoint):
+    """
+    Counterpart of flask_jwt_extended's @jwt_required() plus the session
+    check of app.utils.security: same tokens, same session table and cache,
+    same 401 bodies. The endpoint finds the caller in request.state.current_user
+    and its database session in request.state.db.
+    """
+
+    @functools.wraps(endpoint)
+    async def wrapper(request):
+        config = request.app.state.config
+
+        header = request.headers.get("Authorization", "")
+        if not header.startswith("Bearer "):
+            return JSONResponse({"message": "Missing token"}, 401)
+        token = header[len("Bearer "):]
+
+        try:
+            claims = jwt.decode(
+                token,
+                config["JWT_SECRET_KEY"],
+                algorithms=[config.get("JWT_ALGORITHM", "HS256")],
+            )
+        except jwt.ExpiredSignatureError:
+            return JSONResponse({"message": "Token expired"}, 401)
+        except jwt.InvalidTokenError:
+            return JSONResponse({"message": "Invalid token"}, 401)
+        if claims.get("type") != "access":
+            return JSONResponse({"message": "Invalid token"}, 401)
+
+        async with request.app.state.sessionmaker() as db_session:
+            if not await check_session(db_session, token, config, request.app.state.session_cache):
+                return JSONResponse({"error": "Session expired or revoked. Please log in again."}, 401)
+
+            current_user = await principal_from_claims(db_session, claims)
+            if current_user is None:
+                # flask_jwt_extended's default user_lookup_error_loader
+                return JSONResponse({"msg": f"Error loading the user {claims['sub']}"}, 401)
+
+            request.state.db = db_session
+            request.state.current_user = current_user
+            return await endpoint(request)
+
+    return wrapper
+
+
+async def principal_from_claims(db_session, claims: dict):
+    """
+    Same as app.utils.principal; only id and role are used on this API.
+    None when the token has no role claim and its user no longer exists.
+    """
+    user_id = int(claims["sub"])
+
+    role = claims.get("role")
+    if role is None:
+        # Token issued before the role claim existed
+        role = await db_session.scalar(select(User.role).where(User.id == user_id))
+        if role is None:
+            return None
+
+    return Principal(user_id, UserRole(role))
+
+
+async def check_session(db_session, token: str, config, cache) -> bool:
+    """AuthService.check_session on the async session (same cache, same sliding expiry)"""
+    now = time.time()
+    cache_key = Session.hash_token(token).hex()
+    entry = await cache.get(cache_key)
+
+    if entry is None or now > entry["expires_at"]:
+        if not await validate_session(db_session, token, cache):
+            return False
+        entry = await cache.get(cache_key)
+        if entry is None:
+            return True
+
+    if now - entry["refreshed_at"] >= config["SESSION_REFRESH_INTERVAL_SECONDS"]:
+        await refresh_session(db_session, token, cache)
+
+    return True
+
+
+async def _active_session(db_session, token_hash: bytes):
+    return await db_session.scalar(
+        select(Session).where(Session.token_hash == token_hash, Session.is_active == True)
+    )
+
+
+async def validate_session(db_session, token: str, cache) -> bool:
+    now = datetime.now(timezone.utc)
+    token_hash = Session.hash_token(token)
+
+    session = await _active_session(db_session, token_hash)
+    if not session:
+        return False
+
+    expiration = session.expiration_date.replace(tzinfo=timezone.utc)
+
+    if now > expiration:
+        session.is_active = False
+        await db_session.commit()
+        return False
+
+    await cache.store(
+        token_hash.hex(),
+        session.user_id,
+        expiration.timestamp(),
+        (expiration - timedelta(minutes=SESSION_DURATION_MINUTES)).timestamp(),
+    )
+    return True
+
+
+async def refresh_session(db_session, token: str, cache) -> None:
+    now = datetime.now(timezone.utc)
+    expiration = now + timedelta(minutes=SESSION_DURATION_MINUTES)
+    token_hash = Session.hash_token(token)
+
+    session = await _active_session(db_session, token_hash)
+    if session:
+        session.expiration_date = expiration
+        await db_session.commit()
+        await cache.store(
+            token_hash.hex(), session.user_id, expiration.timestamp(), now.timestamp()
+        )
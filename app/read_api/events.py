@@ -0,0 +1,125 @@
+import asyncio
+import json
+import logging
+from app.utils.events import EVENTS_PREFIX, get_event_broker
+
+logger = logging.getLogger(__name__)
+
+# Pause before reading again after the Redis connection was lost
+RECONNECT_SECONDS = 1
+
+
+class Waiter:
+
+    def __init__(self, listener, channel: str):
+        self._listener = listener
+        self.channel = channel
+        self._queue = asyncio.Queue()
+
+    async def get(self, timeout: float):
+        """Next message, or None after `timeout` seconds"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self._listener._remove(self)
+
+
+class EventListener:
+    """
+    One subscription per process shared by every waiting request: the
+    messages it receives are handed to the waiters of their channel through
+    an asyncio.Queue each, so a waiter costs neither a connection nor a
+    polling loop.
+    """
+
+    def __init__(self):
+        self._waiters = {}
+
+    def subscribe(self, channel: str) -> Waiter:
+        waiter = Waiter(self, channel)
+        self._waiters.setdefault(channel, set()).add(waiter)
+        return waiter
+
+    def _remove(self, waiter: Waiter) -> None:
+        waiters = self._waiters.get(waiter.channel, set())
+        waiters.discard(waiter)
+        if not waiters:
+            self._waiters.pop(waiter.channel, None)
+
+    def _dispatch(self, channel: str, message: dict) -> None:
+        for waiter in self._waiters.get(channel, ()):
+            waiter._queue.put_nowait(message)
+
+
+class MemoryEventListener(EventListener):
+    """Listens to the process's MemoryEventBroker (tests, eager mode)"""
+
+    def __init__(self, broker):
+        super().__init__()
+        self._broker = broker
+        self._loop = None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._broker.add_listener(self._on_publish)
+
+    async def close(self) -> None:
+        self._broker.remove_listener(self._on_publish)
+
+    def _on_publish(self, channel: str, message: dict) -> None:
+        # Called from the publishing thread
+        self._loop.call_soon_threadsafe(self._dispatch, channel, message)
+
+
+class RedisEventListener(EventListener):
+    """A pattern subscription to every status channel, read by a single task"""
+
+    def __init__(self, redis_url: str, prefix: str = EVENTS_PREFIX):
+        import redis.asyncio
+
+        super().__init__()
+        self.prefix = prefix
+        self._client = redis.asyncio.Redis.from_url(redis_url)
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        self._task = None
+
+    async def start(self) -> None:
+        # Subscribes in the background: the API starts even while Redis is down
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self._pubsub.aclose()
+        await self._client.aclose()
+
+    async def _run(self) -> None:
+        subscribed = False
+        while True:
+            try:
+                if not subscribed:
+                    await self._pubsub.psubscribe(self.prefix + "*")
+                    subscribed = True
+                message = await self._pubsub.get_message(timeout=None)
+            except Exception:
+                # The next read reconnects and subscribes again; waiters that
+                # miss a change time out and the client reads the status
+                logger.exception("Status events subscription unavailable")
+                await asyncio.sleep(RECONNECT_SECONDS)
+                continue
+
+            if message and message["type"] == "pmessage":
+                channel = message["channel"].decode()[len(self.prefix):]
+                self._dispatch(channel, json.loads(message["data"]))
+
+
+def create_event_listener(config) -> EventListener:
+    redis_url = config.get("EVENTS_REDIS_URL")
+    return RedisEventListener(redis_url) if redis_url else MemoryEventListener(get_event_broker(config))
@@ -0,0 +1,75 @@
+from datetime import datetime
+from urllib.parse import urlencode
+from starlette.responses import Response
+from werkzeug.http import http_date, parse_date, parse_etags, quote_etag
+from app.utils.conditional import _etag, _settled_last_modified, resource_version
+from app.utils.serialization import dumps
+
+
+def json_response(obj, status: int = 200) -> Response:
+    return Response(dumps(obj), status, media_type="application/json")
+
+
+def error_response(message: str, status: int) -> Response:
+    return json_response({"error": message}, status)
+
+
+def client_has(request, item: dict) -> bool:
+    """app.utils.conditional.client_has"""
+    return parse_etags(request.headers.get("If-None-Match")).contains_weak(
+        _etag([resource_version(item)])
+    )
+
+
+def _not_modified(request, etag: str, last_modified: datetime = None) -> bool:
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+    if_none_match = parse_etags(request.headers.get("If-None-Match"))
+    if if_none_match:
+        return if_none_match.contains_weak(etag)
+
+    if_modified_since = parse_date(request.headers.get("If-Modified-Since"))
+    if last_modified and if_modified_since:
+        return last_modified.replace(microsecond=0) <= if_modified_since
+    return False
+
+
+def conditional_response(request, versions: list, build, extra=(), use_last_modified: bool = True) -> Response:
+    """app.utils.conditional.conditional_response: same ETags, so a client may switch APIs"""
+    etag = _etag(versions, extra)
+    last_modified = _settled_last_modified(versions) if use_last_modified else None
+
+    response = Response(status_code=304) if _not_modified(request, etag, last_modified) else build()
+
+    response.headers["ETag"] = quote_etag(etag, weak=True)
+    if last_modified:
+        response.headers["Last-Modified"] = http_date(last_modified)
+    # Per-user content: browsers may keep it but must revalidate every time
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def conditional_json(request, item: dict) -> Response:
+    return conditional_response(request, [resource_version(item)], lambda: json_response(item))
+
+
+def paginated_response(request, page: dict) -> Response:
+    """app.utils.pagination.paginated_response: list body, next cursor in headers"""
+    response = json_response(page["items"])
+
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+        args = dict(request.query_params)
+        args["cursor"] = page["next_cursor"]
+        response.headers["Link"] = f'<{request.url.path}?{urlencode(args)}>; rel="next"'
+
+    return response
+
+
+def conditional_page(request, page: dict) -> Response:
+    return conditional_response(
+        request,
+        [resource_version(item) for item in page["items"]],
+        lambda: paginated_response(request, page),
+        extra=(page["next_cursor"],),
+        use_last_modified=False,
+    )
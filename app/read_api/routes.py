@@ -0,0 +1,135 @@
+from starlette.routing import Route
+from app.read_api.auth import jwt_required
+from app.read_api.responses import client_has, conditional_json, conditional_page, error_response
+from app.read_api.services import ReadService
+from app.utils.events import FINAL_STATUSES, eeg_channel
+from app.utils.pagination import get_page_args
+
+
+def _float_arg(request, name: str, default: float = 0) -> float:
+    try:
+        return float(request.query_params.get(name, default))
+    except ValueError:
+        return default  # as request.args.get(name, default, type=float)
+
+
+@jwt_required
+async def list_eeg_records(request):
+    try:
+        filters = {
+            "patient_id": request.query_params.get("patient_id"),
+            "status": request.query_params.get("status"),
+        }
+        page = await ReadService.list_eeg_records(
+            request.state.db, filters, request.state.current_user, **get_page_args(request.query_params)
+        )
+        return conditional_page(request, page)
+    except PermissionError as e:
+        return error_response(str(e), 403)
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+
+@jwt_required
+async def list_by_patient(request):
+    try:
+        page_args = get_page_args(request.query_params)
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+    try:
+        page = await ReadService.list_eeg_records_by_patient(
+            request.state.db, request.path_params["patient_id"], request.state.current_user, **page_args
+        )
+        return conditional_page(request, page)
+    except PermissionError as e:
+        return error_response(str(e), 403)
+    except ValueError as e:
+        return error_response(str(e), 404)
+
+
+@jwt_required
+async def get_eeg_status(request):
+    """
+    Long-poll as in the Flask route: with `?wait=<seconds>` and an
+    If-None-Match naming the current status, the request is held until the
+    status changes or the wait (capped at EEG_STATUS_MAX_WAIT_SECONDS) runs out.
+    """
+    config = request.app.state.config
+    eeg_id = request.path_params["eeg_id"]
+    session = request.state.db
+    wait = min(_float_arg(request, "wait"), config["EEG_STATUS_MAX_WAIT_SECONDS"])
+
+    # Subscribed before reading the status so no change can slip in between
+    subscription = request.app.state.events.subscribe(eeg_channel(eeg_id)) if wait > 0 else None
+    try:
+        current_user = request.state.current_user
+        status = await ReadService.get_eeg_status(session, eeg_id, current_user)
+
+        if subscription and status["status"] not in FINAL_STATUSES and client_has(request, status):
+            await session.close()  # do not hold a pooled connection while waiting
+            if await subscription.get(timeout=wait) is not None:
+                status = await ReadService.get_eeg_status(session, eeg_id, current_user)
+
+        return conditional_json(request, status)
+    except PermissionError as e:
+        return error_response(str(e), 403)
+    except ValueError as e:
+        return error_response(str(e), 404)
+    finally:
+        if subscription:
+            subscription.close()
+
+
+@jwt_required
+async def get_prediction_by_eeg(request):
+    try:
+        prediction = await ReadService.get_prediction(
+            request.state.db, request.path_params["eeg_record_id"], request.state.current_user
+        )
+        return conditional_json(request, prediction)
+    except PermissionError as e:
+        return error_response(str(e), 403)
+    except ValueError as e:
+        return error_response(str(e), 404)
+
+
+@jwt_required
+async def list_predictions_by_patient(request):
+    try:
+        page_args = get_page_args(request.query_params)
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+    try:
+        page = await ReadService.list_predictions_by_patient(
+            request.state.db, request.path_params["patient_id"], request.state.current_user, **page_args
+        )
+        return conditional_page(request, page)
+    except PermissionError as e:
+        return error_response(str(e), 403)
+    except ValueError as e:
+        return error_response(str(e), 404)
+
+
+@jwt_required
+async def list_all_predictions(request):
+    try:
+        page = await ReadService.list_all_predictions(
+            request.state.db, request.state.current_user, **get_page_args(request.query_params)
+        )
+        return conditional_page(request, page)
+    except PermissionError as e:
+        return error_response(str(e), 403)
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+
+routes = [
+    Route("/api/eeg-records", list_eeg_records),
+    Route("/api/eeg-records/{eeg_id:int}/status", get_eeg_status),
+    Route("/api/eeg-records/{eeg_record_id:int}/prediction", get_prediction_by_eeg),
+    Route("/api/patients/{patient_id:int}/eeg-records", list_by_patient),
+    Route("/api/patients/{patient_id:int}/predictions", list_predictions_by_patient),
+    Route("/api/predictions", list_all_predictions),
+]
@@ -0,0 +1,152 @@
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from app.models.eeg_record import EegRecord
+from app.models.patient import Patient
+from app.models.prediction_result import PredictionResult
+from app.models.user import User, UserRole
+from app.services.eeg_record_service import EegRecordService
+from app.services.prediction_result_service import PredictionResultService
+from app.services.queries import check_owner, patient_records_criteria
+from app.utils.pagination import DEFAULT_PAGE_SIZE, keyset_criteria, split_page
+from app.utils.serialization import rows_as_dicts
+
+
+class ReadService:
+    """
+    The read paths of EegRecordService and PredictionResultService on an
+    AsyncSession. Filters, ownership checks and payloads come from those
+    services, so both APIs answer alike.
+    """
+
+    @staticmethod
+    async def get_eeg_status(session, eeg_id: int, current_user: User) -> dict:
+        eeg = await ReadService._load_eeg_record(session, eeg_id, current_user)
+        return EegRecordService._status_dict(eeg)
+
+    @staticmethod
+    async def list_eeg_records(
+        session, filters: dict, current_user: User, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> dict:
+        stmt = (
+            select(*EegRecordService._LIST_COLUMNS)
+            .where(*EegRecordService._list_criteria(filters, current_user))
+        )
+        return await ReadService._page(session, stmt, EegRecord.created_at, EegRecord.id, cursor, limit)
+
+    @staticmethod
+    async def list_eeg_records_by_patient(
+        session, patient_id: int, current_user: User, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> dict:
+        return await ReadService._patient_page(
+            session,
+            select(*EegRecordService._LIST_COLUMNS),
+            patient_id,
+            current_user,
+            EegRecord.created_at,
+            EegRecord.id,
+            "Not allowed to access this patient's records",
+            cursor,
+            limit,
+        )
+
+    @staticmethod
+    async def get_prediction(session, eeg_record_id: int, current_user: User) -> dict:
+        eeg = await ReadService._load_eeg_record(session, eeg_record_id, current_user, with_prediction=True)
+        return PredictionResultService._prediction_of(eeg)
+
+    @staticmethod
+    async def list_predictions_by_patient(
+        session, patient_id: int, current_user: User, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> dict:
+        return await ReadService._patient_page(
+            session,
+            select(*PredictionResultService._LIST_COLUMNS)
+            .join(EegRecord, PredictionResult.eeg_record_id == EegRecord.id),
+            patient_id,
+            current_user,
+            PredictionResult.created_at,
+            PredictionResult.id,
+            "Not allowed to access this patient's predictions",
+            cursor,
+            limit,
+        )
+
+    @staticmethod
+    async def list_all_predictions(
+        session, current_user: User, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> dict:
+        if current_user.role != UserRole.ADMIN:
+            raise PermissionError("Only ADMIN can access the full predictions list")
+
+        stmt = (
+            select(*PredictionResultService._LIST_COLUMNS)
+            .join(EegRecord, PredictionResult.eeg_record_id == EegRecord.id)
+            .where(EegRecord.is_deleted == False)
+        )
+        return await ReadService._page(
+            session, stmt, PredictionResult.created_at, PredictionResult.id, cursor, limit
+        )
+
+    @staticmethod
+    async def _load_eeg_record(
+        session,
+        eeg_id: int,
+        current_user: User,
+        denied_message: str = "Not allowed to access this record",
+        with_prediction: bool = False,
+    ) -> EegRecord:
+        """app.services.queries.load_eeg_record"""
+        stmt = select(EegRecord).where(EegRecord.id == eeg_id, EegRecord.is_deleted == False)
+        if with_prediction:
+            stmt = stmt.options(joinedload(EegRecord.prediction_result))
+
+        eeg = await session.scalar(stmt)
+        if not eeg:
+            raise ValueError("EEG record not found")
+
+        check_owner(eeg.uploader_id, current_user, denied_message)
+        return eeg
+
+    @staticmethod
+    async def _page(session, stmt, created_col, id_col, cursor: str, limit: int) -> dict:
+        """app.utils.pagination.keyset_paginate, serialized"""
+        rows, next_cursor = await ReadService._keyset_rows(session, stmt, created_col, id_col, cursor, limit)
+        return {
+            "items": rows_as_dicts(rows),
+            "next_cursor": next_cursor,
+        }
+
+    @staticmethod
+    async def _keyset_rows(session, stmt, created_col, id_col, cursor: str, limit: int) -> tuple:
+        result = await session.execute(
+            stmt
+            .where(*keyset_criteria(created_col, id_col, cursor))
+            .order_by(created_col.desc(), id_col.desc())
+            .limit(limit + 1)
+        )
+        return split_page(result.all(), limit)
+
+    @staticmethod
+    async def _patient_page(
+        session, stmt, patient_id: int, current_user: User, created_col, id_col,
+        denied_message: str, cursor: str, limit: int,
+    ) -> dict:
+        """app.services.queries.paginate_patient_records, serialized"""
+        stmt = (
+            stmt
+            .join(Patient, Patient.id == EegRecord.patient_id)
+            .where(*patient_records_criteria(patient_id, current_user))
+        )
+        rows, next_cursor = await ReadService._keyset_rows(session, stmt, created_col, id_col, cursor, limit)
+
+        if not rows:
+            # Tell 404/403 apart from a patient without records
+            patient = await session.get(Patient, patient_id)
+            if not patient or patient.is_deleted:
+                raise ValueError("Patient not found")
+            check_owner(patient.created_by, current_user, denied_message)
+
+        return {
+            "items": rows_as_dicts(rows),
+            "next_cursor": next_cursor,
+        }
@@ -0,0 +1,82 @@
+import json
+from app.utils.session_cache import get_session_cache, session_entry
+
+
+class AsyncMemorySessionCacheBackend:
+    """The process's in-memory backend (tests, no Redis): it never waits on I/O"""
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    async def get(self, key: str):
+        return self._backend.get(key)
+
+    async def set(self, key: str, value: dict, ttl: float) -> None:
+        self._backend.set(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        self._backend.delete(key)
+
+    async def close(self) -> None:
+        pass
+
+
+class AsyncRedisSessionCacheBackend:
+    """app.utils.session_cache.RedisSessionCacheBackend on redis.asyncio (same keys)"""
+
+    def __init__(self, redis_url: str, prefix: str = "session:"):
+        import redis.asyncio
+
+        self.prefix = prefix
+        self._client = redis.asyncio.Redis.from_url(redis_url)
+
+    async def get(self, key: str):
+        raw = await self._client.get(self.prefix + key)
+        return json.loads(raw) if raw else None
+
+    async def set(self, key: str, value: dict, ttl: float) -> None:
+        user_key = f"{self.prefix}user:{value['user_id']}"
+        async with self._client.pipeline() as pipe:
+            pipe.set(self.prefix + key, json.dumps(value), ex=max(1, int(ttl)))
+            pipe.sadd(user_key, key)
+            pipe.expire(user_key, max(1, int(ttl)))
+            await pipe.execute()
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self.prefix + key)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class AsyncSessionCache:
+    """
+    app.utils.session_cache.SessionCache for the event loop: same entries,
+    so a session validated or revoked through one API is seen by the other.
+    """
+
+    def __init__(self, backend, ttl_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+
+    async def get(self, key: str):
+        return await self.backend.get(key)
+
+    async def store(self, key: str, user_id: int, expires_at: float, refreshed_at: float) -> None:
+        entry, ttl = session_entry(self.ttl_seconds, user_id, expires_at, refreshed_at)
+        if ttl <= 0:
+            await self.backend.delete(key)
+            return
+        await self.backend.set(key, entry, ttl)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+
+def create_session_cache(config) -> AsyncSessionCache:
+    redis_url = config.get("SESSION_CACHE_REDIS_URL")
+    backend = (
+        AsyncRedisSessionCacheBackend(redis_url)
+        if redis_url else AsyncMemorySessionCacheBackend(get_session_cache(config).backend)
+    )
+    return AsyncSessionCache(backend, config["SESSION_CACHE_TTL_SECONDS"])
@@ -1,8 +1,12 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request, stream_with_context
 from flask_jwt_extended import jwt_required
+from app.extensions import db
 from app.services.eeg_record_service import EegRecordService
 from app.utils.security import get_current_user
-from app.tasks.eeg_tasks import process_eeg_record
+from app.utils.conditional import client_has, conditional_json, conditional_page
+from app.utils.events import FINAL_STATUSES, eeg_channel, get_event_broker, held_requests, stream_eeg_status
+from app.utils.pagination import get_page_args
+from app.tasks.scheduling import enqueue_eeg_record, enqueue_eeg_records
 
 eeg_records_bp = Blueprint("eeg_records", __name__)
 
@@ -26,15 +30,19 @@ def upload_eeg():
         except ValueError:
             return jsonify({"error": "patient_id must be an integer"}), 400
 
-        record = EegRecordService.create_eeg_record(file, patient_id, current_user)
+        record = EegRecordService.create_eeg_record(
+            file, patient_id, current_user, request.form.get("priority")
+        )
 
-        # Enqueue background task passing the record ID
-        process_eeg_record.delay(record["id"])
+        # Enqueue background task passing the record ID, routed by priority,
+        # size and the uploader's fair share
+        enqueue_eeg_record(record)
 
         return jsonify({
             "message": "EEG file uploaded successfully. Processing started.",
             "eeg_record_id": record["id"],
             "status": record["status"],
+            "priority": record["priority"],
         }), 202
 
     except PermissionError as e:
@@ -42,6 +50,64 @@ def upload_eeg():
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
 
+@eeg_records_bp.route("/eeg-records/upload/batch", methods=["POST"])
+@jwt_required()
+def upload_eeg_batch():
+    """
+    Uploads many EEG files in one request. Send the files as `files` and either
+    a single `patient_id` for all of them or one `patient_id` per file, in order.
+    """
+    try:
+        current_user = get_current_user()
+
+        files = request.files.getlist("files")
+        patient_ids = request.form.getlist("patient_id")
+
+        if not files:
+            return jsonify({"error": "No files in the request"}), 400
+
+        if not patient_ids:
+            return jsonify({"error": "patient_id is required"}), 400
+
+        if len(patient_ids) == 1:
+            patient_ids = patient_ids * len(files)
+        elif len(patient_ids) != len(files):
+            return jsonify({"error": "Provide one patient_id or one per file"}), 400
+
+        try:
+            patient_ids = [int(pid) for pid in patient_ids]
+        except ValueError:
+            return jsonify({"error": "patient_id must be an integer"}), 400
+
+        results = EegRecordService.create_eeg_records_batch(
+            list(zip(files, patient_ids)), current_user, request.form.get("priority")
+        )
+
+        accepted = [
+            {
+                "id": r["eeg_record_id"],
+                "uploader_id": current_user.id,
+                "file_size_bytes": r["file_size_bytes"],
+                "priority": r["priority"],
+            }
+            for r in results if "eeg_record_id" in r
+        ]
+
+        # A single enqueue for the whole batch
+        enqueue_eeg_records(accepted)
+
+        return jsonify({
+            "message": f"{len(accepted)} of {len(results)} EEG files accepted. Processing started.",
+            "accepted": len(accepted),
+            "rejected": len(results) - len(accepted),
+            "results": results,
+        }), 202 if accepted else 400
+
+    except PermissionError as e:
+        return jsonify({"error": str(e)}), 403
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
 @eeg_records_bp.route("/eeg-records", methods=["GET"])
 @jwt_required()
 def list_eeg_records():
@@ -51,8 +117,8 @@ def list_eeg_records():
             "patient_id": request.args.get("patient_id"),
             "status": request.args.get("status"),
         }
-        records = EegRecordService.list_eeg_records(filters, current_user)
-        return jsonify(records), 200
+        page = EegRecordService.list_eeg_records(filters, current_user, **get_page_args())
+        return conditional_page(page)
     except PermissionError as e:
         return jsonify({"error": str(e)}), 403
     except ValueError as e:
@@ -64,7 +130,7 @@ def get_eeg_record(eeg_id):
     try:
         current_user = get_current_user()
         record = EegRecordService.get_eeg_record(eeg_id, current_user)
-        return jsonify(record), 200
+        return conditional_json(record)
     except PermissionError as e:
         return jsonify({"error": str(e)}), 403
     except ValueError as e:
@@ -73,10 +139,15 @@ def get_eeg_record(eeg_id):
 @eeg_records_bp.route("/patients/<int:patient_id>/eeg-records", methods=["GET"])
 @jwt_required()
 def list_by_patient(patient_id):
+    try:
+        page_args = get_page_args()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     try:
         current_user = get_current_user()
-        records = EegRecordService.list_by_patient(patient_id, current_user)
-        return jsonify(records), 200
+        page = EegRecordService.list_by_patient(patient_id, current_user, **page_args)
+        return conditional_page(page)
     except PermissionError as e:
         return jsonify({"error": str(e)}), 403
     except ValueError as e:
@@ -85,14 +156,96 @@ def list_by_patient(patient_id):
 @eeg_records_bp.route("/eeg-records/<int:eeg_id>/status", methods=["GET"])
 @jwt_required()
 def get_eeg_status(eeg_id):
+    """
+    Long-poll: with `?wait=<seconds>` and an If-None-Match naming the current
+    status, the request is held until the status changes (or the wait, capped
+    at EEG_STATUS_MAX_WAIT_SECONDS, runs out and a 304 is returned).
+    """
+    wait = min(
+        request.args.get("wait", 0, type=float),
+        current_app.config["EEG_STATUS_MAX_WAIT_SECONDS"],
+    )
+    held = wait > 0
+    if held and not held_requests.acquire(current_app.config["EEG_EVENTS_MAX_STREAMS"]):
+        return _too_many_streams()
+
+    subscription = None
+    try:
+        # Subscribed before reading the status so no change can slip in between
+        if held:
+            subscription = get_event_broker().subscribe(eeg_channel(eeg_id))
+        current_user = get_current_user()
+        status = EegRecordService.get_eeg_status(eeg_id, current_user)
+
+        if subscription and status["status"] not in FINAL_STATUSES and client_has(status):
+            db.session.close()  # do not hold a pooled connection while waiting
+            if subscription.get(timeout=wait) is not None:
+                status = EegRecordService.get_eeg_status(eeg_id, current_user)
+
+        return conditional_json(status)
+    except PermissionError as e:
+        return jsonify({"error": str(e)}), 403
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    finally:
+        if subscription:
+            subscription.close()
+        if held:
+            held_requests.release()
+
+@eeg_records_bp.route("/eeg-records/<int:eeg_id>/events", methods=["GET"])
+@jwt_required()
+def stream_eeg_events(eeg_id):
+    """
+    Server-Sent Events stream of status changes (`event: status`), starting
+    with the current status and ending once it is processed or failed.
+    """
+    config = current_app.config
+    if not held_requests.acquire(config["EEG_EVENTS_MAX_STREAMS"]):
+        return _too_many_streams()
+
+    subscription = None
+    streaming = False
     try:
+        subscription = get_event_broker().subscribe(eeg_channel(eeg_id))
         current_user = get_current_user()
         status = EegRecordService.get_eeg_status(eeg_id, current_user)
-        return jsonify(status), 200
+
+        # The stream may stay open for minutes: give the connection back now
+        db.session.close()
+
+        body = stream_eeg_status(
+            subscription,
+            status,
+            config["EEG_EVENTS_HEARTBEAT_SECONDS"],
+            config["EEG_EVENTS_MAX_SECONDS"],
+        )
+        response = current_app.response_class(
+            stream_with_context(body),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        # From here the body closes the subscription and the server frees the
+        # slot when it closes the response, even if the body was never read
+        response.call_on_close(held_requests.release)
+        streaming = True
+        return response
     except PermissionError as e:
         return jsonify({"error": str(e)}), 403
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
+    finally:
+        if not streaming:
+            if subscription:
+                subscription.close()
+            held_requests.release()
+
+
+def _too_many_streams():
+    response = jsonify({"error": "Too many open status streams. Please retry later."})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(current_app.config["EEG_EVENTS_RETRY_AFTER_SECONDS"])
+    return response
     
 @eeg_records_bp.route("/eeg-records/<int:eeg_id>", methods=["DELETE"])
 @jwt_required()
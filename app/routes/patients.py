@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app.utils.security import get_current_user
 from app.services.patient_service import PatientService
+from app.utils.pagination import get_page_args, paginated_response
 
 patients_bp = Blueprint("patients", __name__)
 
@@ -33,9 +34,10 @@ def list_patients():
             "last_name": request.args.get("last_name"),
             "has_eeg_records": request.args.get("has_eeg_records"),
             "has_pending_eeg": request.args.get("has_pending_eeg"),
+            "q": request.args.get("q"),
         }
-        patients = PatientService.list_patients(filters, current_user)
-        return jsonify(patients), 200
+        page = PatientService.list_patients(filters, current_user, **get_page_args())
+        return paginated_response(page)
     
     except PermissionError as e:
         return jsonify({"error": str(e)}), 403
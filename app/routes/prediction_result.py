@@ -1,7 +1,9 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required
 from app.utils.security import get_current_user
 from app.services.prediction_result_service import PredictionResultService
+from app.utils.conditional import conditional_json, conditional_page
+from app.utils.pagination import get_page_args
 
 predictions_bp = Blueprint("predictions", __name__)
 
@@ -18,7 +20,7 @@ def get_prediction_by_eeg(eeg_record_id):
         prediction = PredictionResultService.get_by_eeg_record(
             eeg_record_id, current_user
         )
-        return jsonify(prediction), 200
+        return conditional_json(prediction)
     except PermissionError as e:
         return jsonify({"error": str(e)}), 403
     except ValueError as e:
@@ -32,12 +34,17 @@ def list_predictions_by_patient(patient_id):
     Complete history of a patient's predictions. 
     The user only sees their own patients' predictions; the administrator sees all predictions.
     """
+    try:
+        page_args = get_page_args()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     try:
         current_user = get_current_user()
-        predictions = PredictionResultService.list_by_patient(
-            patient_id, current_user
+        page = PredictionResultService.list_by_patient(
+            patient_id, current_user, **page_args
         )
-        return jsonify(predictions), 200
+        return conditional_page(page)
     except PermissionError as e:
         return jsonify({"error": str(e)}), 403
     except ValueError as e:
@@ -52,7 +59,27 @@ def list_all_predictions():
     """
     try:
         current_user = get_current_user()
-        predictions = PredictionResultService.list_all(current_user)
-        return jsonify(predictions), 200
+        page = PredictionResultService.list_all(current_user, **get_page_args())
+        return conditional_page(page)
     except PermissionError as e:
-        return jsonify({"error": str(e)}), 403
\ No newline at end of file
+        return jsonify({"error": str(e)}), 403
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@predictions_bp.route("/predictions/timings", methods=["GET"])
+@jwt_required()
+def get_stage_timings():
+    """
+    ADMIN only. Where worker time goes: p50/p95 per processing stage over
+    the latest predictions (?limit=, default 1000).
+    """
+    try:
+        limit = request.args.get("limit", 1000, type=int)
+        if limit < 1:
+            return jsonify({"error": "limit must be greater than 0"}), 400
+
+        current_user = get_current_user()
+        return jsonify(PredictionResultService.stage_timings(current_user, min(limit, 10000))), 200
+    except PermissionError as e:
+        return jsonify({"error": str(e)}), 403
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app.services.user_service import UserService
 from app.utils.security import get_current_user
+from app.utils.pagination import get_page_args, paginated_response
 
 users_bp = Blueprint("users", __name__)
 
@@ -25,10 +26,12 @@ def create_user():
 def list_users():
     try:
         current_user = get_current_user()
-        users = UserService.list_users(current_user)
-        return jsonify(users), 200
+        page = UserService.list_users(current_user, **get_page_args())
+        return paginated_response(page)
     except PermissionError as e:
         return jsonify({"error": str(e)}), 403
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
 
 @users_bp.route("/users/<int:user_id>", methods=["GET"])
@@ -1,9 +1,11 @@
 from datetime import datetime, timezone, timedelta
+from flask import current_app
 from werkzeug.security import check_password_hash
 from flask_jwt_extended import create_access_token
 from app.models.user import User
 from app.models.session import Session
 from app.extensions import db
+from app.utils.session_cache import get_session_cache
 
 SESSION_DURATION_MINUTES = 30
 
@@ -29,11 +31,16 @@ class AuthService:
         now = datetime.now(timezone.utc)
         expiration = now + timedelta(minutes=SESSION_DURATION_MINUTES)
 
-        token = create_access_token(identity=user.id)
+        # The role travels in the token so requests can be authorized
+        # without loading the user (see app.utils.principal)
+        token = create_access_token(
+            identity=user.id,
+            additional_claims={"role": user.role.value},
+        )
 
         session = Session(
             user_id=user.id,
-            token=token,
+            token_hash=Session.hash_token(token),
             start_date=now,
             expiration_date=expiration,
             is_active=True,
@@ -44,6 +51,11 @@ class AuthService:
         db.session.add(session)
         db.session.commit()
 
+        # The first authenticated request does not need to query the session
+        get_session_cache().store(
+            Session.hash_token(token).hex(), user.id, expiration.timestamp(), now.timestamp()
+        )
+
         return {
             "access_token": token,
             "expires_in": SESSION_DURATION_MINUTES * 60,
@@ -58,42 +70,87 @@ class AuthService:
 
     @staticmethod
     def logout(token: str) -> None:
-        session = Session.query.filter_by(token=token, is_active=True).first()
+        token_hash = Session.hash_token(token)
+
+        session = Session.query.filter_by(token_hash=token_hash, is_active=True).first()
         if session:
             session.is_active = False
             db.session.commit()
 
+        get_session_cache().invalidate(token_hash.hex())
+
+    @staticmethod
+    def check_session(token: str) -> bool:
+        """
+        Validates the session and slides its expiration, served from the
+        session cache. The database is only read on a cache miss and only
+        written when the last refresh is older than
+        SESSION_REFRESH_INTERVAL_SECONDS.
+        """
+        now = datetime.now(timezone.utc).timestamp()
+        cache = get_session_cache()
+        cache_key = Session.hash_token(token).hex()
+        entry = cache.get(cache_key)
+
+        if entry is None or now > entry["expires_at"]:
+            if not AuthService.validate_session(token):
+                return False
+            entry = cache.get(cache_key)
+            if entry is None:
+                return True
+
+        if now - entry["refreshed_at"] >= current_app.config["SESSION_REFRESH_INTERVAL_SECONDS"]:
+            AuthService.refresh_session(token)
+
+        return True
+
     @staticmethod
     def validate_session(token: str) -> bool:
         """
         Verifies that the session exists in the database, is active, and has not expired.
-        Called by the middleware on every authenticated request.
+        Called by check_session when the session is not cached.
         """
         now = datetime.now(timezone.utc)
+        token_hash = Session.hash_token(token)
 
-        session = Session.query.filter_by(token=token, is_active=True).first()
+        session = Session.query.filter_by(token_hash=token_hash, is_active=True).first()
 
         if not session:
             return False
 
-        if now > session.expiration_date.replace(tzinfo=timezone.utc):
+        expiration = session.expiration_date.replace(tzinfo=timezone.utc)
+
+        if now > expiration:
             session.is_active = False
             db.session.commit()
             return False
 
+        get_session_cache().store(
+            token_hash.hex(),
+            session.user_id,
+            expiration.timestamp(),
+            (expiration - timedelta(minutes=SESSION_DURATION_MINUTES)).timestamp(),
+        )
         return True
 
     @staticmethod
     def refresh_session(token: str) -> None:
         """
-        Extends session expiration on each valid request,
-        implementing 30-minute inactivity behavior.
+        Extends session expiration, implementing 30-minute inactivity behavior.
+        check_session calls it at most once per SESSION_REFRESH_INTERVAL_SECONDS.
         """
         now = datetime.now(timezone.utc)
-        session = Session.query.filter_by(token=token, is_active=True).first()
+        expiration = now + timedelta(minutes=SESSION_DURATION_MINUTES)
+
+        token_hash = Session.hash_token(token)
+
+        session = Session.query.filter_by(token_hash=token_hash, is_active=True).first()
         if session:
-            session.expiration_date = now + timedelta(minutes=SESSION_DURATION_MINUTES)
+            session.expiration_date = expiration
             db.session.commit()
+            get_session_cache().store(
+                token_hash.hex(), session.user_id, expiration.timestamp(), now.timestamp()
+            )
 
     @staticmethod
     def _invalidate_existing_session(user_id: int) -> None:
@@ -101,4 +158,6 @@ class AuthService:
             user_id=user_id,
             is_active=True
         ).update({"is_active": False})
-        db.session.commit()
\ No newline at end of file
+        db.session.commit()
+
+        get_session_cache().invalidate_user(user_id)
\ No newline at end of file
@@ -1,88 +1,220 @@
 import os
 import uuid
+from datetime import datetime, timezone
 from app.extensions import db
-from app.models.eeg_record import EegRecord, EegStatus, FILE_TYPE
+from app.models.eeg_record import EegRecord, EegStatus, EegPriority, FILE_TYPE
 from app.models.patient import Patient
 from app.models.user import User, UserRole
+from app.services.patient_summary_service import PatientSummaryService
+from app.services.queries import (
+    check_patient_access,
+    load_eeg_record,
+    paginate_patient_records,
+)
+from app.utils.pagination import DEFAULT_PAGE_SIZE, keyset_paginate
+from app.utils.serialization import rows_as_dicts
 
 UPLOAD_FOLDER = "uploads/eeg"
 MAX_FILE_SIZE_BYTES = 200 * 1024 * 1024  # 200 MB
+MAX_BATCH_FILES = 100
 ALLOWED_EXTENSIONS = {FILE_TYPE.PARQUET: ".parquet"}
 
 class EegRecordService:
 
-    @staticmethod
-    def create_eeg_record(file, patient_id: int, current_user: User) -> dict:
-        patient = db.session.get(Patient, patient_id)
-        if not patient or patient.is_deleted:
-            raise ValueError("Patient not found")
-
-        if (
-            current_user.role != UserRole.ADMIN
-            and patient.created_by != current_user.id
-        ):
-            raise PermissionError("Not allowed to upload EEG for this patient")
-
-        # Validate name and extension
-        original_filename = file.filename
-        if not original_filename:
-            raise ValueError("No file provided")
-
-        ext = os.path.splitext(original_filename)[1].lower()
-        allowed_exts = list(ALLOWED_EXTENSIONS.values())
-        if ext not in allowed_exts:
-            raise ValueError(f"File type not allowed. Allowed: {', '.join(allowed_exts)}")
-
-        # Determine EegFileType from the extension
-        file_type = next(
-            (ft for ft, e in ALLOWED_EXTENSIONS.items() if e == ext),
-            None
-        )
+    # Listings select only these columns and serialize the rows directly,
+    # without building ORM objects (same keys as _to_dict)
+    _LIST_COLUMNS = (
+        EegRecord.id,
+        EegRecord.patient_id,
+        EegRecord.uploader_id,
+        EegRecord.file_name,
+        EegRecord.file_type,
+        EegRecord.file_size_bytes,
+        EegRecord.status,
+        EegRecord.priority,
+        EegRecord.error_msg,
+        EegRecord.processing_time_ms,
+        EegRecord.created_at,
+        EegRecord.updated_at,
+    )
 
-        # Validate file size (read a chunk to determine if it's empty or too large)
-        file.seek(0, 2)  # Go to end of file
-        file_size = file.tell()
-        file.seek(0)     # Go back to start
+    @staticmethod
+    def create_eeg_record(file, patient_id: int, current_user: User, priority: str = None) -> dict:
+        priority = EegRecordService._parse_priority(priority)
 
-        if file_size == 0:
-            raise ValueError("File is empty")
-        if file_size > MAX_FILE_SIZE_BYTES:
-            raise ValueError(f"File exceeds maximum allowed size of {MAX_FILE_SIZE_BYTES // (1024*1024)} MB")
+        check_patient_access(patient_id, current_user, "Not allowed to upload EEG for this patient")
 
-        # Generate a unique name to avoid collisions and not expose the original name
-        unique_filename = f"{uuid.uuid4().hex}{ext}"
-        save_path = os.path.join(UPLOAD_FOLDER, unique_filename)
-        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-        file.save(save_path)
+        file_type, file_size = EegRecordService._validate_file(file)
+        save_path = EegRecordService._save_file(file)
 
         record = EegRecord(
             patient_id=patient_id,
             uploader_id=current_user.id,
-            file_name=original_filename,   # original name to show to users
+            file_name=file.filename,       # original name to show to users
             file_path=save_path,           # internal route, never exposed to users
             file_type=file_type,
             file_size_bytes=file_size,
             status=EegStatus.PENDING,
+            priority=priority,
         )
 
         db.session.add(record)
+        PatientSummaryService.records_added([patient_id], datetime.now(timezone.utc))
         db.session.commit()
 
         return EegRecordService._to_dict(record)
 
     @staticmethod
-    def list_eeg_records(filters: dict, current_user: User) -> list:
-        query = EegRecord.query.filter_by(is_deleted=False)
+    def create_eeg_records_batch(uploads: list, current_user: User, priority: str = None) -> list:
+        """
+        Registers many uploads at once. `uploads` is a list of (file, patient_id).
+        Patients are loaded with a single query and all valid records are
+        inserted in one flush; invalid files are reported instead of aborting
+        the whole batch.
+        """
+        if not uploads:
+            raise ValueError("No files provided")
+        if len(uploads) > MAX_BATCH_FILES:
+            raise ValueError(f"A batch cannot contain more than {MAX_BATCH_FILES} files")
+
+        priority = EegRecordService._parse_priority(priority)
+
+        patient_ids = {patient_id for _, patient_id in uploads}
+        patients = {
+            p.id: p
+            for p in Patient.query.filter(
+                Patient.id.in_(patient_ids),
+                Patient.is_deleted == False,
+            ).all()
+        }
+
+        results = []
+        records = []
+
+        for file, patient_id in uploads:
+            result = {"file_name": file.filename, "patient_id": patient_id}
+            results.append(result)
+
+            patient = patients.get(patient_id)
+            if not patient:
+                result.update(status="rejected", error="Patient not found")
+                continue
+
+            if (
+                current_user.role != UserRole.ADMIN
+                and patient.created_by != current_user.id
+            ):
+                result.update(status="rejected", error="Not allowed to upload EEG for this patient")
+                continue
+
+            try:
+                file_type, file_size = EegRecordService._validate_file(file)
+            except ValueError as e:
+                result.update(status="rejected", error=str(e))
+                continue
+
+            record = EegRecord(
+                patient_id=patient_id,
+                uploader_id=current_user.id,
+                file_name=file.filename,
+                file_path=EegRecordService._save_file(file),
+                file_type=file_type,
+                file_size_bytes=file_size,
+                status=EegStatus.PENDING,
+                priority=priority,
+            )
+            records.append((record, result))
+
+        if records:
+            db.session.add_all([record for record, _ in records])
+            PatientSummaryService.records_added(
+                [record.patient_id for record, _ in records], datetime.now(timezone.utc)
+            )
+            db.session.commit()
+
+        for record, result in records:
+            result.update(
+                status=record.status.value,
+                eeg_record_id=record.id,
+                file_size_bytes=record.file_size_bytes,
+                priority=record.priority.value,
+            )
+
+        return results
+
+    @staticmethod
+    def list_eeg_records(
+        filters: dict, current_user: User, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> dict:
+        query = (
+            db.session.query(*EegRecordService._LIST_COLUMNS)
+            .filter(*EegRecordService._list_criteria(filters, current_user))
+        )
+
+        records, next_cursor = keyset_paginate(
+            query, EegRecord.created_at, EegRecord.id, cursor, limit
+        )
+        return {
+            "items": rows_as_dicts(records),
+            "next_cursor": next_cursor,
+        }
+    
+    @staticmethod
+    def get_eeg_record(eeg_id: int, current_user: User) -> dict:
+        eeg = load_eeg_record(eeg_id, current_user)
+        return EegRecordService._to_dict(eeg)
+
+    @staticmethod
+    def list_by_patient(
+        patient_id: int, current_user: User, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> dict:
+        records, next_cursor = paginate_patient_records(
+            db.session.query(*EegRecordService._LIST_COLUMNS),
+            patient_id,
+            current_user,
+            EegRecord.created_at,
+            EegRecord.id,
+            "Not allowed to access this patient's records",
+            cursor,
+            limit,
+        )
+        return {
+            "items": rows_as_dicts(records),
+            "next_cursor": next_cursor,
+        }
+    
+    @staticmethod
+    def get_eeg_status(eeg_id: int, current_user: User) -> dict:
+        eeg = load_eeg_record(eeg_id, current_user)
+        return EegRecordService._status_dict(eeg)
+    
+    @staticmethod
+    def delete_eeg_record(eeg_id: int, current_user: User) -> dict:
+        eeg = load_eeg_record(eeg_id, current_user, "Not allowed to delete this record")
+
+        if eeg.status == EegStatus.PROCESSING:
+            raise ValueError("Cannot delete a record that is currently being processed")
+
+        eeg.soft_delete()
+        PatientSummaryService.record_removed(eeg)
+        db.session.commit()
+
+        return {"id": eeg.id, "status": "deleted"}
+
+    @staticmethod
+    def _list_criteria(filters: dict, current_user: User) -> list:
+        """Filters of the record listing (?patient_id=, ?status=) plus ownership"""
+        criteria = [EegRecord.is_deleted == False]
 
         if current_user.role != UserRole.ADMIN:
-            query = query.filter_by(uploader_id=current_user.id)
+            criteria.append(EegRecord.uploader_id == current_user.id)
 
         if filters.get("patient_id"):
             try:
                 patient_id = int(filters["patient_id"])
             except (ValueError, TypeError):
                 raise ValueError("patient_id must be an integer")
-            query = query.filter_by(patient_id=patient_id)
+            criteria.append(EegRecord.patient_id == patient_id)
 
         if filters.get("status"):
             try:
@@ -90,89 +222,70 @@ class EegRecordService:
             except ValueError:
                 valid = [s.value for s in EegStatus]
                 raise ValueError(f"Invalid status. Valid values: {', '.join(valid)}")
-            query = query.filter_by(status=status)
-
-        records = query.order_by(EegRecord.created_at.desc()).all()
-        return [EegRecordService._to_dict(r) for r in records]
-    
-    @staticmethod
-    def get_eeg_record(eeg_id: int, current_user: User) -> dict:
-        eeg = db.session.get(EegRecord, eeg_id)
-
-        if not eeg or eeg.is_deleted:
-            raise ValueError("EEG record not found")
+            criteria.append(EegRecord.status == status)
 
-        if (
-            current_user.role != UserRole.ADMIN
-            and eeg.uploader_id != current_user.id
-        ):
-            raise PermissionError("Not allowed to access this record")
+        return criteria
 
-        return EegRecordService._to_dict(eeg)
+    @staticmethod
+    def _parse_priority(priority: str) -> EegPriority:
+        if not priority:
+            return EegPriority.NORMAL
+        try:
+            return EegPriority(priority)
+        except ValueError:
+            valid = [p.value for p in EegPriority]
+            raise ValueError(f"Invalid priority. Valid values: {', '.join(valid)}")
 
     @staticmethod
-    def list_by_patient(patient_id: int, current_user: User) -> list:
-        patient = db.session.get(Patient, patient_id)
-        if not patient or patient.is_deleted:
-            raise ValueError("Patient not found")
+    def _validate_file(file) -> tuple:
+        """Validates name, extension and size. Returns (file_type, file_size)"""
+        original_filename = file.filename
+        if not original_filename:
+            raise ValueError("No file provided")
 
-        if (
-            current_user.role != UserRole.ADMIN
-            and patient.created_by != current_user.id
-        ):
-            raise PermissionError("Not allowed to access this patient's records")
+        ext = os.path.splitext(original_filename)[1].lower()
+        allowed_exts = list(ALLOWED_EXTENSIONS.values())
+        if ext not in allowed_exts:
+            raise ValueError(f"File type not allowed. Allowed: {', '.join(allowed_exts)}")
 
-        query = (
-            EegRecord.query
-            .filter_by(patient_id=patient_id, is_deleted=False)
-            .order_by(EegRecord.created_at.desc())
+        # Determine EegFileType from the extension
+        file_type = next(
+            (ft for ft, e in ALLOWED_EXTENSIONS.items() if e == ext),
+            None
         )
 
-        if current_user.role != UserRole.ADMIN:
-            query = query.filter_by(uploader_id=current_user.id)
+        # Validate file size (read a chunk to determine if it's empty or too large)
+        file.seek(0, 2)  # Go to end of file
+        file_size = file.tell()
+        file.seek(0)     # Go back to start
 
-        return [EegRecordService._to_dict(r) for r in query.all()]
-    
-    @staticmethod
-    def get_eeg_status(eeg_id: int, current_user: User) -> dict:
-        eeg = db.session.get(EegRecord, eeg_id)
+        if file_size == 0:
+            raise ValueError("File is empty")
+        if file_size > MAX_FILE_SIZE_BYTES:
+            raise ValueError(f"File exceeds maximum allowed size of {MAX_FILE_SIZE_BYTES // (1024*1024)} MB")
 
-        if not eeg or eeg.is_deleted:
-            raise ValueError("EEG record not found")
+        return file_type, file_size
 
-        if (
-            current_user.role != UserRole.ADMIN
-            and eeg.uploader_id != current_user.id
-        ):
-            raise PermissionError("Not allowed to access this record")
+    @staticmethod
+    def _save_file(file) -> str:
+        # Generate a unique name to avoid collisions and not expose the original name
+        ext = os.path.splitext(file.filename)[1].lower()
+        unique_filename = f"{uuid.uuid4().hex}{ext}"
+        save_path = os.path.join(UPLOAD_FOLDER, unique_filename)
+        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+        file.save(save_path)
+        return save_path
 
+    @staticmethod
+    def _status_dict(record: EegRecord) -> dict:
         return {
-            "id": eeg.id,
-            "status": eeg.status.value,
-            "processing_time_ms": eeg.processing_time_ms,
-            "error_msg": eeg.error_msg if eeg.status == EegStatus.FAILED else None,
+            "id": record.id,
+            "status": record.status.value,
+            "progress": record.progress,
+            "processing_time_ms": record.processing_time_ms,
+            "error_msg": record.error_msg if record.status == EegStatus.FAILED else None,
+            "updated_at": record.updated_at.isoformat(),
         }
-    
-    @staticmethod
-    def delete_eeg_record(eeg_id: int, current_user: User) -> dict:
-        eeg = db.session.get(EegRecord, eeg_id)
-
-        if not eeg or eeg.is_deleted:
-            raise ValueError("EEG record not found")
-
-        if (
-            current_user.role != UserRole.ADMIN
-            and eeg.uploader_id != current_user.id
-        ):
-            raise PermissionError("Not allowed to delete this record")
-
-        if eeg.status == EegStatus.PROCESSING:
-            raise ValueError("Cannot delete a record that is currently being processed")
-
-        eeg.soft_delete()
-        db.session.commit()
-
-        return {"id": eeg.id, "status": "deleted"}
 
     @staticmethod
     def _to_dict(record: EegRecord) -> dict:
@@ -184,6 +297,7 @@ class EegRecordService:
             "file_type": record.file_type.value,
             "file_size_bytes": record.file_size_bytes,
             "status": record.status.value,
+            "priority": record.priority.value,
             "error_msg": record.error_msg,
             "processing_time_ms": record.processing_time_ms,
             "created_at": record.created_at.isoformat(),
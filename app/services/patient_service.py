@@ -1,13 +1,34 @@
 from datetime import datetime
 from app.extensions import db
-from app.models.eeg_record import EegRecord
 from app.models.patient import Patient
+from app.models.patient_summary import PatientSummary
 from app.models.user import User, UserRole
-from sqlalchemy import func
+from app.utils.pagination import DEFAULT_PAGE_SIZE, keyset_paginate
+from app.utils.serialization import rows_as_dicts
+from app.utils.text import normalize_text
+from sqlalchemy import and_, case, func, or_
 
 
 class PatientService:
 
+    # Listings select only these columns and serialize the rows directly,
+    # without building ORM objects (keys of _to_dict plus the patient's
+    # summary for dashboards)
+    _LIST_COLUMNS = (
+        Patient.id,
+        Patient.identification_number,
+        Patient.first_name,
+        Patient.last_name,
+        Patient.birth_date,
+        Patient.created_by,
+        Patient.created_at,
+        PatientSummary.eeg_count,
+        PatientSummary.pending_count,
+        PatientSummary.last_upload_at,
+        PatientSummary.latest_result,
+        PatientSummary.latest_raw_probability,
+    )
+
     @staticmethod
     def create_patient(data: dict, current_user: User):
         required_fields = ["identification_number", "first_name", "last_name"]
@@ -53,12 +74,16 @@ class PatientService:
         return PatientService._to_dict(patient)
 
     @staticmethod
-    def list_patients(filters: dict, current_user):
-        query = db.session.query(Patient).filter_by(is_deleted=False)
+    def list_patients(filters: dict, current_user, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+        query = (
+            db.session.query(*PatientService._LIST_COLUMNS)
+            .outerjoin(PatientSummary, PatientSummary.patient_id == Patient.id)
+            .filter(Patient.is_deleted == False)
+        )
 
         # Control por rol
         if current_user.role != UserRole.ADMIN:
-            query = query.filter_by(created_by=current_user.id)
+            query = query.filter(Patient.created_by == current_user.id)
 
         # ---- Filters ----
 
@@ -68,53 +93,101 @@ class PatientService:
                 Patient.identification_number == filters["identification_number"]
             )
 
-        # first_name (partial, case insensitive)
+        # first_name / last_name (partial, case and accent insensitive),
+        # on the normalized columns: trigram indexed on PostgreSQL
         if filters.get("first_name"):
             query = query.filter(
-                func.lower(Patient.first_name).like(
-                    f"%{filters['first_name'].lower()}%"
+                Patient.first_name_normalized.contains(
+                    normalize_text(filters["first_name"]), autoescape=True
                 )
             )
 
-        # last_name (partial, case insensitive)
         if filters.get("last_name"):
             query = query.filter(
-                func.lower(Patient.last_name).like(
-                    f"%{filters['last_name'].lower()}%"
+                Patient.last_name_normalized.contains(
+                    normalize_text(filters["last_name"]), autoescape=True
                 )
             )
 
-        # has_eeg_records (boolean)
-        if filters.get("has_eeg_records") is not None:
-            if filters["has_eeg_records"] == "true":
-                query = query.filter(
-                    db.exists().where(EegRecord.patient_id == Patient.id)
-                )
-            elif filters["has_eeg_records"] == "false":
-                query = query.filter(
-                    ~db.exists().where(EegRecord.patient_id == Patient.id)
-                )
+        # has_eeg_records / has_pending_eeg (boolean), served by patient_summaries
+        if filters.get("has_eeg_records") == "true":
+            query = query.filter(PatientSummary.eeg_count > 0)
+        elif filters.get("has_eeg_records") == "false":
+            query = query.filter(func.coalesce(PatientSummary.eeg_count, 0) == 0)
+
+        if filters.get("has_pending_eeg") == "true":
+            query = query.filter(PatientSummary.pending_count > 0)
+        elif filters.get("has_pending_eeg") == "false":
+            query = query.filter(func.coalesce(PatientSummary.pending_count, 0) == 0)
+
+        # q: combined search over identification number and names. Results
+        # are ranked, so they come as a single page without a cursor
+        if filters.get("q"):
+            return {
+                "items": rows_as_dicts(PatientService._search(query, filters["q"], limit)),
+                "next_cursor": None,
+            }
+
+        patients, next_cursor = keyset_paginate(
+            query, Patient.created_at, Patient.id, cursor, limit
+        )
 
-        # has_pending_eeg (boolean)
-        if filters.get("has_pending_eeg") is not None:
-            if filters["has_pending_eeg"] == "true":
-                query = query.filter(
-                    db.exists().where(
-                        (EegRecord.patient_id == Patient.id) &
-                        (EegRecord.status == EegRecord.status.PENDING)
-                    )
-                )
-            elif filters["has_pending_eeg"] == "false":
-                query = query.filter(
-                    ~db.exists().where(
-                        (EegRecord.patient_id == Patient.id) &
-                        (EegRecord.status == EegRecord.status.PENDING)
-                    )
-                )
+        return {
+            "items": rows_as_dicts(patients),
+            "next_cursor": next_cursor,
+        }
 
-        patients = query.order_by(Patient.created_at.desc()).all()
+    @staticmethod
+    def _search(query, q: str, limit: int) -> list:
+        """
+        A patient matches when its identification number starts with `q`,
+        or when every word of `q` starts one of the words of its names.
+        Ranking: exact identification, identification prefix, exact name,
+        names starting with the words, words matched inside the names.
+        """
+        identification = q.strip()
+        normalized = normalize_text(q)
+        words = normalized.split()
+
+        def starts_name(word):
+            return or_(
+                Patient.first_name_normalized.startswith(word, autoescape=True),
+                Patient.last_name_normalized.startswith(word, autoescape=True),
+            )
+
+        def starts_name_word(word):
+            return or_(
+                starts_name(word),
+                Patient.first_name_normalized.contains(f" {word}", autoescape=True),
+                Patient.last_name_normalized.contains(f" {word}", autoescape=True),
+            )
 
-        return [PatientService._to_dict(p) for p in patients]
+        identification_prefix = Patient.identification_number.startswith(identification, autoescape=True)
+        full_name = Patient.first_name_normalized + " " + Patient.last_name_normalized
+
+        rank = case(
+            (Patient.identification_number == identification, 0),
+            (identification_prefix, 1),
+            (or_(
+                Patient.first_name_normalized == normalized,
+                Patient.last_name_normalized == normalized,
+                full_name == normalized,
+            ), 2),
+            (and_(*[starts_name(w) for w in words]), 3),
+            else_=4,
+        )
+
+        matches = [identification_prefix]
+        if words:
+            matches.append(and_(*[starts_name_word(w) for w in words]))
+
+        return (
+            query
+            .filter(or_(*matches))
+            .order_by(rank, Patient.last_name_normalized, Patient.first_name_normalized, Patient.id)
+            .limit(limit)
+            .all()
+        )
 
     @staticmethod
     def get_patient(patient_id: int, current_user):
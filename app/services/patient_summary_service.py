@@ -0,0 +1,120 @@
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import case, func, select, update
+from app.extensions import db
+from app.models.eeg_record import EegRecord, EegStatus
+from app.models.patient_summary import PatientSummary
+from app.models.prediction_result import AlcoholismRisk, PredictionResult
+
+
+class PatientSummaryService:
+    """
+    Keeps patient_summaries in step with eeg_records. Every method only adds
+    statements to the current transaction; the caller commits them together
+    with the change they describe. Counters are updated with relative
+    UPDATEs (count = count + n) so concurrent writers do not overwrite each
+    other, and patients are always updated in id order to avoid deadlocks.
+    """
+
+    @staticmethod
+    def records_added(patient_ids: list, uploaded_at: datetime) -> None:
+        """New PENDING records, one patient id per record"""
+        for patient_id, n in sorted(Counter(patient_ids).items()):
+            db.session.execute(
+                update(PatientSummary)
+                .where(PatientSummary.patient_id == patient_id)
+                .values(
+                    eeg_count=PatientSummary.eeg_count + n,
+                    pending_count=PatientSummary.pending_count + n,
+                    last_upload_at=uploaded_at,
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def pending_changed(patient_ids: list, delta: int) -> None:
+        """Records entering (delta=1) or leaving (delta=-1) the PENDING status"""
+        for patient_id, n in sorted(Counter(patient_ids).items()):
+            db.session.execute(
+                update(PatientSummary)
+                .where(PatientSummary.patient_id == patient_id)
+                .values(pending_count=PatientSummary.pending_count + delta * n)
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def prediction_saved(
+        patient_id: int, result: AlcoholismRisk, raw_probability: float, predicted_at: datetime
+    ) -> None:
+        db.session.execute(
+            update(PatientSummary)
+            .where(
+                PatientSummary.patient_id == patient_id,
+                # A late retry of an older record must not hide a newer result
+                (PatientSummary.latest_prediction_at == None)
+                | (PatientSummary.latest_prediction_at <= predicted_at),
+            )
+            .values(
+                latest_result=result,
+                latest_raw_probability=raw_probability,
+                latest_prediction_at=predicted_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def record_removed(eeg_record: EegRecord) -> None:
+        values = {"eeg_count": PatientSummary.eeg_count - 1}
+        if eeg_record.status == EegStatus.PENDING:
+            values["pending_count"] = PatientSummary.pending_count - 1
+
+        db.session.execute(
+            update(PatientSummary)
+            .where(PatientSummary.patient_id == eeg_record.patient_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+        # The removed record may have held the latest prediction
+        PatientSummaryService._refresh_latest(eeg_record.patient_id)
+
+    @staticmethod
+    def rebuild(patient_id: int) -> None:
+        """Recomputes a patient's summary from eeg_records (repairs drift)"""
+        counts = db.session.execute(
+            select(
+                func.count(EegRecord.id),
+                func.coalesce(func.sum(case((EegRecord.status == EegStatus.PENDING, 1), else_=0)), 0),
+                func.max(EegRecord.created_at),
+            )
+            .where(EegRecord.patient_id == patient_id, EegRecord.is_deleted == False)
+        ).one()
+
+        db.session.execute(
+            update(PatientSummary)
+            .where(PatientSummary.patient_id == patient_id)
+            .values(eeg_count=counts[0], pending_count=counts[1], last_upload_at=counts[2])
+            .execution_options(synchronize_session=False)
+        )
+        PatientSummaryService._refresh_latest(patient_id)
+
+    @staticmethod
+    def _refresh_latest(patient_id: int) -> None:
+        latest = db.session.execute(
+            select(PredictionResult.result, PredictionResult.raw_probability, PredictionResult.created_at)
+            .join(EegRecord, PredictionResult.eeg_record_id == EegRecord.id)
+            .where(EegRecord.patient_id == patient_id, EegRecord.is_deleted == False)
+            .order_by(PredictionResult.created_at.desc(), PredictionResult.id.desc())
+            .limit(1)
+        ).first()
+
+        db.session.execute(
+            update(PatientSummary)
+            .where(PatientSummary.patient_id == patient_id)
+            .values(
+                latest_result=latest.result if latest else None,
+                latest_raw_probability=latest.raw_probability if latest else None,
+                latest_prediction_at=latest.created_at if latest else None,
+            )
+            .execution_options(synchronize_session=False)
+        )
@@ -1,82 +1,131 @@
 from app.extensions import db
 from app.models.prediction_result import PredictionResult
 from app.models.eeg_record import EegRecord, EegStatus
-from app.models.patient import Patient
 from app.models.user import User, UserRole
+from app.services.queries import load_eeg_record, paginate_patient_records
+from app.utils.pagination import DEFAULT_PAGE_SIZE, keyset_paginate
+from app.utils.serialization import rows_as_dicts
+from app.utils.timing import percentile
 
 
 class PredictionResultService:
 
+    # Listings select only these columns and serialize the rows directly,
+    # without building ORM objects (same keys as _to_dict)
+    _LIST_COLUMNS = (
+        PredictionResult.id,
+        PredictionResult.eeg_record_id,
+        PredictionResult.result,
+        PredictionResult.confidence,
+        PredictionResult.raw_probability,
+        PredictionResult.model_version,
+        PredictionResult.created_at,
+    )
+
     @staticmethod
     def get_by_eeg_record(eeg_record_id: int, current_user: User) -> dict:
-        eeg = db.session.get(EegRecord, eeg_record_id)
-        if not eeg or eeg.is_deleted:
-            raise ValueError("EEG record not found")
-
-        if (
-            current_user.role != UserRole.ADMIN
-            and eeg.uploader_id != current_user.id
-        ):
-            raise PermissionError("Not allowed to access this record")
-
-        # Verify that the EEG has been processed successfully before trying to get the prediction
-        if eeg.status == EegStatus.PENDING or eeg.status == EegStatus.PROCESSING:
-            raise ValueError("EEG record has not been processed yet")
+        # Record, ownership and prediction in a single joined query
+        eeg = load_eeg_record(eeg_record_id, current_user, with_prediction=True)
+        return PredictionResultService._prediction_of(eeg)
 
-        if eeg.status == EegStatus.FAILED:
-            raise ValueError("EEG processing failed — no prediction available")
-
-        prediction = PredictionResult.query.filter_by(
-            eeg_record_id=eeg_record_id
-        ).first()
+    @staticmethod
+    def list_by_patient(
+        patient_id: int, current_user: User, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> dict:
+        query = (
+            db.session.query(*PredictionResultService._LIST_COLUMNS)
+            .join(EegRecord, PredictionResult.eeg_record_id == EegRecord.id)
+        )
 
-        if not prediction:
-            raise ValueError("Prediction result not found")
+        predictions, next_cursor = paginate_patient_records(
+            query,
+            patient_id,
+            current_user,
+            PredictionResult.created_at,
+            PredictionResult.id,
+            "Not allowed to access this patient's predictions",
+            cursor,
+            limit,
+        )
 
-        return PredictionResultService._to_dict(prediction)
+        return {
+            "items": rows_as_dicts(predictions),
+            "next_cursor": next_cursor,
+        }
 
     @staticmethod
-    def list_by_patient(patient_id: int, current_user: User) -> list:
-        patient = db.session.get(Patient, patient_id)
-        if not patient or patient.is_deleted:
-            raise ValueError("Patient not found")
-
-        if (
-            current_user.role != UserRole.ADMIN
-            and patient.created_by != current_user.id
-        ):
-            raise PermissionError("Not allowed to access this patient's predictions")
+    def list_all(current_user: User, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE) -> dict:
+        if current_user.role != UserRole.ADMIN:
+            raise PermissionError("Only ADMIN can access the full predictions list")
 
         query = (
-            db.session.query(PredictionResult)
+            db.session.query(*PredictionResultService._LIST_COLUMNS)
             .join(EegRecord, PredictionResult.eeg_record_id == EegRecord.id)
-            .filter(
-                EegRecord.patient_id == patient_id,
-                EegRecord.is_deleted == False,
-            )
+            .filter(EegRecord.is_deleted == False)
         )
 
-        if current_user.role != UserRole.ADMIN:
-            query = query.filter(EegRecord.uploader_id == current_user.id)
-
-        query = query.order_by(PredictionResult.created_at.desc())
+        predictions, next_cursor = keyset_paginate(
+            query, PredictionResult.created_at, PredictionResult.id, cursor, limit
+        )
 
-        return [PredictionResultService._to_dict(p) for p in query.all()]
+        return {
+            "items": rows_as_dicts(predictions),
+            "next_cursor": next_cursor,
+        }
 
     @staticmethod
-    def list_all(current_user: User) -> list:
+    def stage_timings(current_user: User, limit: int = 1000) -> dict:
+        """
+        p50/p95/mean per processing stage over the `limit` latest
+        predictions, plus the end-to-end processing time.
+        """
         if current_user.role != UserRole.ADMIN:
-            raise PermissionError("Only ADMIN can access the full predictions list")
+            raise PermissionError("Only ADMIN can access processing timings")
 
-        predictions = (
-            db.session.query(PredictionResult)
+        rows = (
+            db.session.query(PredictionResult.stage_timings_ms, EegRecord.processing_time_ms)
             .join(EegRecord, PredictionResult.eeg_record_id == EegRecord.id)
-            .filter(EegRecord.is_deleted == False)
-            .order_by(PredictionResult.created_at.desc())
+            .filter(PredictionResult.stage_timings_ms != None)
+            .order_by(PredictionResult.created_at.desc(), PredictionResult.id.desc())
+            .limit(limit)
             .all()
         )
 
-        return [PredictionResultService._to_dict(p) for p in predictions]
+        samples = {}
+        for timings, processing_time_ms in rows:
+            for stage, ms in timings.items():
+                samples.setdefault(stage, []).append(ms)
+            if processing_time_ms is not None:
+                samples.setdefault("total", []).append(processing_time_ms)
+
+        stages = {}
+        for stage, values in samples.items():
+            values.sort()
+            stages[stage] = {
+                "count": len(values),
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+                "mean_ms": round(sum(values) / len(values), 3),
+            }
+
+        return {"predictions": len(rows), "stages": stages}
+
+    @staticmethod
+    def _prediction_of(eeg: EegRecord) -> dict:
+        """The prediction of a record loaded with it; ValueError while there is none"""
+        # Verify that the EEG has been processed successfully before trying to get the prediction
+        if eeg.status == EegStatus.PENDING or eeg.status == EegStatus.PROCESSING:
+            raise ValueError("EEG record has not been processed yet")
+
+        if eeg.status == EegStatus.FAILED:
+            raise ValueError("EEG processing failed — no prediction available")
+
+        prediction = eeg.prediction_result
+
+        if not prediction:
+            raise ValueError("Prediction result not found")
+
+        return PredictionResultService._to_dict(prediction)
 
     @staticmethod
     def _to_dict(prediction: PredictionResult) -> dict:
@@ -0,0 +1,92 @@
+from sqlalchemy.orm import joinedload
+from app.extensions import db
+from app.models.eeg_record import EegRecord
+from app.models.patient import Patient
+from app.models.user import User, UserRole
+from app.utils.pagination import DEFAULT_PAGE_SIZE, keyset_paginate
+
+
+def check_owner(owner_id: int, current_user: User, denied_message: str) -> None:
+    """Only the owner of a row, or an ADMIN, may use it"""
+    if current_user.role != UserRole.ADMIN and owner_id != current_user.id:
+        raise PermissionError(denied_message)
+
+
+def load_eeg_record(
+    eeg_id: int,
+    current_user: User,
+    denied_message: str = "Not allowed to access this record",
+    with_prediction: bool = False,
+) -> EegRecord:
+    """
+    Loads an active record and checks the caller may use it. With
+    with_prediction the PredictionResult comes in the same query
+    (LEFT OUTER JOIN) instead of a second lookup.
+    """
+    query = EegRecord.query.filter_by(id=eeg_id, is_deleted=False)
+    if with_prediction:
+        query = query.options(joinedload(EegRecord.prediction_result))
+
+    eeg = query.first()
+    if not eeg:
+        raise ValueError("EEG record not found")
+
+    check_owner(eeg.uploader_id, current_user, denied_message)
+    return eeg
+
+
+def check_patient_access(patient_id: int, current_user: User, denied_message: str) -> Patient:
+    patient = db.session.get(Patient, patient_id)
+    if not patient or patient.is_deleted:
+        raise ValueError("Patient not found")
+
+    check_owner(patient.created_by, current_user, denied_message)
+    return patient
+
+
+def patient_records_criteria(patient_id: int, current_user: User) -> list:
+    """Active records of an active patient, restricted to the caller's own unless ADMIN"""
+    criteria = [
+        EegRecord.patient_id == patient_id,
+        EegRecord.is_deleted == False,
+        Patient.is_deleted == False,
+    ]
+
+    if current_user.role != UserRole.ADMIN:
+        criteria += [
+            EegRecord.uploader_id == current_user.id,
+            Patient.created_by == current_user.id,
+        ]
+
+    return criteria
+
+
+def paginate_patient_records(
+    query,
+    patient_id: int,
+    current_user: User,
+    created_col,
+    id_col,
+    denied_message: str,
+    cursor: str = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> tuple:
+    """
+    Keyset page of a query over eeg_records (or joined with it) restricted to
+    one patient. The patient's existence and ownership are part of the page
+    query itself, so a non-empty page needs a single statement; the patient
+    is only loaded on its own when the page is empty, to tell 404/403 apart
+    from a patient without records.
+    """
+    query = (
+        query
+        .join(Patient, Patient.id == EegRecord.patient_id)
+        .filter(*patient_records_criteria(patient_id, current_user))
+    )
+
+    rows, next_cursor = keyset_paginate(query, created_col, id_col, cursor, limit)
+
+    if not rows:
+        check_patient_access(patient_id, current_user, denied_message)
+
+    return rows, next_cursor
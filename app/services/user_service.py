@@ -1,10 +1,25 @@
 from werkzeug.security import generate_password_hash
 from app.extensions import db
 from app.models.user import User, UserRole
+from app.services.auth_service import AuthService
+from app.utils.pagination import DEFAULT_PAGE_SIZE, keyset_paginate
+from app.utils.serialization import rows_as_dicts
 
 
 class UserService:
 
+    # Listings select only these columns and serialize the rows directly,
+    # without building ORM objects (same keys as _to_dict)
+    _LIST_COLUMNS = (
+        User.id,
+        User.email,
+        User.first_name,
+        User.last_name,
+        User.role,
+        User.last_login,
+        User.created_at,
+    )
+
     @staticmethod
     def create_user(data: dict, current_user: User):
         if current_user.role != UserRole.ADMIN:
@@ -56,12 +71,19 @@ class UserService:
         return UserService._to_dict(user)
 
     @staticmethod
-    def list_users(current_user: User):
+    def list_users(current_user: User, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
         if current_user.role != UserRole.ADMIN:
             raise PermissionError("Only ADMIN can list users")
 
-        users = db.session.query(User).filter_by(is_deleted=False).all()
-        return [UserService._to_dict(u) for u in users]
+        query = (
+            db.session.query(*UserService._LIST_COLUMNS)
+            .filter(User.is_deleted == False)
+        )
+        users, next_cursor = keyset_paginate(query, User.created_at, User.id, cursor, limit)
+        return {
+            "items": rows_as_dicts(users),
+            "next_cursor": next_cursor,
+        }
 
     @staticmethod
     def get_user(user_id: int, current_user: User):
@@ -122,6 +144,9 @@ class UserService:
         user.soft_delete()
         db.session.commit()
 
+        # Its tokens carry their own claims: close the sessions explicitly
+        AuthService._invalidate_existing_session(user.id)
+
         return UserService._to_dict(user)
 
     @staticmethod
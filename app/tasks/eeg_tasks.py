@@ -1,64 +1,299 @@
 import time
+from datetime import datetime, timezone
+from flask import current_app
+from sqlalchemy import update
 from app.extensions import db, celery
-from app.domain.reader.parquet_reader import ParquetEegReader
-from app.ml.inference import run_inference
+from app.domain.reader.dense_reader import DenseEegRecording, ensure_dense
+from app.ml.inference import run_inference, run_batched_inference
 from app.ml.model_loader import get_model
 from app.models.eeg_record import EegRecord, EegStatus
 from app.models.prediction_result import PredictionResult
-from app.ml.preprocessing import build_tensor_from_parquet
+from app.ml.preprocessing import build_tensor_from_recording
+from app.services.patient_summary_service import PatientSummaryService
+from app.tasks.scheduling import eeg_record_signature
+from app.utils import metrics
+from app.utils.events import publish_eeg_status
+from app.utils.timing import StageTimer
+
+# Share of the progress bar taken by preprocessing, which dominates the run
+PREPROCESSING_SHARE = 80
 
 @celery.task(bind=True, max_retries=3)
 def process_eeg_record(self, eeg_record_id: int):
     start_time = time.time()
+    timer = StageTimer()
+
+    with timer.span("claim"):
+        claimed = _claim([eeg_record_id])
 
     eeg_record = db.session.get(EegRecord, eeg_record_id)
     if not eeg_record:
         # No tiene sentido reintentar si el registro no existe
         return {"error": f"EegRecord {eeg_record_id} not found"}
 
-    try:
-        eeg_record.status = EegStatus.PROCESSING
-        db.session.commit()
-
-        X = build_tensor_from_parquet(
-            parquet_path=eeg_record.file_path,
-            win_size=256,
-            step_size=256,
-            use_bands=True
-        )
+    if not claimed:
+        # Duplicate delivery (late ack, retry or sweeper re-enqueue): another
+        # copy is processing it or already did, or it was deleted
+        return {"eeg_record_id": eeg_record_id, "status": eeg_record.status.value}
 
-        if X.size == 0:
-            raise ValueError("No valid EEG samples generated from the provided file")
+    publish_eeg_status(eeg_record, progress=0)
 
-        label, raw_prob, confidence = run_inference(X)
-
-        prediction = PredictionResult(
-            eeg_record_id=eeg_record.id,
-            result=label,
-            confidence=confidence,
-            raw_probability=raw_prob,       
-            model_version="eegnet_v1"
-        )
+    try:
+        reporter = ProgressReporter(eeg_record)
+        X = _build_tensor(eeg_record, reporter.preprocessing, timer)
 
-        db.session.add(prediction)
+        with timer.span("inference"):
+            label, raw_prob, confidence = run_inference(X, reporter.inference)
 
-        eeg_record.status = EegStatus.PROCESSED
-        eeg_record.processing_time_ms = int((time.time() - start_time) * 1000)
-        eeg_record.error_msg = None  # limpiar errores de intentos previos
+        _save_prediction(eeg_record, label, raw_prob, confidence, time.time() - start_time, timer)
 
         db.session.commit()
+        publish_eeg_status(eeg_record, progress=100)
 
         return {"eeg_record_id": eeg_record_id, "status": "processed"}
 
     except Exception as e:
         db.session.rollback()  # importante: revertir cualquier cambio parcial
 
-        eeg_record.status = EegStatus.FAILED
+        try:
+            # Another copy saved it first (unique eeg_record_id): nothing failed
+            if _has_prediction(eeg_record_id):
+                _mark_processed(eeg_record)
+                return {"eeg_record_id": eeg_record_id, "status": "processed"}
+        except Exception:
+            db.session.rollback()
+
+        # While a retry is pending the record waits again instead of failing:
+        # FAILED is final for the clients watching it
+        retrying = self.request.retries < self.max_retries
+        eeg_record.status = EegStatus.PENDING if retrying else EegStatus.FAILED
         eeg_record.error_msg = str(e)[:500]  # limitar longitud para no llenar la BD
+        if retrying:
+            eeg_record.progress = 0
+            PatientSummaryService.pending_changed([eeg_record.patient_id], 1)
 
         try:
             db.session.commit()
+            publish_eeg_status(eeg_record)
         except Exception:
             db.session.rollback()
 
-        raise self.retry(exc=e, countdown=10)  # reintenta tras 60s, máximo 3 veces
\ No newline at end of file
+        raise self.retry(exc=e, countdown=10)  # reintenta tras 60s, máximo 3 veces
+
+
+@celery.task(bind=True)
+def process_eeg_batch(self, eeg_record_ids: list):
+    """
+    Processes several small records with a single model call. Their windows
+    are concatenated into one tensor and the per-record mean probability is
+    split back out. Records that fail, or the whole batch if inference fails,
+    fall back to process_eeg_record so they keep its retry behaviour.
+    """
+    claimed = _claim(eeg_record_ids)
+    records = (
+        EegRecord.query
+        .filter(EegRecord.id.in_(claimed))
+        .order_by(EegRecord.id)
+        .all()
+    )
+    for eeg_record in records:
+        publish_eeg_status(eeg_record, progress=0)
+
+    batch = []
+    fallback = []
+
+    for eeg_record in records:
+        timer = StageTimer()
+        try:
+            X = _build_tensor(eeg_record, ProgressReporter(eeg_record).preprocessing, timer)
+        except Exception:
+            # Progress is committed from inside: a failed write needs a rollback
+            db.session.rollback()
+            fallback.append(eeg_record)
+            continue
+        batch.append((eeg_record, X, timer))
+
+    if batch:
+        try:
+            start_time = time.time()
+            metrics.INFERENCE_BATCH_RECORDS.observe(len(batch))
+            results = run_batched_inference([X for _, X, _ in batch])
+            inference_time = time.time() - start_time
+
+            total_windows = sum(len(X) for _, X, _ in batch)
+            for (eeg_record, X, timer), (label, raw_prob, confidence) in zip(batch, results):
+                # Each record is charged its share of the shared predict call
+                timer.add("inference", inference_time * len(X) / total_windows)
+                elapsed = sum(timer.seconds[stage] for stage in ("read", "preprocess", "inference"))
+                _save_prediction(eeg_record, label, raw_prob, confidence, elapsed, timer)
+
+            db.session.commit()
+            for eeg_record, _, _ in batch:
+                publish_eeg_status(eeg_record, progress=100)
+        except Exception:
+            db.session.rollback()
+            fallback.extend(eeg_record for eeg_record, _, _ in batch)
+            batch = []
+
+    _requeue(fallback)
+
+    return {
+        "processed": [eeg_record.id for eeg_record, _, _ in batch],
+        "fallback": [eeg_record.id for eeg_record in fallback],
+    }
+
+
+def _claim(eeg_record_ids: list) -> list:
+    """
+    Moves the records still waiting for a run (PENDING, or FAILED and being
+    retried) to PROCESSING with a conditional UPDATE, so of two deliveries of
+    the same record only one gets it. Deleted records are skipped. Returns
+    the claimed ids.
+    """
+    now = datetime.now(timezone.utc)
+    claimed = []
+
+    for status in (EegStatus.PENDING, EegStatus.FAILED):
+        rows = db.session.execute(
+            update(EegRecord)
+            .where(
+                EegRecord.id.in_(eeg_record_ids),
+                EegRecord.status == status,
+                EegRecord.is_deleted == False,
+            )
+            .values(status=EegStatus.PROCESSING, progress=0, updated_at=now)
+            .returning(EegRecord.id, EegRecord.patient_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+
+        if status == EegStatus.PENDING:
+            PatientSummaryService.pending_changed([row.patient_id for row in rows], -1)
+        claimed.extend(row.id for row in rows)
+
+    db.session.commit()
+    return claimed
+
+
+def _has_prediction(eeg_record_id: int) -> bool:
+    return db.session.query(
+        PredictionResult.query.filter_by(eeg_record_id=eeg_record_id).exists()
+    ).scalar()
+
+
+def _mark_processed(eeg_record: EegRecord) -> None:
+    eeg_record.status = EegStatus.PROCESSED
+    eeg_record.progress = 100
+    eeg_record.error_msg = None
+    db.session.commit()
+    publish_eeg_status(eeg_record, progress=100)
+
+
+def _requeue(records: list) -> None:
+    """
+    Back to PENDING and re-enqueued one by one through the scheduler, so each
+    record keeps its lane, priority and the uploader's fair share
+    """
+    if not records:
+        return
+
+    for eeg_record in records:
+        eeg_record.status = EegStatus.PENDING
+        eeg_record.progress = 0
+    PatientSummaryService.pending_changed([r.patient_id for r in records], 1)
+    db.session.commit()
+
+    for eeg_record in records:
+        publish_eeg_status(eeg_record)
+        eeg_record_signature({
+            "id": eeg_record.id,
+            "uploader_id": eeg_record.uploader_id,
+            "file_size_bytes": eeg_record.file_size_bytes,
+            "priority": eeg_record.priority.value,
+        }).apply_async()
+
+
+class ProgressReporter:
+    """
+    Turns the (done, total) callbacks of preprocessing and inference into an
+    overall percent for the record. Writes are throttled to one every
+    EEG_PROGRESS_INTERVAL_SECONDS; each one also bumps updated_at, so a
+    record that keeps making progress keeps its sweeper lease.
+    """
+
+    def __init__(self, eeg_record: EegRecord):
+        self.eeg_record = eeg_record
+        self.interval = current_app.config["EEG_PROGRESS_INTERVAL_SECONDS"]
+        self._percent = eeg_record.progress or 0
+        self._reported_at = time.monotonic()
+
+    def preprocessing(self, trials_done: int, total_trials: int) -> None:
+        self._report(PREPROCESSING_SHARE * trials_done // total_trials)
+
+    def inference(self, windows_done: int, total_windows: int) -> None:
+        self._report(PREPROCESSING_SHARE + (100 - PREPROCESSING_SHARE) * windows_done // total_windows)
+
+    def _report(self, percent: int) -> None:
+        now = time.monotonic()
+        # 100 is only written together with the prediction
+        if percent <= self._percent or percent >= 100 or now - self._reported_at < self.interval:
+            return
+
+        self._percent = percent
+        self._reported_at = now
+        self.eeg_record.progress = percent
+        db.session.commit()
+        publish_eeg_status(self.eeg_record, progress=percent)
+
+
+def _build_tensor(eeg_record: EegRecord, progress, timer: StageTimer):
+    with timer.span("read"):
+        # The upload is parsed and pivoted only once; retries and re-scoring
+        # reuse the dense store. Signals are memory-mapped, so the actual
+        # reads of window slices land in "preprocess"
+        dense_path = ensure_dense(eeg_record.file_path)
+        recording = DenseEegRecording.load(dense_path)
+
+    with timer.span("preprocess"):
+        X = build_tensor_from_recording(
+            recording,
+            win_size=256,
+            step_size=256,
+            use_bands=True,
+            progress=progress,
+            timer=timer
+        )
+
+    if X.size == 0:
+        raise ValueError("No valid EEG samples generated from the provided file")
+
+    metrics.observe_preprocessing(len(X), timer.seconds["preprocess"])
+
+    return X
+
+
+def _save_prediction(
+    eeg_record: EegRecord, label, raw_prob: float, confidence: float, elapsed_seconds: float, timer: StageTimer
+):
+    now = datetime.now(timezone.utc)
+    metrics.observe_stages(timer.seconds)
+
+    # A duplicate run keeps the prediction saved first
+    if not _has_prediction(eeg_record.id):
+        prediction = PredictionResult(
+            eeg_record_id=eeg_record.id,
+            result=label,
+            confidence=confidence,
+            raw_probability=raw_prob,
+            model_version="eegnet_v1",
+            # Saving itself is not included: it is committed with these values
+            stage_timings_ms=timer.as_ms(),
+            created_at=now,
+        )
+
+        db.session.add(prediction)
+        PatientSummaryService.prediction_saved(eeg_record.patient_id, label, raw_prob, now)
+
+    eeg_record.status = EegStatus.PROCESSED
+    eeg_record.progress = 100
+    eeg_record.processing_time_ms = int(elapsed_seconds * 1000)
+    eeg_record.error_msg = None  # limpiar errores de intentos previos
@@ -0,0 +1,177 @@
+from datetime import datetime, timezone, timedelta
+from celery.utils.log import get_task_logger
+from flask import current_app
+from sqlalchemy import select, update
+from app.extensions import db, celery
+from app.models.eeg_record import EegRecord, EegStatus
+from app.services.patient_summary_service import PatientSummaryService
+from app.tasks.scheduling import eeg_record_signature, queued_eeg_record_ids
+from app.utils.events import publish_eeg_status
+
+logger = get_task_logger(__name__)
+
+# Ids per statement when renewing the lease of queued records
+RENEW_CHUNK_SIZE = 1000
+
+
+@celery.task
+def sweep_stuck_eeg_records():
+    """
+    Periodic (Celery beat) recovery of records left behind by a dead worker
+    (stuck in PROCESSING) or a lost broker message (stuck in PENDING).
+
+    updated_at acts as the lease: a worker bumps it when it picks a record up,
+    and the sweeper only claims records whose lease is older than the
+    threshold. Claiming bumps it again, so concurrent sweepers never re-enqueue
+    the same record twice. Work is bounded per run and spread over the sweep
+    interval to avoid a thundering herd after a broker outage.
+
+    A PENDING record whose message is still in the broker is only waiting
+    behind a backlog (e.g. a batch demoted to the low queue): its lease is
+    renewed instead, so it is neither re-enqueued nor abandoned. This needs a
+    broker that can be inspected (Redis); otherwise age alone decides.
+    """
+    config = current_app.config
+    now = datetime.now(timezone.utc)
+    batch_size = config["EEG_SWEEP_BATCH_SIZE"]
+    max_attempts = config["EEG_SWEEP_MAX_ATTEMPTS"]
+
+    thresholds = {
+        EegStatus.PENDING: timedelta(seconds=config["EEG_STUCK_PENDING_SECONDS"]),
+        EegStatus.PROCESSING: timedelta(seconds=config["EEG_STUCK_PROCESSING_SECONDS"]),
+    }
+
+    report = {}
+    claimed = []
+    abandoned = []
+    still_queued = 0
+
+    queued_ids = queued_eeg_record_ids()
+
+    for status, threshold in thresholds.items():
+        cutoff = now - threshold
+
+        if status == EegStatus.PENDING and queued_ids:
+            still_queued = _renew_queued(queued_ids, cutoff, now)
+
+        abandoned.extend(_abandon(status, cutoff, max_attempts, now))
+
+        rows = _claim(status, cutoff, max_attempts, batch_size - len(claimed), now)
+        report[f"{status.value}_requeued"] = len(rows)
+        claimed.extend(rows)
+
+    db.session.commit()
+    report["abandoned"] = len(abandoned)
+
+    # Clients waiting on an abandoned record would otherwise never hear back
+    for row in abandoned:
+        publish_eeg_status(row)
+
+    spread = config["EEG_SWEEP_INTERVAL_SECONDS"]
+    for i, row in enumerate(claimed):
+        eeg_record_signature({
+            "id": row.id,
+            "uploader_id": row.uploader_id,
+            "file_size_bytes": row.file_size_bytes,
+            "priority": row.priority.value,
+        }).apply_async(countdown=spread * i / len(claimed))
+
+    logger.info(
+        "EEG sweep: %s pending and %s processing re-enqueued, %s abandoned, %s pending still queued",
+        report["pending_requeued"], report["processing_requeued"], report["abandoned"], still_queued,
+    )
+    return report
+
+
+def _stuck(status: EegStatus, cutoff: datetime):
+    return (
+        (EegRecord.status == status)
+        & (EegRecord.updated_at < cutoff)
+        & (EegRecord.is_deleted == False)
+    )
+
+
+def _renew_queued(record_ids: set, cutoff: datetime, now: datetime) -> int:
+    """Renews the lease of the stuck PENDING records that still have a queued message"""
+    record_ids = sorted(record_ids)
+    renewed = 0
+
+    for i in range(0, len(record_ids), RENEW_CHUNK_SIZE):
+        result = db.session.execute(
+            update(EegRecord)
+            .where(
+                EegRecord.id.in_(record_ids[i:i + RENEW_CHUNK_SIZE]),
+                _stuck(EegStatus.PENDING, cutoff),
+            )
+            .values(updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        renewed += result.rowcount
+
+    return renewed
+
+
+def _claim(status: EegStatus, cutoff: datetime, max_attempts: int, limit: int, now: datetime) -> list:
+    """Atomically moves up to `limit` stuck records back to PENDING with a fresh lease"""
+    if limit <= 0:
+        return []
+
+    candidates = (
+        select(EegRecord.id)
+        .where(_stuck(status, cutoff), EegRecord.recovery_attempts < max_attempts)
+        .order_by(EegRecord.updated_at)
+        .limit(limit)
+    )
+
+    stmt = (
+        update(EegRecord)
+        # Re-check the lease: another sweeper may have claimed it meanwhile
+        .where(EegRecord.id.in_(candidates.scalar_subquery()), _stuck(status, cutoff))
+        .values(
+            status=EegStatus.PENDING,
+            updated_at=now,
+            recovery_attempts=EegRecord.recovery_attempts + 1,
+        )
+        .returning(
+            EegRecord.id,
+            EegRecord.patient_id,
+            EegRecord.uploader_id,
+            EegRecord.file_size_bytes,
+            EegRecord.priority,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    rows = db.session.execute(stmt).all()
+
+    if status != EegStatus.PENDING:
+        PatientSummaryService.pending_changed([row.patient_id for row in rows], 1)
+
+    return rows
+
+
+def _abandon(status: EegStatus, cutoff: datetime, max_attempts: int, now: datetime) -> list:
+    """Records that got stuck again after every recovery attempt are marked FAILED"""
+    stmt = (
+        update(EegRecord)
+        .where(_stuck(status, cutoff), EegRecord.recovery_attempts >= max_attempts)
+        .values(
+            status=EegStatus.FAILED,
+            updated_at=now,
+            error_msg=f"Processing abandoned after {max_attempts} recovery attempts",
+        )
+        .returning(
+            EegRecord.id,
+            EegRecord.patient_id,
+            EegRecord.status,
+            EegRecord.processing_time_ms,
+            EegRecord.error_msg,
+            EegRecord.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    rows = db.session.execute(stmt).all()
+
+    if status == EegStatus.PENDING:
+        PatientSummaryService.pending_changed([row.patient_id for row in rows], -1)
+
+    return rows
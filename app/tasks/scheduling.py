@@ -0,0 +1,246 @@
+import base64
+import json
+import threading
+import time
+from celery import group
+from flask import current_app
+from app.extensions import celery
+from app.models.eeg_record import EegPriority
+
+QUEUE_HIGH = "eeg.high"
+QUEUE_DEFAULT = "eeg.default"
+QUEUE_LOW = "eeg.low"
+QUEUE_LARGE = "eeg.large"
+
+EEG_QUEUES = [QUEUE_HIGH, QUEUE_DEFAULT, QUEUE_LOW, QUEUE_LARGE]
+
+# Broker message priority inside a queue (0 is the highest on Redis)
+MESSAGE_PRIORITY = {
+    EegPriority.HIGH: 0,
+    EegPriority.NORMAL: 5,
+    EegPriority.LOW: 9,
+}
+
+
+class MemoryTokenBucket:
+    """Per-uploader token bucket kept in process memory"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.refill_per_second)
+
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+
+            self._buckets[key] = (tokens, now)
+            return allowed
+
+
+class RedisTokenBucket:
+    """Per-uploader token bucket shared by every API process through Redis"""
+
+    _SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + (now - updated) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+    return allowed
+    """
+
+    def __init__(self, redis_url: str, capacity: float, refill_per_second: float, prefix: str = "eeg:fair-share:"):
+        import redis
+
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(redis_url)
+        self._take = self._client.register_script(self._SCRIPT)
+
+    def take(self, key) -> bool:
+        return bool(self._take(
+            keys=[f"{self.prefix}{key}"],
+            args=[self.capacity, self.refill_per_second, time.time()],
+        ))
+
+
+_fair_share = None
+_fair_share_lock = threading.Lock()
+
+
+def get_fair_share_bucket():
+    global _fair_share
+    if _fair_share is None:
+        with _fair_share_lock:
+            if _fair_share is None:
+                config = current_app.config
+                capacity = config["EEG_FAIR_SHARE_BURST"]
+                refill = config["EEG_FAIR_SHARE_PER_MINUTE"] / 60.0
+                redis_url = config.get("EEG_FAIR_SHARE_REDIS_URL")
+
+                if redis_url:
+                    _fair_share = RedisTokenBucket(redis_url, capacity, refill)
+                else:
+                    _fair_share = MemoryTokenBucket(capacity, refill)
+    return _fair_share
+
+
+def route_eeg_record(uploader_id: int, file_size_bytes: int, priority: EegPriority) -> dict:
+    """
+    Chooses the queue and broker priority for a record:
+    - huge files go to a dedicated lane so they never block small ones
+    - HIGH/LOW priorities map to their own queues
+    - NORMAL uploads beyond the uploader's fair share are demoted to the low
+      queue, so a 500 file batch cannot starve other users
+    """
+    config = current_app.config
+
+    if file_size_bytes and file_size_bytes >= config["EEG_LARGE_FILE_BYTES"]:
+        queue = QUEUE_LARGE
+    elif priority == EegPriority.HIGH:
+        queue = QUEUE_HIGH
+    elif priority == EegPriority.LOW:
+        queue = QUEUE_LOW
+    elif get_fair_share_bucket().take(uploader_id):
+        queue = QUEUE_DEFAULT
+    else:
+        queue = QUEUE_LOW
+
+    return {"queue": queue, "priority": MESSAGE_PRIORITY[priority]}
+
+
+def eeg_record_signature(record: dict):
+    """Signature of process_eeg_record routed for a serialized record"""
+    options = route_eeg_record(
+        record["uploader_id"],
+        record["file_size_bytes"],
+        EegPriority(record["priority"]),
+    )
+    return eeg_record_signature_for(record["id"], **options)
+
+
+def eeg_record_signature_for(eeg_record_id: int, queue: str, priority: int):
+    # Imported here: task modules import this one to re-enqueue work
+    from app.tasks.eeg_tasks import process_eeg_record
+
+    return process_eeg_record.s(eeg_record_id).set(queue=queue, priority=priority)
+
+
+def enqueue_eeg_record(record: dict):
+    return eeg_record_signature(record).apply_async()
+
+
+def enqueue_eeg_records(records: list):
+    """
+    Single enqueue for many records, each one routed to its own lane.
+    Small files sharing a lane are grouped so a worker scores them with one
+    model call (process_eeg_batch) instead of paying the predict overhead
+    per record.
+    """
+    from app.tasks.eeg_tasks import process_eeg_batch
+
+    if not records:
+        return None
+
+    config = current_app.config
+    batch_size = config["EEG_INFERENCE_BATCH_RECORDS"]
+
+    signatures = []
+    small_by_lane = {}
+
+    for record in records:
+        if batch_size > 1 and (record["file_size_bytes"] or 0) < config["EEG_SMALL_FILE_BYTES"]:
+            options = route_eeg_record(
+                record["uploader_id"],
+                record["file_size_bytes"],
+                EegPriority(record["priority"]),
+            )
+            lane = (options["queue"], options["priority"])
+            small_by_lane.setdefault(lane, []).append(record["id"])
+        else:
+            signatures.append(eeg_record_signature(record))
+
+    for (queue, priority), ids in small_by_lane.items():
+        for i in range(0, len(ids), batch_size):
+            chunk = ids[i:i + batch_size]
+            if len(chunk) == 1:
+                signatures.append(eeg_record_signature_for(chunk[0], queue, priority))
+            else:
+                signatures.append(process_eeg_batch.s(chunk).set(queue=queue, priority=priority))
+
+    return group(signatures).apply_async()
+
+
+# Tasks whose messages carry record ids, and how to get them out of the args
+_RECORD_IDS_IN_ARGS = {
+    "app.tasks.eeg_tasks.process_eeg_record": lambda args: [args[0]],
+    "app.tasks.eeg_tasks.process_eeg_batch": lambda args: args[0],
+}
+
+# kombu's Redis transport: one list per priority step ("<queue>\x06\x16<step>"
+# except step 0) and a hash of the messages delivered but not acked yet
+_REDIS_PRIORITY_SEP = "\x06\x16"
+_REDIS_UNACKED_KEY = "unacked"
+
+
+def record_ids_in_message(message: dict) -> list:
+    """Record ids referenced by a task message as stored by the Redis transport"""
+    extract = _RECORD_IDS_IN_ARGS.get(message.get("headers", {}).get("task"))
+    if extract is None:
+        return []
+
+    body = message["body"]
+    if message.get("properties", {}).get("body_encoding") == "base64":
+        body = base64.b64decode(body)
+    args = json.loads(body)[0]
+    return list(extract(args))
+
+
+def queued_eeg_record_ids():
+    """
+    Ids of the records with a message still waiting in an EEG queue or
+    delivered to a worker and not acked yet. None when the broker cannot be
+    inspected (only Redis can be): callers must then assume nothing is queued.
+    """
+    broker_url = current_app.config.get("CELERY_BROKER_URL") or ""
+    if not broker_url.startswith(("redis://", "rediss://")):
+        return None
+
+    import redis
+
+    priority_steps = celery.conf.broker_transport_options.get("priority_steps") or [0]
+
+    client = redis.Redis.from_url(broker_url)
+    pipe = client.pipeline()
+    for queue in EEG_QUEUES:
+        for step in priority_steps:
+            pipe.lrange(f"{queue}{_REDIS_PRIORITY_SEP}{step}" if step else queue, 0, -1)
+    pipe.hvals(_REDIS_UNACKED_KEY)
+    *queued, unacked = pipe.execute()
+
+    waiting = [json.loads(raw) for lane in queued for raw in lane]
+    # Unacked entries are [message, exchange, routing_key]
+    delivered = [json.loads(raw)[0] for raw in unacked]
+
+    ids = set()
+    for message in waiting + delivered:
+        ids.update(record_ids_in_message(message))
+    return ids
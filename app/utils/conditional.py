@@ -0,0 +1,87 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from flask import current_app, jsonify, request
+from app.utils.pagination import paginated_response
+
+
+def resource_version(item: dict) -> tuple:
+    """(id, last change) of a serialized resource or list row"""
+    changed = item.get("updated_at") or item.get("created_at")
+    if isinstance(changed, str):
+        changed = datetime.fromisoformat(changed)
+    if changed is not None and changed.tzinfo is None:
+        changed = changed.replace(tzinfo=timezone.utc)  # stored in UTC
+    return item["id"], changed
+
+
+def _not_modified(etag: str, last_modified: datetime = None) -> bool:
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified and request.if_modified_since:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def _settled_last_modified(versions: list):
+    """
+    Newest change among `versions`, or None while it is under a second old.
+    HTTP dates have one-second resolution, so a resource changed within the
+    current second could change again under the same Last-Modified and an
+    If-Modified-Since would then return a stale 304.
+    """
+    last_modified = max((changed for _, changed in versions if changed), default=None)
+    if last_modified and datetime.now(timezone.utc) - last_modified < timedelta(seconds=1):
+        return None
+    return last_modified
+
+
+def _etag(versions: list, extra=()) -> str:
+    return hashlib.sha1(repr((versions, extra)).encode()).hexdigest()
+
+
+def client_has(item: dict) -> bool:
+    """Whether the request's If-None-Match already names this version of `item`"""
+    return bool(request.if_none_match) and request.if_none_match.contains_weak(
+        _etag([resource_version(item)])
+    )
+
+
+def conditional_response(versions: list, build, extra=(), use_last_modified: bool = True):
+    """
+    Answers 304 when the client already has this representation, without
+    calling `build` (so nothing is serialized). The ETag is derived from the
+    (id, updated_at) of every resource in the payload plus `extra`.
+    """
+    etag = _etag(versions, extra)
+    last_modified = _settled_last_modified(versions) if use_last_modified else None
+
+    if _not_modified(etag, last_modified):
+        response = current_app.response_class(status=304)
+    else:
+        response = build()
+
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = last_modified
+    # Per-user content: browsers may keep it but must revalidate every time
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def conditional_json(item: dict):
+    return conditional_response([resource_version(item)], lambda: jsonify(item))
+
+
+def conditional_page(page: dict):
+    """
+    Pages carry no Last-Modified: the newest updated_at of the remaining rows
+    does not change when a row leaves the list. The ETag covers it, since it
+    includes every row id.
+    """
+    return conditional_response(
+        [resource_version(item) for item in page["items"]],
+        lambda: paginated_response(page),
+        extra=(page["next_cursor"],),
+        use_last_modified=False,
+    )
@@ -0,0 +1,201 @@
+import json
+import logging
+import queue
+import threading
+import time
+from flask import current_app
+from app.models.eeg_record import EegStatus
+from app.utils.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# Redis channels are EVENTS_PREFIX + eeg_channel(id)
+EVENTS_PREFIX = "events:"
+
+
+class MemorySubscription:
+
+    def __init__(self, broker, channel: str):
+        self._broker = broker
+        self.channel = channel
+        self._queue = queue.Queue()
+
+    def get(self, timeout: float):
+        """Next message, or None after `timeout` seconds"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self._broker._unsubscribe(self)
+
+
+class MemoryEventBroker:
+    """In-process pub/sub; also the stand-in used by the tests"""
+
+    def __init__(self):
+        self._subscribers = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, message: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+            listeners = list(self._listeners)
+        for subscription in subscribers:
+            subscription._queue.put(message)
+        for listener in listeners:
+            listener(channel, message)
+
+    def add_listener(self, callback) -> None:
+        """`callback(channel, message)` for every publish, from the publishing thread"""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback) -> None:
+        with self._lock:
+            self._listeners.remove(callback)
+
+    def subscribe(self, channel: str) -> MemorySubscription:
+        subscription = MemorySubscription(self, channel)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: MemorySubscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel, set())
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._subscribers.pop(subscription.channel, None)
+
+
+class RedisSubscription:
+
+    def __init__(self, pubsub):
+        self._pubsub = pubsub
+
+    def get(self, timeout: float):
+        message = self._pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        return json.loads(message["data"]) if message else None
+
+    def close(self) -> None:
+        self._pubsub.close()
+
+
+class RedisEventBroker:
+    """Shared pub/sub: workers publish, every API process can deliver"""
+
+    def __init__(self, redis_url: str, prefix: str = EVENTS_PREFIX):
+        import redis
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(redis_url)
+
+    def publish(self, channel: str, message: dict) -> None:
+        self._client.publish(self.prefix + channel, json.dumps(message))
+
+    def subscribe(self, channel: str) -> RedisSubscription:
+        pubsub = self._client.pubsub()
+        pubsub.subscribe(self.prefix + channel)
+        return RedisSubscription(pubsub)
+
+
+class StreamSlots:
+    """
+    Requests of this process held open on a subscription (SSE streams and
+    long-polls). Each one pins a server thread, so they are capped to keep
+    threads free for the rest of the traffic.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_use = 0
+
+    def acquire(self, limit: int) -> bool:
+        with self._lock:
+            if self.in_use >= limit:
+                return False
+            self.in_use += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_use -= 1
+
+
+held_requests = StreamSlots()
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_event_broker(config=None):
+    """`config` defaults to the current Flask app's (the async read API passes its own)"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:  # double-checked locking
+                redis_url = (config or current_app.config).get("EVENTS_REDIS_URL")
+                _broker = RedisEventBroker(redis_url) if redis_url else MemoryEventBroker()
+    return _broker
+
+
+# Statuses after which nothing more is published. A run that Celery will
+# retry puts its record back to PENDING, so FAILED means retries are exhausted.
+FINAL_STATUSES = {EegStatus.PROCESSED.value, EegStatus.FAILED.value}
+
+
+def eeg_channel(eeg_record_id: int) -> str:
+    return f"eeg:{eeg_record_id}"
+
+
+def publish_eeg_status(eeg_record, progress: int = None) -> None:
+    """
+    Announces a status change of a record to the clients waiting on it.
+    Called after the change is committed. A failed publish only costs the
+    clients a delay (they fall back to the status endpoint), so it never
+    fails the task.
+    """
+    message = {
+        "id": eeg_record.id,
+        "status": eeg_record.status.value,
+        "progress": progress,
+        "processing_time_ms": eeg_record.processing_time_ms,
+        "error_msg": eeg_record.error_msg if eeg_record.status == EegStatus.FAILED else None,
+        "updated_at": eeg_record.updated_at.isoformat() if eeg_record.updated_at else None,
+    }
+    try:
+        get_event_broker().publish(eeg_channel(eeg_record.id), message)
+    except Exception:
+        logger.exception("Could not publish status of EEG record %s", eeg_record.id)
+
+
+def _sse(message: dict) -> str:
+    return f"event: status\ndata: {dumps(message).decode()}\n\n"
+
+
+def stream_eeg_status(subscription, snapshot: dict, heartbeat_seconds: float, max_seconds: float):
+    """
+    Server-Sent Events body: the current status, then every published change
+    until the record reaches a final status or max_seconds elapse (the
+    client reconnects). Comment lines keep idle proxies from closing it.
+    """
+    try:
+        yield _sse(snapshot)
+        if snapshot["status"] in FINAL_STATUSES:
+            return
+
+        deadline = time.monotonic() + max_seconds
+        while (remaining := deadline - time.monotonic()) > 0:
+            message = subscription.get(timeout=min(heartbeat_seconds, remaining))
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+
+            yield _sse(message)
+            if message["status"] in FINAL_STATUSES:
+                return
+    finally:
+        subscription.close()
@@ -0,0 +1,236 @@
+"""
+Prometheus metrics for the API and the Celery workers.
+
+The API serves them on GET /metrics when METRICS_ENABLED is set, behind
+METRICS_TOKEN (sent as a Bearer token) if configured. A worker exposes them on
+METRICS_WORKER_PORT and/or writes them to METRICS_TEXTFILE (for the node
+exporter textfile collector). With several processes per container
+(gunicorn workers, Celery prefork children) set PROMETHEUS_MULTIPROC_DIR so
+every process writes its samples there and each scrape aggregates them.
+"""
+import hmac
+import logging
+import os
+import threading
+import time
+from celery import signals
+from flask import current_app, g, jsonify, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+    write_to_textfile,
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests served",
+    ["blueprint", "endpoint", "method", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time until the response headers are ready",
+    ["blueprint", "endpoint", "method"],
+)
+
+CELERY_TASKS = Counter("celery_tasks_total", "Finished Celery tasks", ["task", "state"])
+CELERY_TASK_DURATION = Histogram(
+    "celery_task_duration_seconds", "Celery task run time", ["task"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+CELERY_TASKS_IN_PROGRESS = Gauge(
+    "celery_tasks_in_progress", "Celery tasks currently running", ["task"],
+    multiprocess_mode="livesum",
+)
+
+MODEL_LOAD_SECONDS = Gauge(
+    "eeg_model_load_seconds", "Time taken to load the model", multiprocess_mode="max",
+)
+EEG_STAGE_DURATION = Histogram(
+    "eeg_stage_duration_seconds", "Time per EEG processing stage", ["stage"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+PREPROCESSED_WINDOWS = Counter("eeg_preprocessed_windows_total", "Windows built by preprocessing")
+PREPROCESSING_THROUGHPUT = Histogram(
+    "eeg_preprocessing_windows_per_second", "Preprocessing throughput per record",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+)
+INFERENCE_BATCH_WINDOWS = Histogram(
+    "eeg_inference_batch_windows", "Windows per model predict call",
+    buckets=(1, 8, 32, 128, 512, 2048, 8192, 32768),
+)
+INFERENCE_BATCH_RECORDS = Histogram(
+    "eeg_inference_batch_records", "Records scored by one batched predict call",
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+
+DB_STATEMENTS = Counter("db_statements_total", "SQL statements executed")
+
+# Kombu emulates message priorities on Redis with one list per priority step
+_PRIORITY_SEPARATOR = "\x06\x16"
+
+_queue_depth = None
+_init_lock = threading.Lock()
+_db_listener_installed = False
+
+
+class QueueDepthCollector:
+    """Messages waiting in each Celery queue, read from Redis at scrape time"""
+
+    def __init__(self, redis_url: str, queues: list, priority_steps: list):
+        import redis
+
+        self._client = redis.Redis.from_url(redis_url, socket_timeout=1)
+        self._keys = {
+            queue: [queue] + [f"{queue}{_PRIORITY_SEPARATOR}{step}" for step in priority_steps if step]
+            for queue in queues
+        }
+
+    def collect(self):
+        gauge = GaugeMetricFamily("celery_queue_depth", "Messages waiting per Celery queue", labels=["queue"])
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for keys in self._keys.values():
+                for key in keys:
+                    pipe.llen(key)
+            lengths = iter(pipe.execute())
+        except Exception as e:
+            logger.warning("Could not read Celery queue depth: %s", e)
+            return
+
+        for queue, keys in self._keys.items():
+            gauge.add_metric([queue], sum(next(lengths) for _ in keys))
+        yield gauge
+
+
+def collection_registry():
+    """Registry to expose: this process, or every process in multiprocess mode"""
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    if _queue_depth is not None:
+        registry.register(_queue_depth)
+    return registry
+
+
+def init_metrics(app) -> None:
+    """Request hooks, the /metrics endpoint and the process-wide collectors"""
+    global _queue_depth, _db_listener_installed
+
+    with _init_lock:
+        if not _db_listener_installed:
+            event.listen(Engine, "before_cursor_execute", _count_statement)
+            _db_listener_installed = True
+
+        broker_url = app.config.get("CELERY_BROKER_URL") or ""
+        if _queue_depth is None and broker_url.startswith("redis"):
+            from app.celery_app import BROKER_PRIORITY_STEPS
+            from app.tasks.scheduling import EEG_QUEUES
+
+            _queue_depth = QueueDepthCollector(broker_url, EEG_QUEUES, BROKER_PRIORITY_STEPS)
+            if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+                REGISTRY.register(_queue_depth)
+
+    app.before_request(_start_request_timer)
+    app.after_request(_observe_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view)
+
+
+def metrics_view():
+    token = current_app.config.get("METRICS_TOKEN")
+    if token and not hmac.compare_digest(
+        request.headers.get("Authorization", "").encode(), f"Bearer {token}".encode()
+    ):
+        return jsonify({"error": "Invalid metrics token"}), 401
+    return generate_latest(collection_registry()), 200, {"Content-Type": CONTENT_TYPE_LATEST}
+
+
+def _start_request_timer():
+    g.metrics_started = time.perf_counter()
+
+
+def _observe_request(response):
+    started = g.pop("metrics_started", None)
+    if started is None:
+        return response
+
+    blueprint = request.blueprint or ""
+    endpoint = request.endpoint or "unmatched"  # keeps 404 paths out of the labels
+    HTTP_REQUEST_DURATION.labels(blueprint, endpoint, request.method).observe(time.perf_counter() - started)
+    HTTP_REQUESTS.labels(blueprint, endpoint, request.method, str(response.status_code)).inc()
+    return response
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    DB_STATEMENTS.inc()
+
+
+def observe_preprocessing(n_windows: int, seconds: float) -> None:
+    PREPROCESSED_WINDOWS.inc(n_windows)
+    if seconds > 0:
+        PREPROCESSING_THROUGHPUT.observe(n_windows / seconds)
+
+
+def observe_stages(stage_seconds: dict) -> None:
+    for stage, seconds in stage_seconds.items():
+        EEG_STAGE_DURATION.labels(stage).observe(seconds)
+
+
+_task_started = {}
+_textfile_written_at = 0.0
+
+
+@signals.task_prerun.connect(weak=False, dispatch_uid="metrics_task_prerun")
+def _task_prerun(sender=None, task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+    CELERY_TASKS_IN_PROGRESS.labels(sender.name).inc()
+
+
+@signals.task_postrun.connect(weak=False, dispatch_uid="metrics_task_postrun")
+def _task_postrun(sender=None, task_id=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    CELERY_TASKS_IN_PROGRESS.labels(sender.name).dec()
+    CELERY_TASKS.labels(sender.name, state or "UNKNOWN").inc()
+    if started is not None:
+        CELERY_TASK_DURATION.labels(sender.name).observe(time.perf_counter() - started)
+
+    _write_textfile(sender.app.conf)
+
+
+def _write_textfile(conf) -> None:
+    global _textfile_written_at
+
+    path = conf.get("METRICS_TEXTFILE")
+    now = time.monotonic()
+    if not path or now - _textfile_written_at < conf.get("METRICS_TEXTFILE_INTERVAL_SECONDS", 15):
+        return
+
+    _textfile_written_at = now
+    try:
+        write_to_textfile(path, collection_registry())
+    except OSError as e:
+        logger.warning("Could not write metrics to %s: %s", path, e)
+
+
+@signals.worker_ready.connect(weak=False, dispatch_uid="metrics_worker_ready")
+def _start_worker_exporter(sender=None, **kwargs):
+    port = sender.app.conf.get("METRICS_WORKER_PORT")
+    if port:
+        start_http_server(int(port), registry=collection_registry())
+
+
+@signals.worker_process_shutdown.connect(weak=False, dispatch_uid="metrics_worker_process_shutdown")
+def _mark_process_dead(pid=None, **kwargs):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid or os.getpid())
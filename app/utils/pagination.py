@@ -0,0 +1,100 @@
+import base64
+import json
+from datetime import datetime
+from urllib.parse import urlencode
+from flask import jsonify, request
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(created_at: datetime, id_: int) -> str:
+    payload = json.dumps([created_at.isoformat(), id_], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id_ = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(id_)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def get_page_args(args=None) -> dict:
+    """Reads ?cursor=&limit= from `args`, by default the current request's"""
+    if args is None:
+        args = request.args
+
+    limit = args.get("limit")
+    if limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    else:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError("limit must be an integer")
+        if limit < 1:
+            raise ValueError("limit must be greater than 0")
+
+    cursor = args.get("cursor") or None
+    if cursor:
+        decode_cursor(cursor)  # reject malformed cursors before any query
+
+    return {
+        "cursor": cursor,
+        "limit": min(limit, MAX_PAGE_SIZE),
+    }
+
+
+def keyset_paginate(query, created_col, id_col, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE) -> tuple:
+    """
+    Newest-first keyset pagination on (created_at, id). Uses the composite
+    (created_at, id) indexes, so the cost of a page does not grow with the
+    offset. Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    rows = (
+        query
+        .filter(*keyset_criteria(created_col, id_col, cursor))
+        .order_by(created_col.desc(), id_col.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    return split_page(rows, limit)
+
+
+def keyset_criteria(created_col, id_col, cursor: str = None) -> list:
+    """Filter selecting the rows after `cursor` (none on the first page)"""
+    if not cursor:
+        return []
+    created_at, id_ = decode_cursor(cursor)
+    return [tuple_(created_col, id_col) < tuple_(created_at, id_)]
+
+
+def split_page(rows: list, limit: int) -> tuple:
+    """(page, next_cursor) out of the limit + 1 rows fetched for a page"""
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
+
+
+def paginated_response(page: dict, status: int = 200):
+    """
+    The body stays a plain JSON list; the opaque cursor of the next page is
+    sent in the X-Next-Cursor header (and as a Link rel="next").
+    """
+    response = jsonify(page["items"])
+    response.status_code = status
+
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+        args = request.args.to_dict()
+        args["cursor"] = page["next_cursor"]
+        response.headers["Link"] = f'<{request.path}?{urlencode(args)}>; rel="next"'
+
+    return response
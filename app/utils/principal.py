@@ -0,0 +1,42 @@
+from app.extensions import db
+from app.models.user import User, UserRole
+
+
+class Principal:
+    """
+    Authenticated caller built from the JWT claims (sub + role), so the
+    authorization checks in the services (`current_user.id`,
+    `current_user.role`) need no query. Any other attribute (email, names,
+    last_login...) loads the User row on first access.
+    """
+
+    def __init__(self, user_id: int, role: UserRole):
+        self.id = user_id
+        self.role = role
+        self._user = None
+
+    @property
+    def user(self) -> User:
+        if self._user is None:
+            self._user = db.session.get(User, self.id)
+        return self._user
+
+    def __getattr__(self, name):
+        # Only reached for attributes that are not set on the principal
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.user, name)
+
+    def __repr__(self):
+        return f"<Principal {self.id} {self.role.value}>"
+
+
+def principal_from_claims(jwt_data: dict):
+    user_id = int(jwt_data["sub"])
+
+    role = jwt_data.get("role")
+    if role is None:
+        # Token issued before the role claim existed
+        return db.session.get(User, user_id)
+
+    return Principal(user_id, UserRole(role))
@@ -20,13 +20,9 @@ def register_jwt_callbacks(app):
         if not token:
             return True
 
-        is_valid = AuthService.validate_session(token)
-
-        if is_valid:
-            # Refresh expiration on each active request (sliding window)
-            AuthService.refresh_session(token)
-
-        return not is_valid
+        # Validates and refreshes the expiration (sliding window), served from
+        # the session cache on most requests
+        return not AuthService.check_session(token)
 
     @jwt.revoked_token_loader
     def revoked_token_callback(jwt_header, jwt_data):
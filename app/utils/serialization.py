@@ -0,0 +1,55 @@
+import decimal
+import enum
+import json
+from datetime import date, datetime
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder is used instead
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(obj) -> bytes:
+    """
+    Compact JSON. Enums are written as their value, Decimals as floats and
+    dates/datetimes in ISO 8601, so query rows can be serialized as they come
+    from the database.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def rows_as_dicts(rows) -> list:
+    """Column-only query rows (see the services' _LIST_COLUMNS) as plain dicts"""
+    return [row._asdict() for row in rows]
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify / request.get_json backed by orjson when it is installed"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            kwargs.setdefault("default", _default)
+            return super().dumps(obj, **kwargs)
+        return dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
@@ -0,0 +1,131 @@
+import json
+import threading
+import time
+from flask import current_app
+
+
+class MemorySessionCacheBackend:
+    """In-process backend; also the stand-in used by the tests"""
+
+    def __init__(self):
+        self._entries = {}
+        self._users = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            value, deadline = item
+            if time.time() >= deadline:
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: dict, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._users.setdefault(value["user_id"], set()).add(key)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_user(self, user_id: int) -> None:
+        with self._lock:
+            for key in self._users.pop(user_id, set()):
+                self._entries.pop(key, None)
+
+
+class RedisSessionCacheBackend:
+    """Shared backend: a logout in one API process is seen by all of them"""
+
+    def __init__(self, redis_url: str, prefix: str = "session:"):
+        import redis
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(redis_url)
+
+    def get(self, key: str):
+        raw = self._client.get(self.prefix + key)
+        return json.loads(raw) if raw else None
+
+    def set(self, key: str, value: dict, ttl: float) -> None:
+        user_key = f"{self.prefix}user:{value['user_id']}"
+        pipe = self._client.pipeline()
+        pipe.set(self.prefix + key, json.dumps(value), ex=max(1, int(ttl)))
+        pipe.sadd(user_key, key)
+        pipe.expire(user_key, max(1, int(ttl)))
+        pipe.execute()
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self.prefix + key)
+
+    def delete_user(self, user_id: int) -> None:
+        user_key = f"{self.prefix}user:{user_id}"
+        keys = self._client.smembers(user_key)
+        pipe = self._client.pipeline()
+        for key in keys:
+            pipe.delete(self.prefix + key.decode())
+        pipe.delete(user_key)
+        pipe.execute()
+
+
+def session_entry(ttl_seconds: float, user_id: int, expires_at: float, refreshed_at: float) -> tuple:
+    """(entry, ttl) to cache; a ttl <= 0 means the session is already over"""
+    # Never keep an entry beyond the session's own expiration
+    ttl = min(ttl_seconds, expires_at - time.time())
+    return {
+        "user_id": user_id,
+        "expires_at": expires_at,
+        "refreshed_at": refreshed_at,
+    }, ttl
+
+
+class SessionCache:
+    """
+    Caches the validity of a session so authenticated requests do not hit the
+    sessions table. Entries hold the expiration timestamp and the last time
+    the sliding expiry was written to the database.
+    """
+
+    def __init__(self, backend, ttl_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str):
+        return self.backend.get(key)
+
+    def store(self, key: str, user_id: int, expires_at: float, refreshed_at: float) -> None:
+        entry, ttl = session_entry(self.ttl_seconds, user_id, expires_at, refreshed_at)
+        if ttl <= 0:
+            self.backend.delete(key)
+            return
+        self.backend.set(key, entry, ttl)
+
+    def invalidate(self, key: str) -> None:
+        self.backend.delete(key)
+
+    def invalidate_user(self, user_id: int) -> None:
+        self.backend.delete_user(user_id)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_session_cache(config=None) -> SessionCache:
+    """`config` defaults to the current Flask app's (the async read API passes its own)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:  # double-checked locking
+                config = config or current_app.config
+                redis_url = config.get("SESSION_CACHE_REDIS_URL")
+                backend = (
+                    RedisSessionCacheBackend(redis_url)
+                    if redis_url else MemorySessionCacheBackend()
+                )
+                _cache = SessionCache(backend, config["SESSION_CACHE_TTL_SECONDS"])
+    return _cache
@@ -0,0 +1,71 @@
+import logging
+import time
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+
+def init_sql_profiling(app) -> None:
+    """
+    Opt-in (SQL_PROFILING) statement profiling: counts and times the SQL of
+    every request, logs statements slower than SQL_SLOW_QUERY_MS and requests
+    running more than SQL_MAX_STATEMENTS_PER_REQUEST statements (usually an
+    N+1), and with SQL_SERVER_TIMING adds a Server-Timing header so the
+    numbers show up in the browser dev tools.
+    """
+    slow_seconds = app.config["SQL_SLOW_QUERY_MS"] / 1000
+    max_statements = app.config["SQL_MAX_STATEMENTS_PER_REQUEST"]
+    server_timing = app.config["SQL_SERVER_TIMING"]
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+
+        endpoint = "-"
+        if has_request_context():
+            endpoint = request.endpoint or request.path
+            profile = g.get("sql_profile")
+            if profile is not None:
+                profile["count"] += 1
+                profile["seconds"] += elapsed
+
+        if elapsed >= slow_seconds:
+            logger.warning("Slow SQL (%.1f ms) in %s: %s", elapsed * 1000, endpoint, statement[:1000])
+
+    def handle_error(context):
+        # A failed statement never reaches after_cursor_execute
+        if context.connection is not None and context.connection.info.get("query_started"):
+            context.connection.info["query_started"].pop()
+
+    def start_profile():
+        g.sql_profile = {"count": 0, "seconds": 0.0}
+
+    def finish_profile(response):
+        profile = g.pop("sql_profile", None)
+        if profile is None:
+            return response
+
+        if profile["count"] > max_statements:
+            logger.warning(
+                "%s ran %s SQL statements (%.1f ms)",
+                request.endpoint or request.path, profile["count"], profile["seconds"] * 1000,
+            )
+
+        if server_timing:
+            response.headers.add(
+                "Server-Timing",
+                f'db;dur={profile["seconds"] * 1000:.1f};desc="{profile["count"]} queries"',
+            )
+        return response
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(db.engine, "after_cursor_execute", after_cursor_execute)
+        event.listen(db.engine, "handle_error", handle_error)
+
+    app.before_request(start_profile)
+    app.after_request(finish_profile)
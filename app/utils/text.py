@@ -0,0 +1,16 @@
+import re
+import unicodedata
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_text(value: str) -> str:
+    """
+    Search form of a name: accents removed, case folded and whitespace
+    collapsed ("  José  PÉREZ " -> "jose perez").
+    """
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _SPACES.sub(" ", stripped).strip().casefold()
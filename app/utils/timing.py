@@ -0,0 +1,47 @@
+import math
+import time
+from contextlib import contextmanager, nullcontext
+
+
+class StageTimer:
+    """
+    Accumulates wall time per named stage. A stage may be entered many times
+    (e.g. once per channel) and spans may nest, so a stage can be a part of
+    another one.
+    """
+
+    def __init__(self):
+        self.seconds = {}
+
+    @contextmanager
+    def span(self, stage: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started)
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    def as_ms(self) -> dict:
+        return {stage: round(seconds * 1000, 3) for stage, seconds in self.seconds.items()}
+
+
+class _NullTimer:
+    """Stand-in when nobody is measuring: spans cost a nullcontext"""
+
+    def span(self, stage: str):
+        return nullcontext()
+
+    def add(self, stage: str, seconds: float) -> None:
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    """Nearest-rank percentile (0 < q <= 100) of an already sorted list"""
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
@@ -0,0 +1,3 @@
+from app.read_api import create_read_app
+
+app = create_read_app()
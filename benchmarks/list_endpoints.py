@@ -0,0 +1,136 @@
+"""
+Benchmark of GET /api/eeg-records over a seeded in-memory database.
+
+Walks every page of the listing (keyset cursor from X-Next-Cursor) as an
+admin and reports rows/s and the page latency percentiles.
+
+    python -m benchmarks.list_endpoints --rows 10000 100000 --limit 200
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from werkzeug.security import generate_password_hash
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+from app.models.eeg_record import EegRecord, EegStatus, FILE_TYPE
+from app.models.patient import Patient
+from app.models.user import User, UserRole
+
+PATIENTS = 500
+
+
+def seed(n_rows: int) -> None:
+    admin = User(
+        email="bench@neuroscreen.com",
+        password_hash=generate_password_hash("Bench123"),
+        first_name="Bench",
+        last_name="Admin",
+        role=UserRole.ADMIN,
+    )
+    db.session.add(admin)
+    db.session.flush()
+
+    db.session.execute(db.insert(Patient), [
+        {
+            "identification_number": f"B{i:08d}",
+            "first_name": f"Name{i}",
+            "last_name": f"Last{i}",
+            "first_name_normalized": f"name{i}",
+            "last_name_normalized": f"last{i}",
+            "created_by": admin.id,
+        }
+        for i in range(PATIENTS)
+    ])
+
+    start = datetime.now(timezone.utc) - timedelta(seconds=n_rows)
+    db.session.execute(db.insert(EegRecord), [
+        {
+            "patient_id": i % PATIENTS + 1,
+            "uploader_id": admin.id,
+            "file_name": f"eeg_{i}.parquet",
+            "file_path": f"uploads/eeg/eeg_{i}.parquet",
+            "file_type": FILE_TYPE.PARQUET,
+            "file_size_bytes": 1_000_000 + i,
+            "status": EegStatus.PROCESSED,
+            "processing_time_ms": 1200,
+            "created_at": start + timedelta(seconds=i),
+            "updated_at": start + timedelta(seconds=i),
+        }
+        for i in range(n_rows)
+    ])
+    db.session.commit()
+
+
+def walk_listing(client, headers, limit: int) -> tuple:
+    """Returns (rows read, seconds per page)"""
+    rows = 0
+    page_times = []
+    url = f"/api/eeg-records?limit={limit}"
+
+    while url:
+        started = time.perf_counter()
+        response = client.get(url, headers=headers)
+        page_times.append(time.perf_counter() - started)
+
+        assert response.status_code == 200, response.get_data(as_text=True)
+        rows += len(response.get_json())
+
+        cursor = response.headers.get("X-Next-Cursor")
+        url = f"/api/eeg-records?limit={limit}&cursor={cursor}" if cursor else None
+
+    return rows, page_times
+
+
+def run(n_rows: int, limit: int) -> dict:
+    app = create_app(TestingConfig)
+
+    with app.app_context():
+        db.create_all()
+        seed(n_rows)
+
+        client = app.test_client()
+        token = client.post("/api/auth/login", json={
+            "email": "bench@neuroscreen.com",
+            "password": "Bench123",
+        }).get_json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        walk_listing(client, headers, limit)  # warm-up
+
+        started = time.perf_counter()
+        rows, page_times = walk_listing(client, headers, limit)
+        elapsed = time.perf_counter() - started
+
+        db.session.remove()
+        db.drop_all()
+
+    page_ms = sorted(t * 1000 for t in page_times)
+    return {
+        "rows": rows,
+        "pages": len(page_ms),
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed),
+        "page_p50_ms": round(statistics.median(page_ms), 2),
+        "page_p95_ms": round(page_ms[int(len(page_ms) * 0.95) - 1], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--limit", type=int, default=200)
+    args = parser.parse_args()
+
+    for n_rows in args.rows:
+        result = run(n_rows, args.limit)
+        print(
+            f"{n_rows:>7} rows  {result['pages']:>4} pages  {result['seconds']:>7}s  "
+            f"{result['rows_per_second']:>7} rows/s  "
+            f"p50 {result['page_p50_ms']} ms  p95 {result['page_p95_ms']} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
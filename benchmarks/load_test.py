@@ -0,0 +1,268 @@
+"""
+HTTP load test of the read endpoints over a seeded database.
+
+Seeds users, patients, processed EEG records and their predictions with
+bulk inserts, then runs one concurrent client per user for --duration
+seconds. Every client logs in (timed as "login") and then picks weighted
+endpoints among its own data: the auth/session check alone (/auth/me),
+listings, status and prediction lookups. Reports req/s and the latency
+percentiles per endpoint.
+
+By default the app is served in-process by a threaded WSGI server, so the
+clients and the server share the GIL. To measure a real deployment, start
+it against the same database and pass --url; the harness seeds first.
+
+    python -m benchmarks.load_test --users 20 --duration 20
+    python -m benchmarks.load_test --database-url postgresql+psycopg://... --url http://127.0.0.1:8000
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+from werkzeug.security import generate_password_hash
+from werkzeug.serving import make_server
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+from app.models.eeg_record import EegRecord, EegStatus, FILE_TYPE
+from app.models.patient import Patient
+from app.models.patient_summary import PatientSummary
+from app.models.prediction_result import AlcoholismRisk, PredictionResult
+from app.models.user import User, UserRole
+from app.utils.timing import percentile
+
+PASSWORD = "Load1234"
+
+# name: (weight, path); {patient_id} and {eeg_id} are picked among the client's own rows
+ENDPOINTS = {
+    "auth_me": (1, "/api/auth/me"),
+    "list_records": (2, "/api/eeg-records?limit=50"),
+    "list_patients": (1, "/api/patients?limit=50"),
+    "patient_records": (1, "/api/patients/{patient_id}/eeg-records?limit=50"),
+    "patient_predictions": (1, "/api/patients/{patient_id}/predictions?limit=50"),
+    "status": (4, "/api/eeg-records/{eeg_id}/status"),
+    "prediction": (2, "/api/eeg-records/{eeg_id}/prediction"),
+}
+
+
+def seed(n_users: int, patients_per_user: int, records_per_patient: int) -> list:
+    """Bulk inserts the data set; returns (email, patient ids, eeg ids) per user"""
+    password_hash = generate_password_hash(PASSWORD)  # hashed once for every user
+    now = datetime.now(timezone.utc)
+    n_records = n_users * patients_per_user * records_per_patient
+    start = now - timedelta(seconds=n_records)
+
+    users, patients, summaries, records, predictions, owned = [], [], [], [], [], []
+    patient_id = eeg_id = 0
+
+    for u in range(1, n_users + 1):
+        email = f"load{u}@neuroscreen.com"
+        users.append({
+            "id": u, "email": email, "password_hash": password_hash,
+            "first_name": f"Load{u}", "last_name": "User", "role": UserRole.USER,
+        })
+        patient_ids, eeg_ids = [], []
+
+        for _ in range(patients_per_user):
+            patient_id += 1
+            patient_ids.append(patient_id)
+            patients.append({
+                "id": patient_id,
+                "identification_number": f"L{patient_id:09d}",
+                "first_name": f"Name{patient_id}",
+                "last_name": f"Last{patient_id}",
+                "first_name_normalized": f"name{patient_id}",
+                "last_name_normalized": f"last{patient_id}",
+                "created_by": u,
+            })
+
+            for _ in range(records_per_patient):
+                eeg_id += 1
+                eeg_ids.append(eeg_id)
+                created = start + timedelta(seconds=eeg_id)
+                records.append({
+                    "id": eeg_id,
+                    "patient_id": patient_id,
+                    "uploader_id": u,
+                    "file_name": f"eeg_{eeg_id}.parquet",
+                    "file_path": f"uploads/eeg/eeg_{eeg_id}.parquet",
+                    "file_type": FILE_TYPE.PARQUET,
+                    "file_size_bytes": 1_000_000,
+                    "status": EegStatus.PROCESSED,
+                    "progress": 100,
+                    "processing_time_ms": 1200,
+                    "created_at": created,
+                    "updated_at": created,
+                })
+                predictions.append({
+                    "eeg_record_id": eeg_id,
+                    "result": AlcoholismRisk.NON_ALCOHOLIC if eeg_id % 3 else AlcoholismRisk.ALCOHOLIC,
+                    "confidence": 0.9,
+                    "raw_probability": 0.1,
+                    "model_version": "eegnet_v1",
+                    "created_at": created,
+                    "updated_at": created,
+                })
+
+            summaries.append({
+                "patient_id": patient_id,
+                "eeg_count": records_per_patient,
+                "pending_count": 0,
+                "last_upload_at": created,
+            })
+
+        owned.append((email, patient_ids, eeg_ids))
+
+    for model, rows in (
+        (User, users), (Patient, patients), (PatientSummary, summaries),
+        (EegRecord, records), (PredictionResult, predictions),
+    ):
+        if rows:
+            db.session.execute(db.insert(model), rows)
+    db.session.commit()
+    return owned
+
+
+def request(conn: http.client.HTTPConnection, method: str, path: str, headers: dict, body=None) -> tuple:
+    conn.request(method, path, body=body, headers=headers)
+    response = conn.getresponse()
+    return response.status, response.read()
+
+
+def run_client(base_url: str, email: str, patient_ids: list, eeg_ids: list, deadline: float, seed: int) -> dict:
+    """Latencies (seconds) per endpoint, plus error counts, of one client"""
+    rng = random.Random(seed)
+    url = urlsplit(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+    samples = {"login": []}
+    errors = {}
+
+    started = time.perf_counter()
+    status, body = request(
+        conn, "POST", "/api/auth/login", {"Content-Type": "application/json"},
+        json.dumps({"email": email, "password": PASSWORD}),
+    )
+    samples["login"].append(time.perf_counter() - started)
+    if status != 200:
+        return {"samples": samples, "errors": {"login": 1}}
+    headers = {"Authorization": f"Bearer {json.loads(body)['access_token']}"}
+
+    names = list(ENDPOINTS)
+    weights = [ENDPOINTS[name][0] for name in names]
+
+    while time.monotonic() < deadline:
+        name = rng.choices(names, weights)[0]
+        path = ENDPOINTS[name][1].format(patient_id=rng.choice(patient_ids), eeg_id=rng.choice(eeg_ids))
+
+        started = time.perf_counter()
+        try:
+            status, _ = request(conn, "GET", path, headers)
+        except (OSError, http.client.HTTPException):
+            conn.close()  # reconnects on the next request
+            status = None
+        samples.setdefault(name, []).append(time.perf_counter() - started)
+        if status != 200:
+            errors[name] = errors.get(name, 0) + 1
+
+    conn.close()
+    return {"samples": samples, "errors": errors}
+
+
+def summarize(results: list, elapsed: float) -> dict:
+    samples, errors = {}, {}
+    for result in results:
+        for name, values in result["samples"].items():
+            samples.setdefault(name, []).extend(values)
+        for name, n in result["errors"].items():
+            errors[name] = errors.get(name, 0) + n
+
+    endpoints = {}
+    for name, values in sorted(samples.items()):
+        ms = sorted(v * 1000 for v in values)
+        endpoints[name] = {
+            "requests": len(ms),
+            "errors": errors.get(name, 0),
+            "p50_ms": round(percentile(ms, 50), 2),
+            "p95_ms": round(percentile(ms, 95), 2),
+            "p99_ms": round(percentile(ms, 99), 2),
+        }
+
+    total = sum(e["requests"] for name, e in endpoints.items() if name != "login")
+    return {
+        "seconds": round(elapsed, 2),
+        "requests": total,
+        "requests_per_second": round(total / elapsed, 1),
+        "endpoints": endpoints,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=20, help="users, and concurrent clients")
+    parser.add_argument("--patients-per-user", type=int, default=50)
+    parser.add_argument("--records-per-patient", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=20, help="seconds of load")
+    parser.add_argument("--database-url", help="database to seed, its tables are recreated (default: a temporary SQLite file)")
+    parser.add_argument("--url", help="server already running against --database-url")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'load.db')}"
+
+    class LoadTestConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = database_url
+        METRICS_ENABLED = False
+
+    app = create_app(LoadTestConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        started = time.perf_counter()
+        owned = seed(args.users, args.patients_per_user, args.records_per_patient)
+        print(f"Seeded {len(owned) * args.patients_per_user * args.records_per_patient} records "
+              f"in {time.perf_counter() - started:.1f}s")
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)  # no access log per request
+        server = make_server("127.0.0.1", 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+
+    deadline = time.monotonic() + args.duration
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(owned)) as pool:
+        futures = [
+            pool.submit(run_client, base_url, email, patient_ids, eeg_ids, deadline, seed)
+            for seed, (email, patient_ids, eeg_ids) in enumerate(owned)
+        ]
+        results = [f.result() for f in futures]
+    summary = summarize(results, time.perf_counter() - started)
+
+    if server is not None:
+        server.shutdown()
+
+    print(f"{summary['requests']} requests in {summary['seconds']}s: {summary['requests_per_second']} req/s")
+    for name, e in summary["endpoints"].items():
+        print(
+            f"  {name:<20} {e['requests']:>7} req  {e['errors']:>4} err  "
+            f"p50 {e['p50_ms']:>8} ms  p95 {e['p95_ms']:>8} ms  p99 {e['p99_ms']:>8} ms"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
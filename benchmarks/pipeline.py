@@ -0,0 +1,212 @@
+"""
+Benchmark of the EEG processing pipeline on synthetic parquet files.
+
+Generates a recording in the long layout the readers expect (trial,
+channel, sample, value) for every requested size and times each stage:
+parquet read, pivot to the dense layout, dense store write, store load,
+preprocessing (with its band filtering and normalization parts), inference
+and the whole process_eeg_record task against an in-memory database.
+Every stage is the median of --repeat runs.
+
+    python -m benchmarks.pipeline --trials 5 30 --samples 2048 --output run.json
+    python -m benchmarks.pipeline --trials 5 30 --samples 2048 --baseline run.json
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from werkzeug.security import generate_password_hash
+from app import create_app
+from app.config import TestingConfig
+from app.domain.reader.dense_reader import DenseEegRecording, dense_path_for
+from app.domain.reader.parquet_reader import ParquetEegReader
+from app.extensions import db
+from app.ml.inference import run_inference
+from app.ml.model_loader import get_model
+from app.ml.preprocessing import PREDEFINED_CHANNELS, build_tensor_from_recording
+from app.models.eeg_record import EegRecord, FILE_TYPE
+from app.models.patient import Patient
+from app.models.prediction_result import PredictionResult
+from app.models.user import User, UserRole
+from app.tasks.eeg_tasks import process_eeg_record
+from app.utils.timing import StageTimer
+
+
+def case_name(channels: int, trials: int, samples: int) -> str:
+    return f"{channels}ch x {trials}tr x {samples}s"
+
+
+def write_synthetic_parquet(path: str, channels: int, trials: int, samples: int, seed: int = 0) -> int:
+    """Writes a random recording and returns its size in bytes"""
+    names = PREDEFINED_CHANNELS[:channels]
+    rng = np.random.default_rng(seed)
+
+    df = pd.DataFrame({
+        "trial": np.repeat(np.arange(trials), len(names) * samples),
+        "channel": np.tile(np.repeat(names, samples), trials),
+        "sample": np.tile(np.arange(samples), trials * len(names)),
+        "value": rng.standard_normal(trials * len(names) * samples).astype(np.float32),
+    })
+    df.to_parquet(path, index=False)
+    return os.path.getsize(path)
+
+
+def time_stages(parquet_path: str) -> tuple:
+    """(seconds per stage, windows built) of one pass over the pipeline"""
+    timer = StageTimer()
+
+    with timer.span("read"):
+        df = ParquetEegReader().read(parquet_path)
+    with timer.span("pivot"):
+        recording = DenseEegRecording.from_dataframe(df)
+    del df
+
+    dense_path = dense_path_for(parquet_path)
+    with timer.span("store"):
+        recording.save(dense_path)
+    with timer.span("load"):
+        recording = DenseEegRecording.load(dense_path)
+
+    with timer.span("preprocess"):
+        X = build_tensor_from_recording(recording, win_size=256, step_size=256, use_bands=True, timer=timer)
+    with timer.span("inference"):
+        run_inference(X)
+
+    shutil.rmtree(dense_path)
+    return timer.seconds, len(X)
+
+
+def seed_task_owner() -> tuple:
+    user = User(
+        email="bench@neuroscreen.com",
+        password_hash=generate_password_hash("Bench123"),
+        first_name="Bench",
+        last_name="User",
+        role=UserRole.USER,
+    )
+    db.session.add(user)
+    db.session.flush()
+
+    patient = Patient(identification_number="B00000001", first_name="Bench", last_name="Patient", created_by=user.id)
+    db.session.add(patient)
+    db.session.commit()
+    return user.id, patient.id
+
+
+def time_task(parquet_path: str, user_id: int, patient_id: int) -> dict:
+    """Seconds of a whole process_eeg_record run, conversion to dense included"""
+    record = EegRecord(
+        patient_id=patient_id,
+        uploader_id=user_id,
+        file_name=os.path.basename(parquet_path),
+        file_path=parquet_path,
+        file_type=FILE_TYPE.PARQUET,
+        file_size_bytes=os.path.getsize(parquet_path),
+    )
+    db.session.add(record)
+    db.session.commit()
+
+    started = time.perf_counter()
+    process_eeg_record.apply(args=[record.id], throw=True)
+    elapsed = time.perf_counter() - started
+
+    prediction = PredictionResult.query.filter_by(eeg_record_id=record.id).one()
+    shutil.rmtree(dense_path_for(parquet_path), ignore_errors=True)
+    return {
+        "task_total": elapsed,
+        "task_claim": prediction.stage_timings_ms["claim"] / 1000,
+    }
+
+
+def run(channels: int, trials: int, samples: int, repeat: int, workdir: str, owner: tuple) -> dict:
+    parquet_path = os.path.join(workdir, f"eeg_{channels}_{trials}_{samples}.parquet")
+    size_bytes = write_synthetic_parquet(parquet_path, channels, trials, samples)
+
+    runs = []
+    for _ in range(repeat):
+        stages, windows = time_stages(parquet_path)
+        runs.append({**stages, **time_task(parquet_path, *owner)})
+
+    stage_ms = {
+        stage: round(statistics.median(r[stage] for r in runs) * 1000, 2)
+        for stage in runs[0]
+    }
+    return {
+        "channels": channels,
+        "trials": trials,
+        "samples": samples,
+        "file_bytes": size_bytes,
+        "windows": windows,
+        "windows_per_second": round(windows / (stage_ms["preprocess"] / 1000)) if stage_ms["preprocess"] else None,
+        "stages_ms": stage_ms,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Stages slower than the baseline by more than `tolerance` (0.2 = 20%)"""
+    regressions = []
+    for case, result in results.items():
+        base = baseline.get(case)
+        if base is None:
+            continue
+        for stage, ms in result["stages_ms"].items():
+            base_ms = base["stages_ms"].get(stage)
+            if base_ms and ms > base_ms * (1 + tolerance):
+                regressions.append((case, stage, base_ms, ms))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--channels", type=int, default=33)
+    parser.add_argument("--trials", type=int, nargs="+", default=[5, 30])
+    parser.add_argument("--samples", type=int, default=2048)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown per stage (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    get_model()  # model loading is not part of any stage
+
+    # A single app: Celery tasks stay bound to the first one created
+    app = create_app(TestingConfig)
+    results = {}
+
+    with app.app_context(), tempfile.TemporaryDirectory() as workdir:
+        db.create_all()
+        owner = seed_task_owner()
+
+        for trials in args.trials:
+            case = case_name(args.channels, trials, args.samples)
+            results[case] = result = run(args.channels, trials, args.samples, args.repeat, workdir, owner)
+
+            stages = "  ".join(f"{stage} {ms}" for stage, ms in result["stages_ms"].items())
+            print(f"{case}  {result['file_bytes'] / 1e6:.1f} MB  {result['windows']} windows  (ms) {stages}")
+
+        db.session.remove()
+        db.drop_all()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+
+        for case, stage, base_ms, ms in regressions:
+            print(f"REGRESSION {case} {stage}: {base_ms} ms -> {ms} ms")
+        if regressions:
+            sys.exit(1)
+        print(f"No stage slower than the baseline by more than {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
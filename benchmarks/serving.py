@@ -0,0 +1,131 @@
+"""
+Throughput of the Flask development server against gunicorn (gunicorn.conf.py).
+
+Seeds a SQLite database with benchmarks.load_test, starts each server as a
+subprocess on it and drives both with the same concurrent clients, so the
+load generator never shares a process (or the GIL) with the server.
+
+    python -m benchmarks.serving --users 32 --duration 20
+"""
+import argparse
+import json
+import os
+import secrets
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+from benchmarks.load_test import run_client, seed, summarize
+
+SERVERS = {
+    "flask-dev": lambda port, workers: [
+        sys.executable, "-m", "flask", "--app", "run.py", "run", "--port", str(port),
+    ],
+    "gunicorn": lambda port, workers: [
+        sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+        "--bind", f"127.0.0.1:{port}", "--workers", str(workers), "run:app",
+    ],
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(base_url: str, process: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            # Any answer below 500 means the app is serving (GET on login is a 405)
+            urlopen(f"{base_url}/api/auth/login", timeout=1).read()
+            return
+        except HTTPError as e:
+            if e.code < 500:
+                return
+            time.sleep(0.2)
+        except (URLError, ConnectionError, OSError):
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start in {timeout}s")
+
+
+def drive(base_url: str, owned: list, duration: float) -> dict:
+    deadline = time.monotonic() + duration
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(owned)) as pool:
+        futures = [
+            pool.submit(run_client, base_url, email, patient_ids, eeg_ids, deadline, seed_)
+            for seed_, (email, patient_ids, eeg_ids) in enumerate(owned)
+        ]
+        results = [f.result() for f in futures]
+    return summarize(results, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=32, help="users, and concurrent clients")
+    parser.add_argument("--patients-per-user", type=int, default=20)
+    parser.add_argument("--records-per-patient", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=20, help="seconds of load per server")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="gunicorn worker processes")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    database_url = f"sqlite:///{os.path.join(workdir, 'serving.db')}"
+
+    class SeedConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = database_url
+
+    with create_app(SeedConfig).app_context():
+        db.create_all()
+        owned = seed(args.users, args.patients_per_user, args.records_per_patient)
+        db.session.remove()
+
+    os.makedirs(os.path.join(workdir, "prometheus"))
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "JWT_SECRET_KEY": secrets.token_urlsafe(32),
+        "PROMETHEUS_MULTIPROC_DIR": os.path.join(workdir, "prometheus"),
+        "GUNICORN_ACCESS_LOG": "",
+    }
+
+    results = {}
+    for name, command in SERVERS.items():
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        process = subprocess.Popen(
+            command(port, args.workers), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_until_up(base_url, process)
+            results[name] = summary = drive(base_url, owned, args.duration)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+        status = summary["endpoints"].get("status", {})
+        errors = sum(e["errors"] for e in summary["endpoints"].values())
+        print(
+            f"{name:<10} {summary['requests_per_second']:>8} req/s  "
+            f"status p50 {status.get('p50_ms')} ms  p95 {status.get('p95_ms')} ms  {errors} errors"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
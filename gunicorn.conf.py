@@ -0,0 +1,71 @@
+# Production server settings, read by `gunicorn -c gunicorn.conf.py run:app`.
+# Every value can be overridden through the environment.
+import multiprocessing
+import os
+import shutil
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+
+# Threaded workers: requests mostly wait on the database, Redis or the
+# client (uploads, SSE streams), so a few processes with several threads
+# each go further than many single-threaded ones.
+worker_class = "gthread"
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+# Every SSE stream or long-poll holds one thread while it is open. At most
+# EEG_EVENTS_MAX_STREAMS of them (default 2) are held per worker; the next
+# one gets a 503 with Retry-After, so threads - EEG_EVENTS_MAX_STREAMS
+# threads per worker always remain for other requests. With the defaults on
+# one CPU (3 workers x 4 threads) that is 6 open streams and 6 threads for
+# the rest. Many concurrent watchers belong on the async read API
+# (app/read_api), whose long-poll does not hold a thread.
+
+# Import the app once in the master so workers share its memory
+# (copy-on-write) and start faster. Connections opened before the fork are
+# dropped in post_fork.
+preload_app = True
+
+# A 200 MB upload over a slow link takes minutes. With gthread workers the
+# heartbeat is sent by the main thread, so a long request does not get its
+# worker killed; the timeout covers hung workers only.
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 60))
+# Idle connections from the reverse proxy / load balancer are kept open for
+# reuse; keep this above the proxy's own upstream keep-alive
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 75))
+
+# Recycle workers now and then to bound memory growth; jitter avoids
+# restarting them all at once
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 200))
+
+# Heartbeat files on tmpfs: a slow disk must not look like a hung worker
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None  # empty: no access log
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def on_starting(server):
+    # Samples of the workers of a previous run would be aggregated otherwise
+    multiproc_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def post_fork(server, worker):
+    # Pooled connections inherited from the master must not be shared
+    from app.extensions import db
+
+    with server.app.wsgi().app_context():
+        db.engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
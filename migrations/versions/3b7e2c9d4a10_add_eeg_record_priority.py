@@ -0,0 +1,32 @@
+"""add eeg record priority
+
+Revision ID: 3b7e2c9d4a10
+Revises: f9d3af8de99b
+Create Date: 2026-10-19 10:12:41.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7e2c9d4a10'
+down_revision = 'f9d3af8de99b'
+branch_labels = None
+depends_on = None
+
+eegpriority = sa.Enum('LOW', 'NORMAL', 'HIGH', name='eegpriority')
+
+
+def upgrade():
+    eegpriority.create(op.get_bind(), checkfirst=True)
+
+    with op.batch_alter_table('eeg_records', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('priority', eegpriority, server_default='NORMAL', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('eeg_records', schema=None) as batch_op:
+        batch_op.drop_column('priority')
+
+    eegpriority.drop(op.get_bind(), checkfirst=True)
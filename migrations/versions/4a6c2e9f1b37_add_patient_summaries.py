@@ -0,0 +1,71 @@
+"""add patient_summaries maintained with the eeg records
+
+Revision ID: 4a6c2e9f1b37
+Revises: 9d1f4b7a0e25
+Create Date: 2026-10-19 14:02:47.118530
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '4a6c2e9f1b37'
+down_revision = '9d1f4b7a0e25'
+branch_labels = None
+depends_on = None
+
+LATEST_PREDICTION = """
+    SELECT {column} FROM prediction_results pr
+    JOIN eeg_records e ON e.id = pr.eeg_record_id
+    WHERE e.patient_id = patient_summaries.patient_id AND e.is_deleted = false
+    ORDER BY pr.created_at DESC, pr.id DESC
+    LIMIT 1
+"""
+
+
+def upgrade():
+    # alcoholismrisk already exists (prediction_results.result)
+    alcoholism_risk = postgresql.ENUM('ALCOHOLIC', 'NON_ALCOHOLIC', name='alcoholismrisk', create_type=False)
+
+    op.create_table('patient_summaries',
+    sa.Column('patient_id', sa.Integer(), nullable=False),
+    sa.Column('eeg_count', sa.Integer(), nullable=False),
+    sa.Column('pending_count', sa.Integer(), nullable=False),
+    sa.Column('last_upload_at', sa.DateTime(), nullable=True),
+    sa.Column('latest_result', alcoholism_risk, nullable=True),
+    sa.Column('latest_raw_probability', sa.Numeric(precision=5, scale=4), nullable=True),
+    sa.Column('latest_prediction_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['patient_id'], ['patients.id'], ),
+    sa.PrimaryKeyConstraint('patient_id')
+    )
+    with op.batch_alter_table('patient_summaries', schema=None) as batch_op:
+        batch_op.create_index('ix_patient_summaries_eeg_count', ['eeg_count'], unique=False)
+        batch_op.create_index('ix_patient_summaries_pending_count', ['pending_count'], unique=False)
+
+    # Backfill from the existing records
+    op.execute("""
+        INSERT INTO patient_summaries (patient_id, eeg_count, pending_count, last_upload_at)
+        SELECT p.id,
+               COUNT(e.id),
+               COALESCE(SUM(CASE WHEN e.status = 'PENDING' THEN 1 ELSE 0 END), 0),
+               MAX(e.created_at)
+        FROM patients p
+        LEFT JOIN eeg_records e ON e.patient_id = p.id AND e.is_deleted = false
+        GROUP BY p.id
+    """)
+    op.execute(f"""
+        UPDATE patient_summaries SET
+            latest_result = ({LATEST_PREDICTION.format(column='pr.result')}),
+            latest_raw_probability = ({LATEST_PREDICTION.format(column='pr.raw_probability')}),
+            latest_prediction_at = ({LATEST_PREDICTION.format(column='pr.created_at')})
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('patient_summaries', schema=None) as batch_op:
+        batch_op.drop_index('ix_patient_summaries_pending_count')
+        batch_op.drop_index('ix_patient_summaries_eeg_count')
+
+    op.drop_table('patient_summaries')
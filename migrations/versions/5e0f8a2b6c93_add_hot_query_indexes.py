@@ -0,0 +1,53 @@
+"""add composite and partial indexes for hot queries
+
+Revision ID: 5e0f8a2b6c93
+Revises: c2a95f17e3b8
+Create Date: 2026-10-19 12:20:33.871460
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e0f8a2b6c93'
+down_revision = 'c2a95f17e3b8'
+branch_labels = None
+depends_on = None
+
+NOT_DELETED = {
+    'postgresql_where': sa.text('is_deleted = false'),
+    'sqlite_where': sa.text('is_deleted = 0'),
+}
+
+
+def upgrade():
+    op.create_index(
+        'ix_eeg_records_active_uploader_created', 'eeg_records',
+        ['uploader_id', 'created_at', 'id'], unique=False, **NOT_DELETED
+    )
+    op.create_index(
+        'ix_eeg_records_active_uploader_status_created', 'eeg_records',
+        ['uploader_id', 'status', 'created_at', 'id'], unique=False, **NOT_DELETED
+    )
+    op.create_index(
+        'ix_eeg_records_active_patient_created', 'eeg_records',
+        ['patient_id', 'created_at', 'id'], unique=False, **NOT_DELETED
+    )
+    op.create_index(
+        'ix_patients_active_created_by_created', 'patients',
+        ['created_by', 'created_at', 'id'], unique=False, **NOT_DELETED
+    )
+    op.create_index(
+        'ix_sessions_user_id_active', 'sessions', ['user_id'], unique=False,
+        postgresql_where=sa.text('is_active = true'),
+        sqlite_where=sa.text('is_active = 1'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_sessions_user_id_active', table_name='sessions')
+    op.drop_index('ix_patients_active_created_by_created', table_name='patients')
+    op.drop_index('ix_eeg_records_active_patient_created', table_name='eeg_records')
+    op.drop_index('ix_eeg_records_active_uploader_status_created', table_name='eeg_records')
+    op.drop_index('ix_eeg_records_active_uploader_created', table_name='eeg_records')
@@ -0,0 +1,28 @@
+"""add eeg record recovery attempts and status index
+
+Revision ID: 8c41d0e6f2a7
+Revises: 3b7e2c9d4a10
+Create Date: 2026-10-19 11:02:17.540391
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c41d0e6f2a7'
+down_revision = '3b7e2c9d4a10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('eeg_records', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('recovery_attempts', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index('ix_eeg_records_status_updated_at', ['status', 'updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('eeg_records', schema=None) as batch_op:
+        batch_op.drop_index('ix_eeg_records_status_updated_at')
+        batch_op.drop_column('recovery_attempts')
@@ -0,0 +1,58 @@
+"""store sha-256 digests of session tokens instead of the raw jwt
+
+Revision ID: 9d1f4b7a0e25
+Revises: 5e0f8a2b6c93
+Create Date: 2026-10-19 13:05:12.402117
+
+"""
+import hashlib
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d1f4b7a0e25'
+down_revision = '5e0f8a2b6c93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_hash', sa.LargeBinary(length=32), nullable=True))
+
+    sessions = sa.table(
+        'sessions',
+        sa.column('id', sa.Integer),
+        sa.column('token', sa.String),
+        sa.column('token_hash', sa.LargeBinary),
+    )
+    conn = op.get_bind()
+    rows = conn.execute(sa.select(sessions.c.id, sessions.c.token)).all()
+    for id_, token in rows:
+        conn.execute(
+            sessions.update()
+            .where(sessions.c.id == id_)
+            .values(token_hash=hashlib.sha256(token.encode()).digest())
+        )
+
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.alter_column('token_hash', existing_type=sa.LargeBinary(length=32), nullable=False)
+        batch_op.create_index(batch_op.f('ix_sessions_token_hash'), ['token_hash'], unique=True)
+        batch_op.drop_index(batch_op.f('ix_sessions_token'))
+        batch_op.drop_column('token')
+
+
+def downgrade():
+    # The raw tokens cannot be recovered: existing sessions are closed and
+    # keep a unique placeholder so the column can be made NOT NULL again
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token', sa.String(length=500), nullable=True))
+
+    op.execute("UPDATE sessions SET token = 'revoked-' || id, is_active = false")
+
+    with op.batch_alter_table('sessions', schema=None) as batch_op:
+        batch_op.alter_column('token', existing_type=sa.String(length=500), nullable=False)
+        batch_op.create_index(batch_op.f('ix_sessions_token'), ['token'], unique=True)
+        batch_op.drop_index(batch_op.f('ix_sessions_token_hash'))
+        batch_op.drop_column('token_hash')
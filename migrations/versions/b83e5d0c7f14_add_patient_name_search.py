@@ -0,0 +1,81 @@
+"""add normalized patient names and search indexes
+
+Revision ID: b83e5d0c7f14
+Revises: 4a6c2e9f1b37
+Create Date: 2026-10-19 14:48:09.553902
+
+"""
+import re
+import unicodedata
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b83e5d0c7f14'
+down_revision = '4a6c2e9f1b37'
+branch_labels = None
+depends_on = None
+
+TRIGRAM_INDEXES = {
+    'ix_patients_first_name_normalized_trgm': 'first_name_normalized',
+    'ix_patients_last_name_normalized_trgm': 'last_name_normalized',
+    'ix_patients_identification_number_trgm': 'identification_number',
+}
+
+
+def normalize_text(value):
+    # Same as app.utils.text.normalize_text at the time of this revision
+    if not value:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', value)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return re.sub(r'\s+', ' ', stripped).strip().casefold()
+
+
+def upgrade():
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    with op.batch_alter_table('patients', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('first_name_normalized', sa.String(length=120), nullable=True))
+        batch_op.add_column(sa.Column('last_name_normalized', sa.String(length=120), nullable=True))
+
+    patients = sa.table(
+        'patients',
+        sa.column('id', sa.Integer),
+        sa.column('first_name', sa.String),
+        sa.column('last_name', sa.String),
+        sa.column('first_name_normalized', sa.String),
+        sa.column('last_name_normalized', sa.String),
+    )
+    rows = conn.execute(sa.select(patients.c.id, patients.c.first_name, patients.c.last_name)).all()
+    for id_, first_name, last_name in rows:
+        conn.execute(
+            patients.update()
+            .where(patients.c.id == id_)
+            .values(
+                first_name_normalized=normalize_text(first_name),
+                last_name_normalized=normalize_text(last_name),
+            )
+        )
+
+    with op.batch_alter_table('patients', schema=None) as batch_op:
+        batch_op.alter_column('first_name_normalized', existing_type=sa.String(length=120), nullable=False)
+        batch_op.alter_column('last_name_normalized', existing_type=sa.String(length=120), nullable=False)
+
+    for name, column in TRIGRAM_INDEXES.items():
+        op.create_index(
+            name, 'patients', [column], unique=False,
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade():
+    for name in TRIGRAM_INDEXES:
+        op.drop_index(name, table_name='patients')
+
+    with op.batch_alter_table('patients', schema=None) as batch_op:
+        batch_op.drop_column('last_name_normalized')
+        batch_op.drop_column('first_name_normalized')
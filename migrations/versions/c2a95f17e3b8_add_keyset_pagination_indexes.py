@@ -0,0 +1,44 @@
+"""add keyset pagination indexes
+
+Revision ID: c2a95f17e3b8
+Revises: 8c41d0e6f2a7
+Create Date: 2026-10-19 11:47:05.302118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2a95f17e3b8'
+down_revision = '8c41d0e6f2a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index('ix_users_created_at_id', ['created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('patients', schema=None) as batch_op:
+        batch_op.create_index('ix_patients_created_at_id', ['created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('eeg_records', schema=None) as batch_op:
+        batch_op.create_index('ix_eeg_records_created_at_id', ['created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('prediction_results', schema=None) as batch_op:
+        batch_op.create_index('ix_prediction_results_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('prediction_results', schema=None) as batch_op:
+        batch_op.drop_index('ix_prediction_results_created_at_id')
+
+    with op.batch_alter_table('eeg_records', schema=None) as batch_op:
+        batch_op.drop_index('ix_eeg_records_created_at_id')
+
+    with op.batch_alter_table('patients', schema=None) as batch_op:
+        batch_op.drop_index('ix_patients_created_at_id')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_created_at_id')
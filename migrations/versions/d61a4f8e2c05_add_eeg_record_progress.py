@@ -0,0 +1,26 @@
+"""add eeg record processing progress
+
+Revision ID: d61a4f8e2c05
+Revises: b83e5d0c7f14
+Create Date: 2026-10-19 16:24:51.208733
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd61a4f8e2c05'
+down_revision = 'b83e5d0c7f14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('eeg_records', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('progress', sa.SmallInteger(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('eeg_records', schema=None) as batch_op:
+        batch_op.drop_column('progress')
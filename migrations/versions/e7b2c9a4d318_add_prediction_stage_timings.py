@@ -0,0 +1,26 @@
+"""add per-stage processing timings to prediction results
+
+Revision ID: e7b2c9a4d318
+Revises: d61a4f8e2c05
+Create Date: 2026-10-19 17:08:36.914027
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b2c9a4d318'
+down_revision = 'd61a4f8e2c05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('prediction_results', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('stage_timings_ms', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('prediction_results', schema=None) as batch_op:
+        batch_op.drop_column('stage_timings_ms')
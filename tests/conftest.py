@@ -1,6 +1,7 @@
 import pytest
 import io
 import os
+from sqlalchemy import event
 from werkzeug.security import generate_password_hash
 from app import create_app
 from app.config import TestingConfig
@@ -46,6 +47,24 @@ def client(app, db):
             yield c
 
 
+@pytest.fixture
+def capture_sql(db):
+    """Devuelve una función que ejecuta `fn` y retorna las sentencias SQL emitidas."""
+    def run(fn):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            fn()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+        return statements
+    return run
+
+
 # ------------------------------------------------------------------ #
 # Usuarios                                                             #
 # ------------------------------------------------------------------ #
@@ -175,21 +194,23 @@ def parquet_file():
             data = f.read()
         return (io.BytesIO(data), "co3c0000402.parquet")
 
-    # Fallback: parquet mínimo sintético (solo para tests de upload/validación)
+    # Fallback: parquet sintético con los 33 canales que espera el modelo
+    # (5 trials x 33 canales x 512 muestras), suficiente para el pipeline completo
     import pandas as pd
     import numpy as np
+    from app.ml.preprocessing import PREDEFINED_CHANNELS
+
+    channels = PREDEFINED_CHANNELS[:33]
+    n_trials, n_samples = 5, 512
 
     df = pd.DataFrame({
-        "trial": np.repeat(np.arange(5), 256 * 10),
-        "channel": np.tile(
-            np.repeat(["F1", "F2", "O1", "C1", "T7"], 256),
-            5
-        ),
-        "sample": np.tile(np.arange(256), 5 * 10),
-        "value": np.random.randn(5 * 256 * 10).astype(np.float32),
+        "trial": np.repeat(np.arange(n_trials), len(channels) * n_samples),
+        "channel": np.tile(np.repeat(channels, n_samples), n_trials),
+        "sample": np.tile(np.arange(n_samples), n_trials * len(channels)),
+        "value": np.random.randn(n_trials * len(channels) * n_samples).astype(np.float32),
     })
 
     buffer = io.BytesIO()
     df.to_parquet(buffer, index=False)
     buffer.seek(0)
-    return (buffer, "synthetic_eeg.parquet")
\ No newline at end of file
+    return (buffer, "synthetic_eeg.parquet")
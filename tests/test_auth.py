@@ -106,3 +106,69 @@ class TestMe:
             headers={"Authorization": "Bearer token_inventado"}
         )
         assert response.status_code == 401
+
+
+
+def session_statements(statements):
+    return [s for s, _ in statements if "sessions" in s]
+
+
+class TestSessionCache:
+
+    def test_authenticated_requests_do_not_query_sessions(self, client, admin_headers, capture_sql):
+        statements = capture_sql(lambda: [
+            client.get("/api/auth/me", headers=admin_headers) for _ in range(3)
+        ])
+        assert session_statements(statements) == []
+
+    def test_refresh_is_coalesced(self, app, client, admin_headers, capture_sql, monkeypatch):
+        # Primera petición tras el login: aún dentro del intervalo de refresco
+        statements = capture_sql(lambda: client.get("/api/auth/me", headers=admin_headers))
+        assert not any(s.startswith("UPDATE sessions") for s in session_statements(statements))
+
+        # Con intervalo 0 cada petición vuelve a escribir la expiración
+        monkeypatch.setitem(app.config, "SESSION_REFRESH_INTERVAL_SECONDS", 0)
+        statements = capture_sql(lambda: client.get("/api/auth/me", headers=admin_headers))
+        assert any(s.startswith("UPDATE sessions") for s in session_statements(statements))
+
+    def test_cache_miss_falls_back_to_database(self, client, admin_headers, admin_token):
+        from app.models.session import Session
+        from app.utils.session_cache import get_session_cache
+
+        get_session_cache().invalidate(Session.hash_token(admin_token).hex())
+        response = client.get("/api/auth/me", headers=admin_headers)
+        assert response.status_code == 200
+
+    def test_logout_invalidates_cached_session(self, client, admin_headers):
+        assert client.get("/api/auth/me", headers=admin_headers).status_code == 200
+        client.post("/api/auth/logout", headers=admin_headers)
+        assert client.get("/api/auth/me", headers=admin_headers).status_code == 401
+
+    def test_session_stores_token_digest(self, app, admin_token):
+        from app.models.session import Session
+
+        # Solo se guarda el SHA-256 del token, nunca el JWT
+        session = Session.query.filter_by(token_hash=Session.hash_token(admin_token)).first()
+        assert session is not None
+        assert len(session.token_hash) == 32
+        assert admin_token.encode() not in session.token_hash
+
+
+class TestPrincipal:
+
+    def test_authorization_does_not_load_user(self, client, user_headers, capture_sql):
+        # El rol viaja en el token: la comprobación de permisos no consulta users
+        statements = capture_sql(lambda: client.get("/api/users", headers=user_headers))
+        assert not any("FROM users" in s for s, _ in statements)
+
+    def test_user_is_loaded_when_handler_needs_it(self, client, admin_headers):
+        response = client.get("/api/auth/me", headers=admin_headers)
+        assert response.status_code == 200
+        assert response.get_json()["email"] == "admin@neuroscreen.com"
+
+    def test_token_carries_role_claim(self, app, user_token):
+        from flask_jwt_extended import decode_token
+
+        with app.app_context():
+            claims = decode_token(user_token)
+        assert claims["role"] == "user"
@@ -0,0 +1,60 @@
+import pytest
+from celery.signals import worker_process_init
+from sqlalchemy.pool import NullPool, QueuePool
+from app import create_app
+from app.celery_app import create_celery
+from app.config import TestingConfig, database_engine_options
+from app.extensions import db as _db
+
+
+@pytest.fixture
+def pooled_app(app, tmp_path, monkeypatch):
+    """App sobre un fichero SQLite con el pool de producción; Celery vuelve a la app de la sesión al terminar."""
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "2")
+    monkeypatch.setenv("DB_POOL_RECYCLE", "600")
+
+    class PooledConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'pool.db'}"
+        SQLALCHEMY_ENGINE_OPTIONS = database_engine_options()
+
+    pooled = create_app(PooledConfig)
+    try:
+        yield pooled
+    finally:
+        with pooled.app_context():
+            _db.engine.dispose()
+        create_celery(app)
+
+
+class TestDatabasePool:
+
+    def test_engine_options_from_environment(self, pooled_app):
+        with pooled_app.app_context():
+            pool = _db.engine.pool
+
+            assert isinstance(pool, QueuePool)
+            assert pool.size() == 3
+            assert pool._max_overflow == 2
+            assert pool._recycle == 600
+            assert pool._pre_ping is True
+
+    def test_pgbouncer_mode_keeps_no_connections(self, monkeypatch):
+        monkeypatch.setenv("DB_POOLER", "pgbouncer")
+
+        options = database_engine_options()
+
+        assert options["poolclass"] is NullPool
+        # Sin sentencias preparadas del lado del servidor
+        assert options["connect_args"] == {"prepare_threshold": None}
+
+    def test_worker_child_drops_inherited_connections(self, app, monkeypatch):
+        calls = []
+        with app.app_context():
+            # El pool estático de la BD en memoria no puede recrearse sin perder los datos
+            monkeypatch.setattr(_db.engine, "dispose", lambda close=True: calls.append(close))
+
+        worker_process_init.send(sender=None)
+
+        # close=False: las conexiones siguen siendo del proceso padre
+        assert calls == [False]
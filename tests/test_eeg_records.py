@@ -1,5 +1,15 @@
 import pytest
 import io
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+from werkzeug.http import http_date
+from app.models.eeg_record import EegRecord, EegStatus, FILE_TYPE
+from app.tasks import eeg_tasks
+from app.tasks.eeg_tasks import process_eeg_record
+from app.utils.events import eeg_channel, get_event_broker, held_requests
 
 
 def upload_eeg(client, headers, patient_id, parquet_file):
@@ -40,6 +50,35 @@ class TestUploadEeg:
         status = status_r.get_json()["status"]
         assert status in ["processed", "failed"]  # nunca debe quedar en pending
 
+    def test_upload_with_priority(self, client, user_headers, sample_patient, parquet_file):
+        file_data, filename = parquet_file
+        response = client.post(
+            "/api/eeg-records/upload",
+            data={
+                "patient_id": str(sample_patient.id),
+                "priority": "high",
+                "file": (file_data, filename, "application/octet-stream")
+            },
+            headers=user_headers,
+            content_type="multipart/form-data"
+        )
+        assert response.status_code == 202
+        assert response.get_json()["priority"] == "high"
+
+    def test_upload_invalid_priority(self, client, user_headers, sample_patient, parquet_file):
+        file_data, filename = parquet_file
+        response = client.post(
+            "/api/eeg-records/upload",
+            data={
+                "patient_id": str(sample_patient.id),
+                "priority": "urgentisimo",
+                "file": (file_data, filename, "application/octet-stream")
+            },
+            headers=user_headers,
+            content_type="multipart/form-data"
+        )
+        assert response.status_code == 400
+
     def test_upload_without_file(self, client, user_headers, sample_patient):
         response = client.post(
             "/api/eeg-records/upload",
@@ -109,6 +148,86 @@ class TestUploadEeg:
         assert response.status_code == 401
 
 
+def upload_eeg_batch(client, headers, patient_ids, parquet_file, n_files=2):
+    """Helper para subir varios archivos en una sola petición."""
+    file_data, filename = parquet_file
+    content = file_data.read()
+    return client.post(
+        "/api/eeg-records/upload/batch",
+        data={
+            "patient_id": [str(pid) for pid in patient_ids],
+            "files": [
+                (io.BytesIO(content), filename, "application/octet-stream")
+                for _ in range(n_files)
+            ],
+        },
+        headers=headers,
+        content_type="multipart/form-data"
+    )
+
+
+class TestBatchUpload:
+
+    def test_batch_upload_success(self, client, user_headers, sample_patient, parquet_file):
+        response = upload_eeg_batch(client, user_headers, [sample_patient.id], parquet_file, n_files=3)
+        data = response.get_json()
+
+        assert response.status_code == 202
+        assert data["accepted"] == 3
+        assert data["rejected"] == 0
+        assert all(r["status"] == "pending" for r in data["results"])
+
+        # Archivos pequeños: se procesan juntos en una sola llamada al modelo
+        records = client.get("/api/eeg-records", headers=user_headers).get_json()
+        assert len(records) == 3
+        assert all(r["status"] == "processed" for r in records)
+
+        for r in records:
+            prediction = client.get(f"/api/eeg-records/{r['id']}/prediction", headers=user_headers)
+            assert prediction.status_code == 200
+
+    def test_batch_reports_per_file_status(
+        self, client, user_headers, sample_patient, parquet_file
+    ):
+        response = upload_eeg_batch(
+            client, user_headers, [sample_patient.id, 99999], parquet_file, n_files=2
+        )
+        data = response.get_json()
+
+        assert response.status_code == 202
+        assert data["accepted"] == 1
+        assert data["results"][0]["status"] == "pending"
+        assert data["results"][1]["status"] == "rejected"
+        assert data["results"][1]["error"] == "Patient not found"
+
+    def test_batch_rejects_other_users_patient(
+        self, client, another_user_headers, sample_patient, parquet_file
+    ):
+        response = upload_eeg_batch(client, another_user_headers, [sample_patient.id], parquet_file)
+        data = response.get_json()
+
+        assert response.status_code == 400
+        assert data["accepted"] == 0
+        assert all(r["status"] == "rejected" for r in data["results"])
+
+    def test_batch_patient_ids_must_match_files(
+        self, client, user_headers, sample_patient, parquet_file
+    ):
+        response = upload_eeg_batch(
+            client, user_headers, [sample_patient.id] * 2, parquet_file, n_files=3
+        )
+        assert response.status_code == 400
+
+    def test_batch_without_files(self, client, user_headers, sample_patient):
+        response = client.post(
+            "/api/eeg-records/upload/batch",
+            data={"patient_id": str(sample_patient.id)},
+            headers=user_headers,
+            content_type="multipart/form-data"
+        )
+        assert response.status_code == 400
+
+
 class TestListEegRecords:
 
     def test_user_sees_only_own_records(
@@ -144,6 +263,13 @@ class TestListEegRecords:
         assert response.status_code == 200
         assert all(r["patient_id"] == sample_patient.id for r in data)
 
+    def test_listing_items_match_detail(self, client, user_headers, sample_patient, parquet_file):
+        # El listado serializa filas de columnas: debe dar el mismo JSON que el detalle
+        eeg_id = upload_eeg(client, user_headers, sample_patient.id, parquet_file).get_json()["eeg_record_id"]
+        listed = client.get("/api/eeg-records", headers=user_headers).get_json()
+        detail = client.get(f"/api/eeg-records/{eeg_id}", headers=user_headers).get_json()
+        assert listed == [detail]
+
 
 class TestGetEegRecord:
 
@@ -203,6 +329,299 @@ class TestEegStatus:
         assert response.status_code == 403
 
 
+class TestConditionalGet:
+
+    def test_status_returns_304_when_unchanged(
+        self, client, db, user_headers, sample_patient, parquet_file
+    ):
+        eeg_id = upload_eeg(client, user_headers, sample_patient.id, parquet_file).get_json()["eeg_record_id"]
+        url = f"/api/eeg-records/{eeg_id}/status"
+        record = db.session.get(EegRecord, eeg_id)
+        record.updated_at = record.updated_at - timedelta(seconds=5)
+        db.session.commit()
+
+        first = client.get(url, headers=user_headers)
+        assert first.status_code == 200
+        assert first.headers["ETag"].startswith('W/"')
+        assert "Last-Modified" in first.headers
+
+        again = client.get(url, headers={**user_headers, "If-None-Match": first.headers["ETag"]})
+        assert again.status_code == 304
+        assert again.data == b""
+        assert again.headers["ETag"] == first.headers["ETag"]
+
+        since = client.get(url, headers={**user_headers, "If-Modified-Since": first.headers["Last-Modified"]})
+        assert since.status_code == 304
+
+    def test_record_changed_within_the_second_has_no_last_modified(
+        self, client, user_headers, sample_patient, parquet_file
+    ):
+        eeg_id = upload_eeg(client, user_headers, sample_patient.id, parquet_file).get_json()["eeg_record_id"]
+        url = f"/api/eeg-records/{eeg_id}/status"
+
+        first = client.get(url, headers=user_headers)
+        # Podría volver a cambiar dentro del mismo segundo: If-Modified-Since no basta
+        assert "Last-Modified" not in first.headers
+
+        since = client.get(url, headers={**user_headers, "If-Modified-Since": http_date(time.time())})
+        assert since.status_code == 200
+
+    def test_changed_record_returns_new_representation(
+        self, client, db, user_headers, sample_patient, parquet_file
+    ):
+        eeg_id = upload_eeg(client, user_headers, sample_patient.id, parquet_file).get_json()["eeg_record_id"]
+        url = f"/api/eeg-records/{eeg_id}"
+        etag = client.get(url, headers=user_headers).headers["ETag"]
+
+        db.session.get(EegRecord, eeg_id).status = EegStatus.FAILED
+        db.session.commit()
+
+        response = client.get(url, headers={**user_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.get_json()["status"] == "failed"
+        assert response.headers["ETag"] != etag
+
+    def test_list_etag_changes_when_a_record_leaves(
+        self, client, user_headers, sample_patient, parquet_file
+    ):
+        eeg_id = upload_eeg(client, user_headers, sample_patient.id, parquet_file).get_json()["eeg_record_id"]
+        etag = client.get("/api/eeg-records", headers=user_headers).headers["ETag"]
+
+        cached = client.get("/api/eeg-records", headers={**user_headers, "If-None-Match": etag})
+        assert cached.status_code == 304
+
+        client.delete(f"/api/eeg-records/{eeg_id}", headers=user_headers)
+        response = client.get("/api/eeg-records", headers={**user_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.get_json() == []
+
+    def test_etag_does_not_bypass_permissions(
+        self, client, user_headers, another_user_headers, sample_patient, parquet_file
+    ):
+        eeg_id = upload_eeg(client, user_headers, sample_patient.id, parquet_file).get_json()["eeg_record_id"]
+        url = f"/api/eeg-records/{eeg_id}/status"
+        etag = client.get(url, headers=user_headers).headers["ETag"]
+
+        response = client.get(url, headers={**another_user_headers, "If-None-Match": etag})
+        assert response.status_code == 403
+
+
+@pytest.fixture
+def pending_record_id(db, regular_user, sample_patient):
+    record = EegRecord(
+        patient_id=sample_patient.id,
+        uploader_id=regular_user.id,
+        file_name="pending.parquet",
+        file_path="uploads/eeg/pending.parquet",
+        file_type=FILE_TYPE.PARQUET,
+    )
+    db.session.add(record)
+    db.session.commit()
+    return record.id
+
+
+def sse_events(response) -> list:
+    """Mensajes `data:` de un stream SSE, ya decodificados (cierra la respuesta, como el servidor)"""
+    body = response.get_data(as_text=True)
+    response.close()
+    return [
+        json.loads(line[len("data: "):])
+        for line in body.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+class TestStatusPush:
+
+    def test_stream_of_finished_record_sends_only_snapshot(
+        self, client, user_headers, sample_patient, parquet_file
+    ):
+        eeg_id = upload_eeg(client, user_headers, sample_patient.id, parquet_file).get_json()["eeg_record_id"]
+
+        response = client.get(f"/api/eeg-records/{eeg_id}/events", headers=user_headers)
+        assert response.status_code == 200
+        assert response.mimetype == "text/event-stream"
+
+        events = sse_events(response)
+        assert [e["status"] for e in events] == ["processed"]
+
+    def test_stream_delivers_published_changes(self, client, user_headers, pending_record_id):
+        response = client.get(f"/api/eeg-records/{pending_record_id}/events", headers=user_headers)
+
+        # La suscripción ya existe: el cuerpo se genera al leerlo
+        broker = get_event_broker()
+        broker.publish(eeg_channel(pending_record_id), {"id": pending_record_id, "status": "processing", "progress": 0})
+        broker.publish(eeg_channel(pending_record_id), {"id": pending_record_id, "status": "processed", "progress": 100})
+
+        events = sse_events(response)
+        assert [e["status"] for e in events] == ["pending", "processing", "processed"]
+        assert events[-1]["progress"] == 100
+
+    def test_streams_above_the_cap_get_503(self, app, client, user_headers, pending_record_id, monkeypatch):
+        monkeypatch.setitem(app.config, "EEG_EVENTS_MAX_STREAMS", 1)
+        url = f"/api/eeg-records/{pending_record_id}"
+
+        assert held_requests.acquire(1)  # otro cliente ya ocupa la única plaza
+        try:
+            for path in (f"{url}/events", f"{url}/status?wait=5"):
+                response = client.get(path, headers=user_headers)
+                assert response.status_code == 503
+                assert response.headers["Retry-After"] == str(app.config["EEG_EVENTS_RETRY_AFTER_SECONDS"])
+
+            # Sin espera no ocupa ningún hilo
+            assert client.get(f"{url}/status", headers=user_headers).status_code == 200
+        finally:
+            held_requests.release()
+
+    def test_closed_stream_frees_its_slot(self, client, user_headers, sample_patient, parquet_file):
+        eeg_id = upload_eeg(client, user_headers, sample_patient.id, parquet_file).get_json()["eeg_record_id"]
+
+        response = client.get(f"/api/eeg-records/{eeg_id}/events", headers=user_headers)
+        assert held_requests.in_use == 1
+
+        sse_events(response)
+        assert held_requests.in_use == 0
+
+    def test_failed_subscribe_frees_the_slot(self, client, user_headers, pending_record_id, monkeypatch):
+        def redis_down(channel):
+            raise ConnectionError("Redis no disponible")
+
+        monkeypatch.setattr(get_event_broker(), "subscribe", redis_down)
+        url = f"/api/eeg-records/{pending_record_id}"
+
+        for path in (f"{url}/events", f"{url}/status?wait=5"):
+            with pytest.raises(ConnectionError):
+                client.get(path, headers=user_headers)
+
+        assert held_requests.in_use == 0
+
+    def test_rejected_stream_frees_the_slot(self, client, another_user_headers, pending_record_id):
+        response = client.get(f"/api/eeg-records/{pending_record_id}/events", headers=another_user_headers)
+
+        assert response.status_code == 403
+        assert held_requests.in_use == 0
+
+    def test_stream_survives_a_retried_failure(
+        self, db, client, user_headers, pending_record_id, parquet_file, monkeypatch
+    ):
+        record = db.session.get(EegRecord, pending_record_id)
+        os.makedirs(os.path.dirname(record.file_path), exist_ok=True)
+        with open(record.file_path, "wb") as f:
+            f.write(parquet_file[0].getvalue())
+
+        # El primer intento falla; Celery (eager) lo reintenta y el segundo termina
+        build_tensor = eeg_tasks._build_tensor
+        calls = []
+
+        def flaky_build_tensor(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                raise OSError("Lectura interrumpida")
+            return build_tensor(*args, **kwargs)
+
+        monkeypatch.setattr(eeg_tasks, "_build_tensor", flaky_build_tensor)
+
+        response = client.get(f"/api/eeg-records/{pending_record_id}/events", headers=user_headers)
+        process_eeg_record.apply(args=[pending_record_id], throw=False)
+
+        statuses = [e["status"] for e in sse_events(response)]
+        assert statuses[:3] == ["pending", "processing", "pending"]  # vuelve a esperar el reintento
+        assert "failed" not in statuses
+        assert statuses[-1] == "processed"
+        assert statuses.count("processing") == 2
+
+    def test_task_publishes_transitions(self, db, pending_record_id, parquet_file):
+        # El registro pendiente apunta al parquet de prueba
+        record = db.session.get(EegRecord, pending_record_id)
+        os.makedirs(os.path.dirname(record.file_path), exist_ok=True)
+        with open(record.file_path, "wb") as f:
+            f.write(parquet_file[0].getvalue())
+
+        subscription = get_event_broker().subscribe(eeg_channel(pending_record_id))
+        try:
+            process_eeg_record.apply(args=[pending_record_id])
+            messages = [subscription.get(timeout=0.1) for _ in range(2)]
+        finally:
+            subscription.close()
+
+        assert [(m["status"], m["progress"]) for m in messages] == [("processing", 0), ("processed", 100)]
+
+    def test_task_reports_intermediate_progress(self, app, db, client, user_headers, pending_record_id, parquet_file):
+        app.config["EEG_PROGRESS_INTERVAL_SECONDS"] = 0
+        record = db.session.get(EegRecord, pending_record_id)
+        os.makedirs(os.path.dirname(record.file_path), exist_ok=True)
+        with open(record.file_path, "wb") as f:
+            f.write(parquet_file[0].getvalue())
+
+        subscription = get_event_broker().subscribe(eeg_channel(pending_record_id))
+        try:
+            process_eeg_record.apply(args=[pending_record_id])
+            progress = []
+            while (message := subscription.get(timeout=0.1)) is not None:
+                progress.append(message["progress"])
+        finally:
+            subscription.close()
+
+        # 5 trials de preprocesado (hasta 80%) y la inferencia, sin retrocesos
+        assert progress[0] == 0 and progress[-1] == 100
+        assert 16 in progress and 80 in progress
+        assert progress == sorted(set(progress))
+
+        status = client.get(f"/api/eeg-records/{pending_record_id}/status", headers=user_headers).get_json()
+        assert status["progress"] == 100
+
+    def test_stream_sends_heartbeats_and_times_out(self, app, client, user_headers, pending_record_id):
+        app.config.update(EEG_EVENTS_HEARTBEAT_SECONDS=0.05, EEG_EVENTS_MAX_SECONDS=0.2)
+
+        response = client.get(f"/api/eeg-records/{pending_record_id}/events", headers=user_headers)
+        body = response.get_data(as_text=True)
+
+        assert ": keep-alive" in body
+        assert [e["status"] for e in sse_events(response)] == ["pending"]
+
+    def test_stream_respects_permissions(self, client, another_user_headers, pending_record_id):
+        response = client.get(f"/api/eeg-records/{pending_record_id}/events", headers=another_user_headers)
+        assert response.status_code == 403
+
+        response = client.get("/api/eeg-records/99999/events", headers=another_user_headers)
+        assert response.status_code == 404
+
+    def test_long_poll_without_etag_answers_immediately(self, client, user_headers, pending_record_id):
+        started = time.monotonic()
+        response = client.get(f"/api/eeg-records/{pending_record_id}/status?wait=5", headers=user_headers)
+
+        assert response.status_code == 200
+        assert response.get_json()["status"] == "pending"
+        assert time.monotonic() - started < 2
+
+    def test_long_poll_waits_for_a_change(self, client, user_headers, pending_record_id):
+        url = f"/api/eeg-records/{pending_record_id}/status"
+        etag = client.get(url, headers=user_headers).headers["ETag"]
+
+        timer = threading.Timer(0.1, get_event_broker().publish, args=(
+            eeg_channel(pending_record_id), {"id": pending_record_id, "status": "processing"},
+        ))
+        started = time.monotonic()
+        timer.start()
+        response = client.get(f"{url}?wait=5", headers={**user_headers, "If-None-Match": etag})
+        timer.join()
+
+        # Despierta con el evento; el registro no cambió en la BD, así que 304
+        assert 0.1 <= time.monotonic() - started < 2
+        assert response.status_code == 304
+
+    def test_long_poll_wait_is_capped(self, app, client, user_headers, pending_record_id):
+        app.config["EEG_STATUS_MAX_WAIT_SECONDS"] = 0.1
+        url = f"/api/eeg-records/{pending_record_id}/status"
+        etag = client.get(url, headers=user_headers).headers["ETag"]
+
+        started = time.monotonic()
+        response = client.get(f"{url}?wait=60", headers={**user_headers, "If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert time.monotonic() - started < 2
+
+
 class TestDeleteEegRecord:
 
     def test_user_can_delete_own_record(self, client, user_headers, sample_patient, parquet_file):
@@ -257,3 +676,41 @@ class TestListByPatient:
             headers=admin_headers
         )
         assert response.status_code == 404
+
+
+class TestDuplicateDelivery:
+
+    def write_parquet(self, record, parquet_file):
+        os.makedirs(os.path.dirname(record.file_path), exist_ok=True)
+        with open(record.file_path, "wb") as f:
+            f.write(parquet_file[0].getvalue())
+
+    def test_record_being_processed_is_not_claimed_again(self, db, pending_record_id):
+        record = db.session.get(EegRecord, pending_record_id)
+        record.status = EegStatus.PROCESSING
+        db.session.commit()
+
+        result = process_eeg_record.apply(args=[pending_record_id]).get()
+
+        assert result == {"eeg_record_id": pending_record_id, "status": "processing"}
+        db.session.expire_all()
+        record = db.session.get(EegRecord, pending_record_id)
+        assert record.status == EegStatus.PROCESSING
+        assert record.prediction_result is None
+
+    def test_second_run_keeps_the_first_prediction(self, db, pending_record_id, parquet_file):
+        record = db.session.get(EegRecord, pending_record_id)
+        self.write_parquet(record, parquet_file)
+        process_eeg_record.apply(args=[pending_record_id], throw=True)
+        first = db.session.get(EegRecord, pending_record_id).prediction_result.id
+
+        # Una copia que llega con el registro reintentable no rompe la restricción única
+        record.status = EegStatus.FAILED
+        db.session.commit()
+        result = process_eeg_record.apply(args=[pending_record_id], throw=True).get()
+
+        assert result["status"] == "processed"
+        db.session.expire_all()
+        record = db.session.get(EegRecord, pending_record_id)
+        assert record.status == EegStatus.PROCESSED
+        assert record.prediction_result.id == first
@@ -0,0 +1,93 @@
+from datetime import datetime, timezone, timedelta
+import pytest
+from app.models.eeg_record import EegRecord, EegStatus
+from app.tasks import maintenance
+from app.tasks.maintenance import sweep_stuck_eeg_records
+from tests.test_eeg_records import upload_eeg
+
+
+@pytest.fixture
+def uploaded_record(client, db, user_headers, sample_patient, parquet_file):
+    """Registro ya procesado que luego se fuerza a un estado 'atascado'."""
+    r = upload_eeg(client, user_headers, sample_patient.id, parquet_file)
+    return db.session.get(EegRecord, r.get_json()["eeg_record_id"])
+
+
+def make_stuck(db, record, status, age_seconds, recovery_attempts=0):
+    record.status = status
+    record.recovery_attempts = recovery_attempts
+    db.session.commit()
+    # updated_at se fija después del commit para que onupdate no lo pise
+    db.session.query(EegRecord).filter_by(id=record.id).update({
+        "updated_at": datetime.now(timezone.utc) - timedelta(seconds=age_seconds)
+    })
+    db.session.commit()
+
+
+class TestSweeper:
+
+    def test_stuck_processing_record_is_recovered(self, app, db, uploaded_record):
+        # Simula un worker que murió antes de guardar la predicción
+        db.session.delete(uploaded_record.prediction_result)
+        make_stuck(db, uploaded_record, EegStatus.PROCESSING, app.config["EEG_STUCK_PROCESSING_SECONDS"] + 60)
+
+        report = sweep_stuck_eeg_records.apply().get()
+
+        assert report["processing_requeued"] == 1
+        assert report["pending_requeued"] == 0
+        db.session.expire_all()
+        record = db.session.get(EegRecord, uploaded_record.id)
+        assert record.status == EegStatus.PROCESSED
+        assert record.recovery_attempts == 1
+
+    def test_stuck_pending_record_is_recovered(self, app, db, uploaded_record):
+        db.session.delete(uploaded_record.prediction_result)
+        make_stuck(db, uploaded_record, EegStatus.PENDING, app.config["EEG_STUCK_PENDING_SECONDS"] + 60)
+
+        report = sweep_stuck_eeg_records.apply().get()
+
+        assert report["pending_requeued"] == 1
+        db.session.expire_all()
+        assert db.session.get(EegRecord, uploaded_record.id).status == EegStatus.PROCESSED
+
+    def test_recent_records_are_left_alone(self, app, db, uploaded_record):
+        make_stuck(db, uploaded_record, EegStatus.PROCESSING, 10)
+
+        report = sweep_stuck_eeg_records.apply().get()
+
+        assert report == {"abandoned": 0, "pending_requeued": 0, "processing_requeued": 0}
+        db.session.expire_all()
+        assert db.session.get(EegRecord, uploaded_record.id).status == EegStatus.PROCESSING
+
+    def test_record_is_abandoned_after_max_attempts(self, app, db, uploaded_record):
+        make_stuck(
+            db, uploaded_record, EegStatus.PROCESSING,
+            app.config["EEG_STUCK_PROCESSING_SECONDS"] + 60,
+            recovery_attempts=app.config["EEG_SWEEP_MAX_ATTEMPTS"],
+        )
+
+        report = sweep_stuck_eeg_records.apply().get()
+
+        assert report["abandoned"] == 1
+        db.session.expire_all()
+        record = db.session.get(EegRecord, uploaded_record.id)
+        assert record.status == EegStatus.FAILED
+        assert "abandoned" in record.error_msg
+
+    def test_pending_record_still_queued_is_not_recovered(self, app, db, uploaded_record, monkeypatch):
+        # Esperando detrás de un backlog: su mensaje sigue en la cola
+        monkeypatch.setattr(maintenance, "queued_eeg_record_ids", lambda: {uploaded_record.id})
+        make_stuck(
+            db, uploaded_record, EegStatus.PENDING,
+            app.config["EEG_STUCK_PENDING_SECONDS"] + 60,
+            recovery_attempts=app.config["EEG_SWEEP_MAX_ATTEMPTS"],
+        )
+
+        report = sweep_stuck_eeg_records.apply().get()
+
+        assert report == {"abandoned": 0, "pending_requeued": 0, "processing_requeued": 0}
+        db.session.expire_all()
+        record = db.session.get(EegRecord, uploaded_record.id)
+        assert record.status == EegStatus.PENDING
+        # Lease renovado: el siguiente barrido tampoco lo toca
+        assert record.updated_at.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc) - timedelta(seconds=60)
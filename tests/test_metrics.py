@@ -0,0 +1,98 @@
+import io
+from prometheus_client import REGISTRY
+from app.utils import metrics
+
+
+def sample(name, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def upload(client, headers, patient_id, parquet_file):
+    file_data, filename = parquet_file
+    return client.post(
+        "/api/eeg-records/upload",
+        data={
+            "patient_id": str(patient_id),
+            "file": (io.BytesIO(file_data.getvalue()), filename, "application/octet-stream"),
+        },
+        headers=headers,
+        content_type="multipart/form-data",
+    )
+
+
+class TestMetricsEndpoint:
+
+    def test_exposes_prometheus_text_format(self, client):
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/plain"
+        assert b"# TYPE http_requests_total counter" in response.data
+
+    def test_token_is_required_when_configured(self, app, client, monkeypatch):
+        monkeypatch.setitem(app.config, "METRICS_TOKEN", "scrape-secret")
+
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+        response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+        assert response.status_code == 200
+
+    def test_requests_are_counted_per_endpoint(self, client, user_headers):
+        labels = {
+            "blueprint": "routes_api.patients",
+            "endpoint": "routes_api.patients.list_patients",
+            "method": "GET",
+        }
+        before = sample("http_requests_total", status="200", **labels)
+        observed = sample("http_request_duration_seconds_count", **labels)
+
+        client.get("/api/patients", headers=user_headers)
+
+        assert sample("http_requests_total", status="200", **labels) == before + 1
+        assert sample("http_request_duration_seconds_count", **labels) == observed + 1
+
+    def test_unknown_paths_share_one_label(self, client):
+        before = sample("http_requests_total", blueprint="", endpoint="unmatched", method="GET", status="404")
+
+        client.get("/api/no-such-path/123")
+        client.get("/api/no-such-path/456")
+
+        after = sample("http_requests_total", blueprint="", endpoint="unmatched", method="GET", status="404")
+        assert after == before + 2
+
+    def test_db_statements_are_counted(self, client, user_headers):
+        before = sample("db_statements_total")
+        client.get("/api/patients", headers=user_headers)
+        assert sample("db_statements_total") > before
+
+
+class TestWorkerMetrics:
+
+    def test_processing_records_task_and_pipeline_metrics(
+        self, client, user_headers, sample_patient, parquet_file
+    ):
+        task = "app.tasks.eeg_tasks.process_eeg_record"
+        tasks_before = sample("celery_tasks_total", task=task, state="SUCCESS")
+        windows_before = sample("eeg_preprocessed_windows_total")
+        batches_before = sample("eeg_inference_batch_windows_count")
+        inference_before = sample("eeg_stage_duration_seconds_count", stage="inference")
+
+        upload(client, user_headers, sample_patient.id, parquet_file)
+
+        assert sample("celery_tasks_total", task=task, state="SUCCESS") == tasks_before + 1
+        assert sample("celery_tasks_in_progress", task=task) == 0
+        assert sample("eeg_preprocessed_windows_total") == windows_before + 10
+        assert sample("eeg_inference_batch_windows_count") == batches_before + 1
+        assert sample("eeg_stage_duration_seconds_count", stage="inference") == inference_before + 1
+
+    def test_worker_writes_textfile(self, app, client, user_headers, sample_patient, parquet_file, tmp_path, monkeypatch):
+        path = tmp_path / "worker.prom"
+        monkeypatch.setattr(metrics, "_textfile_written_at", 0.0)
+        app.celery.conf.METRICS_TEXTFILE = str(path)
+        try:
+            upload(client, user_headers, sample_patient.id, parquet_file)
+        finally:
+            app.celery.conf.METRICS_TEXTFILE = None
+
+        assert "celery_tasks_total" in path.read_text()
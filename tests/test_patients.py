@@ -1,4 +1,8 @@
 import pytest
+from datetime import datetime, timezone
+from app.models.patient_summary import PatientSummary
+from app.services.patient_summary_service import PatientSummaryService
+from tests.test_eeg_records import upload_eeg
 
 
 class TestCreatePatient:
@@ -77,6 +81,48 @@ class TestListPatients:
         assert sample_patient.id not in ids
 
 
+class TestPaginatePatients:
+
+    def create_patients(self, client, headers, n):
+        for i in range(n):
+            client.post("/api/patients", json={
+                "identification_number": f"900{i:04d}",
+                "first_name": f"Paciente{i}",
+                "last_name": "Paginado",
+            }, headers=headers)
+
+    def test_pages_follow_next_cursor(self, client, user_headers):
+        self.create_patients(client, user_headers, 5)
+
+        seen = []
+        cursor = None
+        for _ in range(3):
+            url = "/api/patients?limit=2" + (f"&cursor={cursor}" if cursor else "")
+            response = client.get(url, headers=user_headers)
+            assert response.status_code == 200
+            assert len(response.get_json()) <= 2
+            seen.extend(p["identification_number"] for p in response.get_json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        # Más recientes primero, sin repetidos ni saltos
+        assert seen == [f"900{i:04d}" for i in reversed(range(5))]
+        assert cursor is None
+
+    def test_last_page_has_no_cursor(self, client, user_headers, sample_patient):
+        response = client.get("/api/patients", headers=user_headers)
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_invalid_cursor(self, client, user_headers):
+        response = client.get("/api/patients?cursor=no-es-un-cursor", headers=user_headers)
+        assert response.status_code == 400
+
+    def test_invalid_limit(self, client, user_headers):
+        response = client.get("/api/patients?limit=0", headers=user_headers)
+        assert response.status_code == 400
+
+
 class TestGetPatient:
 
     def test_user_can_get_own_patient(self, client, user_headers, sample_patient):
@@ -147,3 +193,118 @@ class TestDeletePatient:
     def test_delete_nonexistent_patient(self, client, user_headers):
         response = client.delete("/api/patients/99999", headers=user_headers)
         assert response.status_code == 404
+
+
+class TestPatientSummary:
+
+    def get_listed(self, client, headers, patient_id, query=""):
+        response = client.get(f"/api/patients{query}", headers=headers)
+        assert response.status_code == 200
+        return next((p for p in response.get_json() if p["id"] == patient_id), None)
+
+    def test_new_patient_has_empty_summary(self, client, user_headers, sample_patient):
+        listed = self.get_listed(client, user_headers, sample_patient.id)
+        assert listed["eeg_count"] == 0
+        assert listed["pending_count"] == 0
+        assert listed["latest_result"] is None
+
+    def test_upload_and_processing_update_summary(
+        self, client, user_headers, sample_patient, parquet_file
+    ):
+        # Con CELERY_TASK_ALWAYS_EAGER el registro ya está procesado
+        upload_eeg(client, user_headers, sample_patient.id, parquet_file)
+
+        listed = self.get_listed(client, user_headers, sample_patient.id)
+        assert listed["eeg_count"] == 1
+        assert listed["pending_count"] == 0
+        assert listed["latest_result"] in ("alcoholic", "non_alcoholic")
+        assert listed["last_upload_at"] is not None
+
+        assert self.get_listed(client, user_headers, sample_patient.id, "?has_eeg_records=true")
+        assert not self.get_listed(client, user_headers, sample_patient.id, "?has_eeg_records=false")
+        assert not self.get_listed(client, user_headers, sample_patient.id, "?has_pending_eeg=true")
+
+    def test_pending_filter(self, client, db, user_headers, sample_patient):
+        PatientSummaryService.records_added([sample_patient.id], datetime.now(timezone.utc))
+        db.session.commit()
+
+        assert self.get_listed(client, user_headers, sample_patient.id, "?has_pending_eeg=true")
+        assert not self.get_listed(client, user_headers, sample_patient.id, "?has_pending_eeg=false")
+
+    def test_deleting_record_updates_summary(
+        self, client, db, user_headers, sample_patient, parquet_file
+    ):
+        eeg_id = upload_eeg(client, user_headers, sample_patient.id, parquet_file).get_json()["eeg_record_id"]
+        client.delete(f"/api/eeg-records/{eeg_id}", headers=user_headers)
+
+        listed = self.get_listed(client, user_headers, sample_patient.id)
+        assert listed["eeg_count"] == 0
+        assert listed["latest_result"] is None
+        assert self.get_listed(client, user_headers, sample_patient.id, "?has_eeg_records=false")
+
+    def test_rebuild_matches_incremental_updates(
+        self, client, db, user_headers, sample_patient, parquet_file
+    ):
+        upload_eeg(client, user_headers, sample_patient.id, parquet_file)
+        columns = ("eeg_count", "pending_count", "latest_result", "latest_raw_probability")
+
+        summary = db.session.get(PatientSummary, sample_patient.id)
+        incremental = {c: getattr(summary, c) for c in columns}
+
+        PatientSummaryService.rebuild(sample_patient.id)
+        db.session.commit()
+        db.session.expire_all()
+
+        summary = db.session.get(PatientSummary, sample_patient.id)
+        assert {c: getattr(summary, c) for c in columns} == incremental
+
+
+class TestSearchPatients:
+
+    @pytest.fixture
+    def patients(self, client, user_headers):
+        people = [
+            ("100200", "José María", "Pérez"),
+            ("100200300", "Ana", "Josefa"),
+            ("555000", "Marina", "Gómez"),
+            ("777000", "Pedro", "Perezoso"),
+        ]
+        for identification_number, first_name, last_name in people:
+            client.post("/api/patients", json={
+                "identification_number": identification_number,
+                "first_name": first_name,
+                "last_name": last_name,
+            }, headers=user_headers)
+
+    def search(self, client, headers, query):
+        response = client.get(f"/api/patients?{query}", headers=headers)
+        assert response.status_code == 200
+        return [p["identification_number"] for p in response.get_json()]
+
+    def test_name_filter_ignores_case_and_accents(self, client, user_headers, patients):
+        assert self.search(client, user_headers, "last_name=PEREZ") == ["777000", "100200"]
+        assert self.search(client, user_headers, "first_name=mari") == ["555000", "100200"]
+
+    def test_name_filter_escapes_wildcards(self, client, user_headers, patients):
+        assert self.search(client, user_headers, "first_name=%25") == []
+
+    def test_q_matches_word_prefixes(self, client, user_headers, patients):
+        # "maria" es la segunda palabra de "José María": coincide pero
+        # detrás de "Marina", que empieza por el término
+        assert self.search(client, user_headers, "q=mari") == ["555000", "100200"]
+        assert self.search(client, user_headers, "q=jose perez") == ["100200"]
+
+    def test_q_ranks_exact_identification_first(self, client, user_headers, patients):
+        assert self.search(client, user_headers, "q=100200") == ["100200", "100200300"]
+
+    def test_q_ranks_exact_name_before_prefix(self, client, user_headers, patients):
+        # "Pérez" exacto antes que "Perezoso"; "Josefa" solo empieza por "jose"
+        assert self.search(client, user_headers, "q=perez") == ["100200", "777000"]
+        assert self.search(client, user_headers, "q=jose") == ["100200300", "100200"]
+
+    def test_q_respects_ownership(self, client, another_user_headers, patients):
+        assert self.search(client, another_user_headers, "q=perez") == []
+
+    def test_updated_name_is_searchable(self, client, user_headers, sample_patient):
+        client.put(f"/api/patients/{sample_patient.id}", json={"last_name": "Núñez"}, headers=user_headers)
+        assert self.search(client, user_headers, "q=nunez") == [sample_patient.identification_number]
@@ -1,4 +1,6 @@
+import io
 import pytest
+from app.models.prediction_result import PredictionResult
 
 
 def upload_and_get_prediction_id(client, headers, patient_id, parquet_file):
@@ -138,3 +140,38 @@ class TestListAllPredictions:
     def test_list_all_requires_auth(self, client):
         response = client.get("/api/predictions")
         assert response.status_code == 401
+
+
+class TestStageTimings:
+
+    def test_prediction_stores_stage_breakdown(self, client, user_headers, sample_patient, parquet_file):
+        eeg_id = upload_and_get_prediction_id(client, user_headers, sample_patient.id, parquet_file)
+        prediction = PredictionResult.query.filter_by(eeg_record_id=eeg_id).one()
+
+        timings = prediction.stage_timings_ms
+        assert set(timings) == {"claim", "read", "preprocess", "filter", "normalize", "inference"}
+        # Filtrado y normalización son partes del preprocesado
+        assert timings["filter"] + timings["normalize"] <= timings["preprocess"]
+
+    def test_admin_gets_percentiles_per_stage(
+        self, client, admin_headers, user_headers, sample_patient, parquet_file
+    ):
+        data, filename = parquet_file[0].getvalue(), parquet_file[1]
+        for _ in range(2):
+            upload_and_get_prediction_id(
+                client, user_headers, sample_patient.id, (io.BytesIO(data), filename)
+            )
+
+        response = client.get("/api/predictions/timings", headers=admin_headers)
+        data = response.get_json()
+
+        assert response.status_code == 200
+        assert data["predictions"] == 2
+        for stage in ("read", "preprocess", "inference", "total"):
+            stats = data["stages"][stage]
+            assert stats["count"] == 2
+            assert stats["p50_ms"] <= stats["p95_ms"]
+
+    def test_regular_user_cannot_get_timings(self, client, user_headers):
+        response = client.get("/api/predictions/timings", headers=user_headers)
+        assert response.status_code == 403
@@ -0,0 +1,117 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from app.domain.reader.dense_reader import (
+    DenseEegRecording,
+    convert_to_dense,
+    dense_path_for,
+    ensure_dense,
+)
+from app.ml.inference import predict_windows, run_batched_inference, run_inference
+from app.ml.preprocessing import (
+    PREDEFINED_CHANNELS,
+    build_tensor_from_dense,
+    build_tensor_from_parquet,
+)
+
+
+@pytest.fixture
+def parquet_path(tmp_path, parquet_file):
+    file_data, filename = parquet_file
+    path = tmp_path / filename
+    path.write_bytes(file_data.read())
+    return str(path)
+
+
+class TestDenseFormat:
+
+    def test_from_dataframe_pivots_long_layout(self):
+        # Muestras desordenadas y un canal ausente en el segundo trial
+        df = pd.DataFrame({
+            "trial": [1, 1, 1, 1, 2, 2],
+            "channel": ["F1", "F1", "F2", "F2", "F1", "F1"],
+            "sample": [1, 0, 0, 1, 1, 0],
+            "value": [10.0, 5.0, 7.0, 8.0, 2.0, 1.0],
+        })
+
+        recording = DenseEegRecording.from_dataframe(df, ["F2", "F1"])
+
+        assert recording.channels == ["F2", "F1"]
+        assert recording.trials == [1, 2]
+        assert recording.signals.dtype == np.float32
+        assert recording.signals.shape == (2, 2, 2)
+        assert recording.signals[0].tolist() == [[7.0, 8.0], [5.0, 10.0]]
+        assert recording.lengths.tolist() == [[2, 2], [0, 2]]
+
+    def test_convert_and_load_round_trip(self, parquet_path):
+        dense_path = convert_to_dense(parquet_path)
+
+        assert dense_path == dense_path_for(parquet_path)
+        recording = DenseEegRecording.load(dense_path)
+        assert isinstance(recording.signals, np.memmap)
+        assert recording.signals.shape == (5, 33, 512)
+
+    def test_ensure_dense_converts_only_once(self, parquet_path):
+        dense_path = ensure_dense(parquet_path)
+        mtime = os.path.getmtime(os.path.join(dense_path, "signals.npy"))
+
+        # Aunque el parquet desaparezca, el store denso se reutiliza
+        os.remove(parquet_path)
+        assert ensure_dense(parquet_path) == dense_path
+        assert os.path.getmtime(os.path.join(dense_path, "signals.npy")) == mtime
+
+
+class TestBuildTensor:
+
+    def test_dense_and_parquet_tensors_match(self, parquet_path):
+        from_parquet = build_tensor_from_parquet(parquet_path)
+        from_dense = build_tensor_from_dense(ensure_dense(parquet_path))
+
+        assert from_parquet.shape == (10, 33 * 6, 256, 1)
+        np.testing.assert_array_equal(from_parquet, from_dense)
+
+    def test_channel_order_follows_requested_list(self, parquet_path):
+        dense_path = ensure_dense(parquet_path)
+        channels = PREDEFINED_CHANNELS[:2]
+
+        X = build_tensor_from_dense(dense_path, channels=channels, use_bands=False)
+        X_reversed = build_tensor_from_dense(dense_path, channels=channels[::-1], use_bands=False)
+
+        np.testing.assert_array_equal(X[:, 0], X_reversed[:, 1])
+
+    def test_no_matching_channels_returns_empty(self, parquet_path):
+        X = build_tensor_from_dense(ensure_dense(parquet_path), channels=["XX"])
+        assert X.size == 0
+
+    def test_progress_reports_every_trial(self, parquet_path):
+        calls = []
+        build_tensor_from_dense(ensure_dense(parquet_path), progress=lambda done, total: calls.append((done, total)))
+
+        assert calls == [(1, 5), (2, 5), (3, 5), (4, 5), (5, 5)]
+
+
+class TestBatchedInference:
+
+    def test_inference_progress_counts_windows(self, parquet_path):
+        X = build_tensor_from_dense(ensure_dense(parquet_path))
+        X = np.concatenate([X] * 4)  # 40 ventanas: dos batches del modelo
+        calls = []
+
+        preds = predict_windows(X, progress=lambda done, total: calls.append((done, total)))
+
+        assert len(preds) == 40
+        assert calls == [(32, 40), (40, 40)]
+
+    def test_batched_inference_matches_individual_calls(self, parquet_path):
+        X = build_tensor_from_dense(ensure_dense(parquet_path))
+        tensors = [X[:3], X[3:4], X[4:]]
+
+        batched = run_batched_inference(tensors)
+        individual = [run_inference(t) for t in tensors]
+
+        assert len(batched) == 3
+        for (label_b, prob_b, conf_b), (label_i, prob_i, conf_i) in zip(batched, individual):
+            assert label_b == label_i
+            assert prob_b == pytest.approx(prob_i, abs=1e-5)
+            assert conf_b == pytest.approx(conf_i, abs=1e-5)
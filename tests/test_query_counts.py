@@ -0,0 +1,88 @@
+"""
+Número de sentencias SQL por endpoint. Fija la consolidación de consultas
+(registro + predicción + permisos en una sola consulta) para que un cambio
+que vuelva a introducir consultas extra (N+1) haga fallar el test.
+La autenticación no cuenta: la sesión sale de la caché y el rol del token.
+"""
+import pytest
+from app.models.eeg_record import EegRecord, EegStatus, FILE_TYPE
+from app.models.prediction_result import AlcoholismRisk, PredictionResult
+
+
+@pytest.fixture
+def processed_records(db, regular_user, sample_patient):
+    records = []
+    for i in range(3):
+        record = EegRecord(
+            patient_id=sample_patient.id,
+            uploader_id=regular_user.id,
+            file_name=f"eeg_{i}.parquet",
+            file_path=f"uploads/eeg/eeg_{i}.parquet",
+            file_type=FILE_TYPE.PARQUET,
+            status=EegStatus.PROCESSED,
+        )
+        record.prediction_result = PredictionResult(
+            result=AlcoholismRisk.NON_ALCOHOLIC,
+            confidence=0.9,
+            raw_probability=0.1,
+            model_version="test",
+        )
+        records.append(record)
+
+    db.session.add_all(records)
+    db.session.commit()
+    return records
+
+
+def count_statements(db, capture_sql, client, url, headers) -> int:
+    # Los tests comparten la sesión de la app: se vacía para que cada
+    # petición empiece sin objetos cargados, como en producción
+    db.session.expunge_all()
+    response = None
+
+    def request():
+        nonlocal response
+        response = client.get(url, headers=headers)
+
+    statements = capture_sql(request)
+    assert response.status_code == 200, response.get_json()
+    return len(statements)
+
+
+class TestStatementCounts:
+
+    @pytest.mark.parametrize("path", [
+        "/api/eeg-records/{eeg_id}",
+        "/api/eeg-records/{eeg_id}/status",
+        "/api/eeg-records/{eeg_id}/prediction",
+        "/api/patients/{patient_id}",
+        "/api/patients/{patient_id}/eeg-records",
+        "/api/patients/{patient_id}/predictions",
+        "/api/eeg-records",
+        "/api/patients",
+    ])
+    def test_user_endpoints_use_a_single_statement(
+        self, db, client, user_headers, capture_sql, sample_patient, processed_records, path
+    ):
+        url = path.format(eeg_id=processed_records[0].id, patient_id=sample_patient.id)
+        assert count_statements(db, capture_sql, client, url, user_headers) == 1
+
+    def test_admin_predictions_listing_uses_a_single_statement(
+        self, db, client, admin_headers, capture_sql, processed_records
+    ):
+        assert count_statements(db, capture_sql, client, "/api/predictions", admin_headers) == 1
+
+    def test_empty_patient_listing_checks_the_patient(
+        self, db, client, user_headers, capture_sql, sample_patient
+    ):
+        # Sin registros hace falta una segunda consulta para distinguir 404/403
+        url = f"/api/patients/{sample_patient.id}/eeg-records"
+        assert count_statements(db, capture_sql, client, url, user_headers) == 2
+
+    def test_listing_another_users_patient_is_forbidden(
+        self, client, another_user_headers, sample_patient, processed_records
+    ):
+        response = client.get(
+            f"/api/patients/{sample_patient.id}/predictions", headers=another_user_headers
+        )
+        assert response.status_code == 403
@@ -0,0 +1,68 @@
+"""
+Regresión de planes de consulta: ejecuta las consultas reales de los
+servicios, captura el SQL emitido y comprueba con EXPLAIN QUERY PLAN que
+SQLite usa los índices compuestos/parciales. Los predicados de los índices
+parciales se declaran por dialecto (PostgreSQL / SQLite) en los modelos.
+"""
+from app.services.auth_service import AuthService
+from app.services.eeg_record_service import EegRecordService
+from app.services.patient_service import PatientService
+
+
+def query_plan(db, statement, parameters) -> str:
+    rows = db.session.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}", parameters
+    ).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def plan_for(db, statements, table: str) -> str:
+    """Plan de la primera sentencia que lee de `table`."""
+    statement, parameters = next(
+        (s, p) for s, p in statements if f"FROM {table}" in s or f"UPDATE {table}" in s
+    )
+    return query_plan(db, statement, parameters)
+
+
+class TestQueryPlans:
+
+    def test_user_eeg_listing_uses_uploader_index(self, db, capture_sql, regular_user):
+        statements = capture_sql(
+            lambda: EegRecordService.list_eeg_records({}, regular_user)
+        )
+        plan = plan_for(db, statements, "eeg_records")
+        assert "ix_eeg_records_active_uploader_created" in plan
+        assert "TEMP B-TREE" not in plan  # ORDER BY resuelto por el índice
+
+    def test_user_eeg_listing_by_status_uses_status_index(self, db, capture_sql, regular_user):
+        statements = capture_sql(
+            lambda: EegRecordService.list_eeg_records({"status": "pending"}, regular_user)
+        )
+        plan = plan_for(db, statements, "eeg_records")
+        assert "ix_eeg_records_active_uploader_status_created" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_patient_eeg_listing_uses_patient_index(
+        self, db, capture_sql, admin_user, sample_patient
+    ):
+        statements = capture_sql(
+            lambda: EegRecordService.list_by_patient(sample_patient.id, admin_user)
+        )
+        plan = plan_for(db, statements, "eeg_records")
+        assert "ix_eeg_records_active_patient_created" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_user_patient_listing_uses_created_by_index(self, db, capture_sql, regular_user):
+        statements = capture_sql(
+            lambda: PatientService.list_patients({}, regular_user)
+        )
+        plan = plan_for(db, statements, "patients")
+        assert "ix_patients_active_created_by_created" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_session_invalidation_uses_active_sessions_index(self, db, capture_sql, regular_user):
+        statements = capture_sql(
+            lambda: AuthService._invalidate_existing_session(regular_user.id)
+        )
+        plan = plan_for(db, statements, "sessions")
+        assert "ix_sessions_user_id_active" in plan
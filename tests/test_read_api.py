@@ -0,0 +1,375 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session as OrmSession
+from starlette.testclient import TestClient
+from app.config import TestingConfig
+from app.extensions import db as _db
+from app.models.eeg_record import EegRecord, EegStatus, FILE_TYPE
+from app.models.patient import Patient
+from app.models.prediction_result import AlcoholismRisk, PredictionResult
+from app.models.session import Session
+from app.models.user import User, UserRole
+from app.read_api import async_database_url, create_read_app
+from app.read_api.events import MemoryEventListener, RedisEventListener
+from app.utils.conditional import _etag, resource_version
+from app.utils.events import MemoryEventBroker, publish_eeg_status
+
+
+# ------------------------------------------------------------------ #
+# Fixtures                                                             #
+# ------------------------------------------------------------------ #
+
+@pytest.fixture
+def read_db(tmp_path):
+    """
+    BD en fichero: la app async no puede compartir la conexión de la BD en
+    memoria de la app Flask. Devuelve (sesión síncrona para preparar datos, URL).
+    """
+    url = f"sqlite:///{tmp_path / 'read.db'}"
+    engine = create_engine(url)
+    _db.metadata.create_all(engine)
+    with OrmSession(engine, expire_on_commit=False) as session:
+        yield session, url
+    engine.dispose()
+
+
+@pytest.fixture
+def read_client(read_db):
+    class ReadConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = read_db[1]
+
+    with TestClient(create_read_app(ReadConfig)) as client:
+        yield client
+
+
+@pytest.fixture
+def seeded(app, read_db):
+    """
+    Dos médicos y un admin con sesión activa; el primero tiene un paciente
+    con un registro pendiente y otro procesado (con predicción).
+    """
+    session = read_db[0]
+    now = datetime.now(timezone.utc)
+
+    users = {}
+    for name, role in (("doctor", UserRole.USER), ("other", UserRole.USER), ("admin", UserRole.ADMIN)):
+        user = User(email=f"{name}@neuroscreen.com", password_hash="x", first_name=name, last_name="Test", role=role)
+        session.add(user)
+        session.flush()
+        users[name] = user
+
+    patient = Patient(identification_number="123456789", first_name="Carlos", last_name="Pérez",
+                      created_by=users["doctor"].id)
+    session.add(patient)
+    session.flush()
+
+    records = {}
+    for name, status, created in (
+        ("processed", EegStatus.PROCESSED, now - timedelta(minutes=2)),
+        ("pending", EegStatus.PENDING, now - timedelta(minutes=1)),
+    ):
+        record = EegRecord(
+            patient_id=patient.id, uploader_id=users["doctor"].id, file_name=f"{name}.parquet",
+            file_path=f"uploads/eeg/{name}.parquet", file_type=FILE_TYPE.PARQUET, file_size_bytes=1000,
+            status=status, created_at=created, updated_at=created,
+        )
+        session.add(record)
+        session.flush()
+        records[name] = record
+
+    session.add(PredictionResult(
+        eeg_record_id=records["processed"].id, result=AlcoholismRisk.ALCOHOLIC,
+        confidence=0.91, raw_probability=0.91, model_version="eegnet_v1",
+    ))
+
+    headers = {}
+    with app.app_context():
+        for name, user in users.items():
+            token = create_access_token(identity=user.id, additional_claims={"role": user.role.value})
+            session.add(Session(
+                user_id=user.id, token_hash=Session.hash_token(token),
+                start_date=now, expiration_date=now + timedelta(minutes=30), is_active=True,
+            ))
+            headers[name] = {"Authorization": f"Bearer {token}"}
+
+    session.commit()
+    return {"session": session, "headers": headers, "patient": patient, "records": records}
+
+
+# ------------------------------------------------------------------ #
+# Tests                                                                #
+# ------------------------------------------------------------------ #
+
+class TestReadApiAuth:
+
+    def test_missing_token_returns_401(self, read_client, seeded):
+        response = read_client.get("/api/eeg-records")
+
+        assert response.status_code == 401
+        assert response.json() == {"message": "Missing token"}
+
+    def test_invalid_token_returns_401(self, read_client, seeded):
+        response = read_client.get("/api/eeg-records", headers={"Authorization": "Bearer abc.def.ghi"})
+
+        assert response.status_code == 401
+        assert response.json() == {"message": "Invalid token"}
+
+    def test_revoked_session_returns_401(self, read_client, seeded):
+        session = seeded["session"]
+        for row in session.query(Session).all():
+            row.is_active = False
+        session.commit()
+
+        response = read_client.get("/api/eeg-records", headers=seeded["headers"]["other"])
+
+        assert response.status_code == 401
+        assert "revoked" in response.json()["error"]
+
+    def test_token_without_role_of_deleted_user_returns_401(self, app, read_client, seeded):
+        session = seeded["session"]
+        now = datetime.now(timezone.utc)
+        with app.app_context():
+            token = create_access_token(identity=9999)  # emitido antes del claim de rol
+        session.add(Session(
+            user_id=9999, token_hash=Session.hash_token(token),
+            start_date=now, expiration_date=now + timedelta(minutes=30), is_active=True,
+        ))
+        session.commit()
+
+        response = read_client.get("/api/eeg-records", headers={"Authorization": f"Bearer {token}"})
+
+        # Mismo cuerpo que la API Flask (user_lookup_error_loader por defecto)
+        assert response.status_code == 401
+        assert response.json() == {"msg": "Error loading the user 9999"}
+
+
+class TestReadApiStatus:
+
+    def test_owner_gets_status_with_flask_etag(self, read_client, seeded):
+        record = seeded["records"]["pending"]
+
+        response = read_client.get(f"/api/eeg-records/{record.id}/status", headers=seeded["headers"]["doctor"])
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["id"] == record.id
+        assert body["status"] == "pending"
+        # Mismo ETag que la API Flask: el cliente puede alternar entre ambas
+        assert response.headers["ETag"] == f'W/"{_etag([resource_version(body)])}"'
+
+    def test_if_none_match_returns_304(self, read_client, seeded):
+        record = seeded["records"]["pending"]
+        headers = seeded["headers"]["doctor"]
+        etag = read_client.get(f"/api/eeg-records/{record.id}/status", headers=headers).headers["ETag"]
+
+        response = read_client.get(
+            f"/api/eeg-records/{record.id}/status", headers={**headers, "If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+
+    def test_other_user_gets_403(self, read_client, seeded):
+        record = seeded["records"]["pending"]
+
+        response = read_client.get(f"/api/eeg-records/{record.id}/status", headers=seeded["headers"]["other"])
+
+        assert response.status_code == 403
+
+    def test_unknown_record_returns_404(self, read_client, seeded):
+        response = read_client.get("/api/eeg-records/9999/status", headers=seeded["headers"]["doctor"])
+
+        assert response.status_code == 404
+
+    def test_long_poll_returns_new_status(self, app, read_client, seeded):
+        session, record = seeded["session"], seeded["records"]["pending"]
+        headers = seeded["headers"]["doctor"]
+        etag = read_client.get(f"/api/eeg-records/{record.id}/status", headers=headers).headers["ETag"]
+
+        def start_processing():
+            record.status = EegStatus.PROCESSING
+            session.commit()
+            with app.app_context():  # el worker publica en el mismo broker en memoria
+                publish_eeg_status(record)
+
+        timer = threading.Timer(0.3, start_processing)
+        timer.start()
+        try:
+            response = read_client.get(
+                f"/api/eeg-records/{record.id}/status?wait=5",
+                headers={**headers, "If-None-Match": etag},
+            )
+        finally:
+            timer.join()
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "processing"
+
+    def test_long_poll_times_out_with_304(self, read_client, seeded):
+        record = seeded["records"]["pending"]
+        headers = seeded["headers"]["doctor"]
+        etag = read_client.get(f"/api/eeg-records/{record.id}/status", headers=headers).headers["ETag"]
+
+        response = read_client.get(
+            f"/api/eeg-records/{record.id}/status?wait=0.3",
+            headers={**headers, "If-None-Match": etag},
+        )
+
+        assert response.status_code == 304
+
+
+class TestEventListener:
+
+    def test_one_subscription_wakes_every_waiter(self):
+        broker = MemoryEventBroker()
+
+        async def wait_twice():
+            listener = MemoryEventListener(broker)
+            await listener.start()
+            waiters = [listener.subscribe("eeg:1"), listener.subscribe("eeg:1")]
+            # Publica otro hilo, como el worker
+            threading.Timer(0.05, broker.publish, args=("eeg:1", {"status": "processing"})).start()
+            messages = [await waiter.get(timeout=5) for waiter in waiters]
+            for waiter in waiters:
+                waiter.close()
+            await listener.close()
+            return messages, listener._waiters
+
+        messages, waiters = asyncio.run(wait_twice())
+
+        assert messages == [{"status": "processing"}] * 2
+        assert waiters == {}
+        assert broker._listeners == []
+
+    def test_waiter_times_out_with_none(self):
+        async def wait_for_nothing():
+            listener = MemoryEventListener(MemoryEventBroker())
+            await listener.start()
+            waiter = listener.subscribe("eeg:1")
+            try:
+                return await waiter.get(timeout=0.05)
+            finally:
+                waiter.close()
+                await listener.close()
+
+        assert asyncio.run(wait_for_nothing()) is None
+
+    def test_redis_pattern_messages_reach_their_channel(self):
+        class FakePubSub:
+            def __init__(self):
+                self.patterns = []
+                self.messages = asyncio.Queue()
+
+            async def psubscribe(self, pattern):
+                self.patterns.append(pattern)
+
+            async def get_message(self, timeout=None):
+                return await self.messages.get()
+
+            async def aclose(self):
+                pass
+
+        async def receive():
+            listener = RedisEventListener("redis://localhost:6379/0")  # no conecta hasta usarse
+            listener._pubsub = pubsub = FakePubSub()
+            await listener.start()
+            waiter = listener.subscribe("eeg:7")
+            for channel in (b"events:eeg:8", b"events:eeg:7"):
+                pubsub.messages.put_nowait({"type": "pmessage", "channel": channel, "data": f'{{"c": "{channel.decode()}"}}'})
+            message = await waiter.get(timeout=5)
+            waiter.close()
+            await listener.close()
+            return pubsub.patterns, message
+
+        patterns, message = asyncio.run(receive())
+
+        assert patterns == ["events:*"]
+        assert message == {"c": "events:eeg:7"}
+
+
+class TestReadApiListings:
+
+    def test_lists_own_records_newest_first_with_cursor(self, read_client, seeded):
+        headers = seeded["headers"]["doctor"]
+
+        first = read_client.get("/api/eeg-records?limit=1", headers=headers)
+        second = read_client.get(
+            f"/api/eeg-records?limit=1&cursor={first.headers['X-Next-Cursor']}", headers=headers
+        )
+
+        assert [r["id"] for r in first.json()] == [seeded["records"]["pending"].id]
+        assert 'rel="next"' in first.headers["Link"]
+        assert [r["id"] for r in second.json()] == [seeded["records"]["processed"].id]
+        assert "X-Next-Cursor" not in second.headers
+
+    def test_other_user_sees_no_records(self, read_client, seeded):
+        response = read_client.get("/api/eeg-records", headers=seeded["headers"]["other"])
+
+        assert response.status_code == 200
+        assert response.json() == []
+
+    def test_invalid_status_filter_returns_400(self, read_client, seeded):
+        response = read_client.get("/api/eeg-records?status=unknown", headers=seeded["headers"]["doctor"])
+
+        assert response.status_code == 400
+
+    def test_patient_records_of_another_user_returns_403(self, read_client, seeded):
+        patient = seeded["patient"]
+
+        response = read_client.get(f"/api/patients/{patient.id}/eeg-records", headers=seeded["headers"]["other"])
+
+        assert response.status_code == 403
+
+    def test_unknown_patient_returns_404(self, read_client, seeded):
+        response = read_client.get("/api/patients/9999/predictions", headers=seeded["headers"]["doctor"])
+
+        assert response.status_code == 404
+
+
+class TestReadApiPredictions:
+
+    def test_prediction_of_processed_record(self, read_client, seeded):
+        record = seeded["records"]["processed"]
+
+        response = read_client.get(f"/api/eeg-records/{record.id}/prediction", headers=seeded["headers"]["doctor"])
+
+        assert response.status_code == 200
+        assert response.json()["eeg_record_id"] == record.id
+        assert response.json()["result"] == AlcoholismRisk.ALCOHOLIC.value
+
+    def test_pending_record_has_no_prediction(self, read_client, seeded):
+        record = seeded["records"]["pending"]
+
+        response = read_client.get(f"/api/eeg-records/{record.id}/prediction", headers=seeded["headers"]["doctor"])
+
+        assert response.status_code == 404
+
+    def test_patient_predictions(self, read_client, seeded):
+        patient = seeded["patient"]
+
+        response = read_client.get(f"/api/patients/{patient.id}/predictions", headers=seeded["headers"]["doctor"])
+
+        assert response.status_code == 200
+        assert [p["eeg_record_id"] for p in response.json()] == [seeded["records"]["processed"].id]
+
+    def test_all_predictions_admin_only(self, read_client, seeded):
+        assert read_client.get("/api/predictions", headers=seeded["headers"]["doctor"]).status_code == 403
+
+        response = read_client.get("/api/predictions", headers=seeded["headers"]["admin"])
+
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+
+
+class TestAsyncDatabaseUrl:
+
+    @pytest.mark.parametrize("url, expected", [
+        ("sqlite:///eeg.db", "sqlite+aiosqlite:///eeg.db"),
+        ("postgresql://u:p@db/eeg", "postgresql+psycopg://u:p@db/eeg"),
+        ("postgresql+psycopg://u:p@db/eeg", "postgresql+psycopg://u:p@db/eeg"),
+    ])
+    def test_maps_to_async_driver(self, url, expected):
+        assert async_database_url(url) == expected
@@ -0,0 +1,142 @@
+import base64
+import json
+import pytest
+from app.models.eeg_record import EegPriority, EegRecord, EegStatus, FILE_TYPE
+from app.tasks import eeg_tasks, scheduling
+from app.tasks.eeg_tasks import process_eeg_batch, process_eeg_record
+from app.tasks.scheduling import (
+    MemoryTokenBucket,
+    QUEUE_DEFAULT,
+    QUEUE_HIGH,
+    QUEUE_LARGE,
+    QUEUE_LOW,
+    record_ids_in_message,
+    route_eeg_record,
+)
+
+
+@pytest.fixture
+def fair_share(monkeypatch):
+    """Bucket pequeño y sin recarga para que el reparto justo sea determinista."""
+    bucket = MemoryTokenBucket(capacity=2, refill_per_second=0)
+    monkeypatch.setattr(scheduling, "_fair_share", bucket)
+    return bucket
+
+
+class TestRouting:
+
+    def test_priorities_map_to_their_queues(self, app, fair_share):
+        assert route_eeg_record(1, 1024, EegPriority.HIGH) == {"queue": QUEUE_HIGH, "priority": 0}
+        assert route_eeg_record(1, 1024, EegPriority.NORMAL)["queue"] == QUEUE_DEFAULT
+        assert route_eeg_record(1, 1024, EegPriority.LOW) == {"queue": QUEUE_LOW, "priority": 9}
+
+    def test_large_files_use_dedicated_lane(self, app, fair_share):
+        size = app.config["EEG_LARGE_FILE_BYTES"]
+        assert route_eeg_record(1, size, EegPriority.HIGH)["queue"] == QUEUE_LARGE
+        assert route_eeg_record(1, size - 1, EegPriority.HIGH)["queue"] == QUEUE_HIGH
+
+    def test_uploader_over_fair_share_is_demoted(self, app, fair_share):
+        queues = [route_eeg_record(1, 1024, EegPriority.NORMAL)["queue"] for _ in range(3)]
+        assert queues == [QUEUE_DEFAULT, QUEUE_DEFAULT, QUEUE_LOW]
+
+        # Otro usuario conserva su cuota
+        assert route_eeg_record(2, 1024, EegPriority.NORMAL)["queue"] == QUEUE_DEFAULT
+
+    def test_token_bucket_refills(self):
+        bucket = MemoryTokenBucket(capacity=1, refill_per_second=1)
+        assert bucket.take("u") is True
+        assert bucket.take("u") is False
+
+        # Simula que pasó un segundo desde la última petición
+        tokens, updated = bucket._buckets["u"]
+        bucket._buckets["u"] = (tokens, updated - 1)
+        assert bucket.take("u") is True
+
+
+def make_record(db, patient, **fields):
+    record = EegRecord(
+        patient_id=patient.id,
+        uploader_id=patient.created_by,
+        file_name="eeg.parquet",
+        file_path="uploads/eeg/missing.parquet",  # no existe: el preprocesado falla
+        file_type=FILE_TYPE.PARQUET,
+        file_size_bytes=1024,
+        **fields,
+    )
+    db.session.add(record)
+    db.session.commit()
+    return record
+
+
+class TestBatchFallback:
+
+    def test_failed_record_is_requeued_in_its_own_lane(self, db, sample_patient, fair_share, monkeypatch):
+        enqueued = []
+        monkeypatch.setattr(
+            process_eeg_record, "apply_async",
+            lambda args=None, kwargs=None, **options: enqueued.append((args, options)),
+        )
+        record = make_record(db, sample_patient, priority=EegPriority.LOW)
+
+        result = process_eeg_batch.apply(args=[[record.id]]).get()
+
+        assert result["fallback"] == [record.id]
+        assert enqueued == [((record.id,), {"queue": QUEUE_LOW, "priority": 9})]
+        db.session.expire_all()
+        assert db.session.get(EegRecord, record.id).status == EegStatus.PENDING
+
+    def test_database_error_in_one_record_does_not_break_the_batch(self, db, sample_patient, monkeypatch):
+        enqueued = []
+        monkeypatch.setattr(
+            process_eeg_record, "apply_async",
+            lambda args=None, kwargs=None, **options: enqueued.append(args),
+        )
+
+        def failing_write(eeg_record, progress, timer):
+            # Una escritura de progreso que falla deja la sesión pendiente de rollback
+            eeg_record.file_name = None
+            db.session.commit()
+
+        monkeypatch.setattr(eeg_tasks, "_build_tensor", failing_write)
+        records = [make_record(db, sample_patient) for _ in range(2)]
+        ids = [record.id for record in records]
+
+        result = process_eeg_batch.apply(args=[ids]).get()
+
+        assert result["fallback"] == ids
+        assert enqueued == [(record_id,) for record_id in ids]
+        db.session.expire_all()
+        assert [db.session.get(EegRecord, i).status for i in ids] == [EegStatus.PENDING] * 2
+
+    def test_deleted_record_is_skipped(self, db, sample_patient, monkeypatch):
+        monkeypatch.setattr(process_eeg_record, "apply_async", lambda *a, **k: pytest.fail("re-enqueued"))
+        record = make_record(db, sample_patient, is_deleted=True)
+
+        result = process_eeg_batch.apply(args=[[record.id]]).get()
+
+        assert result == {"processed": [], "fallback": []}
+        db.session.expire_all()
+        assert db.session.get(EegRecord, record.id).status == EegStatus.PENDING
+
+
+def redis_message(task: str, args: list) -> dict:
+    """Mensaje de tarea tal como lo guarda el transporte Redis de kombu."""
+    body = json.dumps([args, {}, {"callbacks": None, "errbacks": None, "chain": None, "chord": None}])
+    return {
+        "body": base64.b64encode(body.encode()).decode(),
+        "content-encoding": "utf-8",
+        "content-type": "application/json",
+        "headers": {"task": task, "id": "a1b2"},
+        "properties": {"body_encoding": "base64", "delivery_tag": "t1"},
+    }
+
+
+class TestQueuedMessages:
+
+    def test_record_ids_of_single_and_batch_tasks(self):
+        assert record_ids_in_message(redis_message("app.tasks.eeg_tasks.process_eeg_record", [7])) == [7]
+        assert record_ids_in_message(redis_message("app.tasks.eeg_tasks.process_eeg_batch", [[3, 4]])) == [3, 4]
+
+    def test_other_tasks_reference_no_records(self):
+        message = redis_message("app.tasks.maintenance.sweep_stuck_eeg_records", [])
+        assert record_ids_in_message(message) == []
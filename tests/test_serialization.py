@@ -0,0 +1,43 @@
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+import pytest
+from app.models.eeg_record import EegStatus
+from app.utils import serialization
+
+
+VALUE = {
+    "status": EegStatus.PROCESSED,
+    "confidence": Decimal("0.9731"),
+    "created_at": datetime(2026, 1, 2, 3, 4, 5, 123456),
+    "updated_at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    "birth_date": date(1990, 5, 17),
+    "name": "Pérez",
+    "missing": None,
+}
+
+EXPECTED = {
+    "status": "processed",
+    "confidence": 0.9731,
+    "created_at": "2026-01-02T03:04:05.123456",
+    "updated_at": "2026-01-02T03:04:05+00:00",
+    "birth_date": "1990-05-17",
+    "name": "Pérez",
+    "missing": None,
+}
+
+
+class TestDumps:
+
+    def test_native_types_are_serialized_like_to_dict(self):
+        assert json.loads(serialization.dumps(VALUE)) == EXPECTED
+
+    def test_stdlib_fallback_gives_the_same_output(self, monkeypatch):
+        # Sin orjson instalado se usa json de la librería estándar
+        monkeypatch.setattr(serialization, "orjson", None)
+        assert json.loads(serialization.dumps(VALUE)) == EXPECTED
+
+    def test_unknown_types_are_rejected(self, monkeypatch):
+        monkeypatch.setattr(serialization, "orjson", None)
+        with pytest.raises(TypeError):
+            serialization.dumps({"value": object()})
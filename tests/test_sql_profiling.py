@@ -0,0 +1,48 @@
+import logging
+import pytest
+from app import create_app
+from app.celery_app import create_celery
+from app.config import TestingConfig
+from app.extensions import db as _db
+
+
+class ProfilingConfig(TestingConfig):
+    SQL_PROFILING = True
+    SQL_SLOW_QUERY_MS = 0  # todas las sentencias cuentan como lentas
+    SQL_MAX_STATEMENTS_PER_REQUEST = 0
+
+
+@pytest.fixture
+def profiling_client(app):
+    """App propia con el profiling activo; Celery vuelve a la app de la sesión al terminar."""
+    profiling_app = create_app(ProfilingConfig)
+    try:
+        with profiling_app.app_context():
+            _db.create_all()
+            yield profiling_app.test_client()
+            _db.session.remove()
+            _db.drop_all()
+    finally:
+        create_celery(app)
+
+
+class TestSqlProfiling:
+
+    def test_server_timing_reports_request_queries(self, profiling_client):
+        response = profiling_client.post("/api/auth/login", json={"email": "nobody@test.com", "password": "x"})
+
+        timing = response.headers["Server-Timing"]
+        assert timing.startswith("db;dur=")
+        assert 'desc="1 queries"' in timing
+
+    def test_slow_statements_are_logged_with_endpoint(self, profiling_client, caplog):
+        with caplog.at_level(logging.WARNING, logger="app.utils.sql_profiling"):
+            profiling_client.post("/api/auth/login", json={"email": "nobody@test.com", "password": "x"})
+
+        messages = [r.getMessage() for r in caplog.records]
+        assert any(m.startswith("Slow SQL") and "routes_api.auth.login" in m and "FROM users" in m for m in messages)
+        assert any("routes_api.auth.login ran 1 SQL statements" in m for m in messages)
+
+    def test_disabled_by_default(self, client):
+        response = client.post("/api/auth/login", json={"email": "nobody@test.com", "password": "x"})
+        assert "Server-Timing" not in response.headers
@@ -134,3 +134,8 @@ class TestDeleteUser:
         client.delete(f"/api/users/{regular_user.id}", headers=admin_headers)
         response = client.get(f"/api/users/{regular_user.id}", headers=admin_headers)
         assert response.status_code == 404
+
+    def test_deleted_user_token_is_revoked(self, client, admin_headers, user_headers, regular_user):
+        client.delete(f"/api/users/{regular_user.id}", headers=admin_headers)
+        response = client.get("/api/auth/me", headers=user_headers)
+        assert response.status_code == 401